@@ -0,0 +1,213 @@
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# keys of the report data that are computed from the test cases
+REPORT_KEYS = ("specs", "functional_spec_count", "category_count", "all_categories", "testsuites", "test_status")
+
+
+def spec_status(counts: Dict) -> str:
+    """Overall status of a functional spec from its counts"""
+    if counts["fail"]:
+        return "Failing"
+    if counts["skip"]:
+        return "Partially Passing"
+    return "Passing"
+
+
+class CheckpointAggregates:
+    """Report aggregates maintained incrementally, one test case at a time"""
+
+    def __init__(self):
+        self.cases: Dict[str, Dict] = {}
+        self.functional_spec_count: Dict[str, Dict] = {}
+        self.category_count: Dict[str, int] = {}
+
+    def add(self, case: Dict):
+        """Add a test case, replacing an earlier result with the same name"""
+        previous = self.cases.pop(case["name"], None)
+        if previous is not None:
+            self._count(previous, -1)
+        self.cases[case["name"]] = case
+        self._count(case, 1)
+
+    def _count(self, case: Dict, delta: int):
+        status_key = {"Passed": "pass", "Failed": "fail", "Skipped": "skip"}.get(case["status"])
+        categories = case.get("categories", [])
+
+        for category in categories:
+            self.category_count[category] = self.category_count.get(category, 0) + delta
+            if not self.category_count[category]:
+                del self.category_count[category]
+
+        for spec_id in case.get("functional_specifications", []):
+            counts = self.functional_spec_count.setdefault(spec_id, {"pass": 0, "fail": 0, "skip": 0, "total": 0})
+            counts["total"] += delta
+            if status_key:
+                counts[status_key] += delta
+            for category in categories:
+                counts[category] = counts.get(category, 0) + delta
+            if not counts["total"]:
+                del self.functional_spec_count[spec_id]
+
+    def to_report_data(self, header: Dict) -> Dict:
+        """Full report data structure, as produced by process_test_data"""
+        cases = list(self.cases.values())
+        all_categories = list(self.category_count)
+
+        functional_spec_count = {}
+        specs = {}
+        for spec_id, counts in self.functional_spec_count.items():
+            functional_spec_count[spec_id] = {**{category: 0 for category in all_categories}, **counts}
+            specs[spec_id] = {"cases": [], "status": spec_status(counts)}
+
+        # specs reference their cases by position to keep the file small
+        for index, case in enumerate(cases):
+            for spec_id in case.get("functional_specifications", []):
+                specs[spec_id]["cases"].append(index)
+
+        data = dict(header)
+        data.update({
+            "specs": specs,
+            "functional_spec_count": functional_spec_count,
+            "category_count": dict(self.category_count),
+            "all_categories": all_categories,
+            "testsuites": [{"cases": cases}],
+        })
+        return data
+
+
+class CheckpointStore:
+    """Append-only JSONL checkpoint: a header line followed by one line per test result.
+
+    Results are appended as tests finish; the store is compacted into the
+    regular JSON checkpoint at the end of the session. Parallel workers each
+    append to their own segment of the run, which the main process merges
+    when it compacts the store.
+    """
+
+    def __init__(self, path: Path, header: Dict, cases: Optional[List[Dict]] = None):
+        self.path = Path(path)
+        self.header = header
+        self.aggregates = CheckpointAggregates()
+        with open(self.path, "w") as f:
+            f.write(json.dumps({"header": header}) + "\n")
+            for case in cases or []:
+                f.write(json.dumps({"case": case}) + "\n")
+                self.aggregates.add(case)
+
+    def append(self, test_case: Dict):
+        """Append one test result"""
+        with open(self.path, "a") as f:
+            f.write(json.dumps({"case": test_case}) + "\n")
+        self.aggregates.add(test_case)
+
+    def compact(self, test_status: str = "complete", segments: Sequence[Path] = ()) -> Path:
+        """Merge the worker segments, write the JSON checkpoint for the report
+        and remove the JSONL files"""
+        for segment in segments:
+            for case in read_checkpoint(segment)[1]:
+                self.aggregates.add(case)
+
+        data = self.aggregates.to_report_data(self.header)
+        data["test_status"] = test_status
+        json_path = self.path.with_suffix(".json")
+        # written next to the final file and renamed, so readers never see half a checkpoint
+        tmp_path = json_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, json_path)
+
+        for path in [self.path, *segments]:
+            os.remove(path)
+        return json_path
+
+
+def checkpoint_path(results_dir: Path, env_name: str, run_id: str, worker: Optional[str] = None) -> Path:
+    """Path of the main checkpoint of a run, or of a worker segment"""
+    if worker is None:
+        return Path(results_dir) / f"{env_name}_checkpoint_{run_id}.jsonl"
+    return Path(results_dir) / f"{env_name}_checkpoint_{run_id}.{worker}.jsonl"
+
+
+def run_segments(results_dir: Path, env_name: str, run_id: str) -> List[Path]:
+    """Worker segments of a run"""
+    return sorted(Path(results_dir).glob(f"{env_name}_checkpoint_{run_id}.*.jsonl"))
+
+
+def run_files(results_dir: Path, env_name: str, run_id: str, segments: bool = True) -> List[Path]:
+    """Checkpoint files of a run: the main checkpoint first, then the worker segments"""
+    prefix = Path(results_dir) / f"{env_name}_checkpoint_{run_id}"
+    files = [path for path in (prefix.with_name(prefix.name + ".json"), prefix.with_name(prefix.name + ".jsonl"))
+             if path.exists()]
+    if segments:
+        files += run_segments(results_dir, env_name, run_id)
+    return files
+
+
+def iter_checkpoint(path: Path) -> Iterator[Dict]:
+    """Records of a checkpoint, {"header": ...} first and then one {"case": ...}
+    per test result. JSONL checkpoints are read one line at a time."""
+    path = Path(path)
+    if path.suffix != ".jsonl":
+        with open(path, "r") as f:
+            data = json.load(f)
+        yield {"header": {key: value for key, value in data.items() if key not in REPORT_KEYS}}
+        for case in data["testsuites"][0]["cases"] if data.get("testsuites") else []:
+            yield {"case": case}
+        return
+
+    with open(path, "r") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                # last line of an interrupted run
+                continue
+
+
+def read_checkpoint(path: Path) -> Tuple[Dict, List[Dict]]:
+    """Header and test cases of a JSON checkpoint or of a JSONL checkpoint / segment"""
+    header = {}
+    cases = []
+    for record in iter_checkpoint(path):
+        if "header" in record:
+            header = record["header"]
+        else:
+            cases.append(record["case"])
+    return header, cases
+
+
+def load_checkpoint(path: Path) -> Dict:
+    """Load a JSON or JSONL checkpoint into the report data structure"""
+    path = Path(path)
+    if path.suffix != ".jsonl":
+        with open(path, "r") as f:
+            return json.load(f)
+    return load_checkpoint_files([path])
+
+
+def load_checkpoint_files(paths: Sequence[Path]) -> Dict:
+    """Merged view of several checkpoint files, later results replacing earlier ones"""
+    header = {}
+    aggregates = CheckpointAggregates()
+    for path in paths:
+        file_header, cases = read_checkpoint(path)
+        header = header or file_header
+        for case in cases:
+            aggregates.add(case)
+    return aggregates.to_report_data(header)
+
+
+def find_last_run(results_dir: Path, env_name: str) -> Optional[str]:
+    """Run id of the most recent checkpoint for the environment"""
+    checkpoint_files = (list(Path(results_dir).glob(f"{env_name}_checkpoint_*.json")) +
+                        list(Path(results_dir).glob(f"{env_name}_checkpoint_*.jsonl")))
+    if not checkpoint_files:
+        return None
+    last = max(checkpoint_files, key=lambda x: x.stat().st_mtime)
+    # <env>_checkpoint_<run id>[.<worker>].json[l]
+    return last.name[len(f"{env_name}_checkpoint_"):].split(".")[0]
@@ -44,7 +44,10 @@ def load_config():
             'title': 'pytest HTML Report',
             'img_url': 'https://icon.icepanel.io/Technology/svg/pytest.svg',
             'report_dir': 'reports',
-            'test_environment': 'Development'
+            'test_environment': 'Development',
+            'streaming_threshold': 1000,
+            'page_size': 200,
+            'excel_results': False
         },
         'theme': {
             'primary_color': '#0052CC',
@@ -71,6 +74,15 @@ def load_config():
         'logging': {
             'step_level': 24,
             'assertion_level': 25
+        },
+        'timings': {
+            'enabled': False,
+            'database': None,
+            'baseline_runs': 10,
+            'min_runs': 5,
+            'threshold': 3.0,
+            'min_slowdown': 0.2,
+            'min_seconds': 0.1
         }
     }
 
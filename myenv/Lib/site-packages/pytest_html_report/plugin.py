@@ -7,13 +7,21 @@ from typing import List, Dict, Any
 from xml.etree.ElementTree import SubElement
 import pytest
 from _pytest.logging import LogCaptureHandler
+from .checkpoint import (CheckpointStore, checkpoint_path, find_last_run, load_checkpoint_files, run_files,
+                         run_segments)
 from .config import load_config, get_config
-from .report_generator import process_test_data, generate_html_from_json
+from .report_generator import generate_html_from_checkpoint
+from .timings import TimingRecorder, find_regressions, format_regression, timings_database
 
 # Configure custom logging levels
 STEP_LEVEL = 24
 ASSERTION_LEVEL = 25
 
+# Parallel workers write checkpoint segments of the run started by the main process,
+# test/parallel.py passes both variables in the environment of its worker processes only
+RUN_ENV = "PYTEST_HTML_REPORT_RUN"
+WORKER_ENV = "PYTEST_HTML_REPORT_WORKER"
+
 logging.addLevelName(STEP_LEVEL, "STEP")
 logging.addLevelName(ASSERTION_LEVEL, "ASSERTION")
 
@@ -97,40 +105,69 @@ def pytest_sessionstart(session):
     env_name = CONFIG['report']['test_environment']
     current_time = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
 
-    if session.config.getoption("--use-last-checkpoint"):
-        checkpoint_files = list(results_dir.glob(f"{env_name}_checkpoint_*.json"))
-        if not checkpoint_files:
-            raise ValueError("No checkpoint files found when --use-last-checkpoint was specified.")
-
-        old_checkpoint_file = max(checkpoint_files, key=lambda x: x.stat().st_mtime)
-        new_checkpoint_file = results_dir / f"{env_name}_checkpoint_{current_time}.json"
-
-        with open(old_checkpoint_file, 'r') as f:
-            checkpoint_data = json.load(f)
-            checkpoint_data['test_status'] = 'ongoing'
-
-        with open(new_checkpoint_file, 'w') as f:
-            json.dump(checkpoint_data, f, indent=2)
-
-        old_checkpoint_file.unlink()
-        checkpoint_file = new_checkpoint_file
+    header = {
+        "test_environment": env_name,
+        "timestamp": datetime.datetime.now().strftime("%d %b %Y, %H:%M"),
+        "img_url": CONFIG['report']['img_url'],
+        "report_title": CONFIG['report']['title']
+    }
+    worker = None
+    parallel_run = checkpoint_worker(session.config)
+    if parallel_run is not None:
+        # The main process seeded the run, the worker only appends its own results
+        run_id, worker = parallel_run
+        checkpoint_store = CheckpointStore(checkpoint_path(results_dir, env_name, run_id, worker), header)
     else:
-        checkpoint_file = results_dir / f"{env_name}_checkpoint_{current_time}.json"
-        initial_data = {
-            "specs": {},
-            "functional_spec_count": {},
-            "testsuites": [{"cases": []}],
-            "test_environment": env_name,
-            "timestamp": datetime.datetime.now().strftime("%d %b %Y, %H:%M"),
-            "img_url": CONFIG['report']['img_url'],
-            "test_status": "ongoing",
-            "report_title": CONFIG['report']['title']
-        }
-
-        with open(checkpoint_file, 'w') as f:
-            json.dump(initial_data, f, indent=2)
-
-    session.config._checkpoint_file = checkpoint_file
+        run_id = current_time
+        cases = None
+        old_files = []
+        if session.config.getoption("--use-last-checkpoint"):
+            last_run = find_last_run(results_dir, env_name)
+            if last_run is None:
+                raise ValueError("No checkpoint files found when --use-last-checkpoint was specified.")
+
+            # Merged view of the last run, including segments of workers that were not merged
+            old_files = run_files(results_dir, env_name, last_run)
+            cases = load_checkpoint_files(old_files)["testsuites"][0]["cases"]
+
+        checkpoint_store = CheckpointStore(checkpoint_path(results_dir, env_name, run_id), header, cases)
+        for old_file in old_files:
+            if old_file != checkpoint_store.path:
+                old_file.unlink()
+
+    session.config._checkpoint_run = run_id
+    session.config._checkpoint_worker = worker
+    session.config._checkpoint_file = checkpoint_store.path
+    session.config._checkpoint_store = checkpoint_store
+
+    if CONFIG['timings']['enabled']:
+        timing_recorder = TimingRecorder(timings_database(CONFIG), run_id, env_name)
+        timing_recorder.counter.install()
+        session.config._timing_recorder = timing_recorder
+
+    if CONFIG['report'].get('excel_results'):
+        # Imported here so openpyxl is only needed when the export is enabled
+        from .results_export import ResultsExporter
+        excel_file = results_dir / (f"results_{run_id}.xlsx" if worker is None else f"results_{run_id}.{worker}.xlsx")
+        session.config._results_exporter = ResultsExporter(excel_file)
+
+
+def checkpoint_worker(config):
+    """Run id and worker id of the parallel worker running this session, None in the main process"""
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None and RUN_ENV in workerinput:
+        return workerinput[RUN_ENV], workerinput["workerid"]
+    if RUN_ENV in os.environ and WORKER_ENV in os.environ:
+        return os.environ[RUN_ENV], os.environ[WORKER_ENV]
+    return None
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Hand the run id of the main process to the pytest-xdist workers"""
+    run_id = getattr(node.config, "_checkpoint_run", None)
+    if run_id is not None:
+        node.workerinput[RUN_ENV] = run_id
 
 
 def pytest_sessionfinish(session, exitstatus):
@@ -144,29 +181,63 @@ def pytest_sessionfinish(session, exitstatus):
                 property_xml.text = value
         xml.write_xml()
 
-    checkpoint_file = getattr(session.config, "_checkpoint_file", None)
-    if checkpoint_file and checkpoint_file.exists():
-        # Update test status to complete
-        with open(checkpoint_file, 'r') as f:
-            data = json.load(f)
-        data['test_status'] = 'complete'
-        with open(checkpoint_file, 'w') as f:
-            json.dump(data, f, indent=2)
-
-        # Generate HTML report
-        CONFIG = get_config()
+    timing_recorder = getattr(session.config, "_timing_recorder", None)
+    if timing_recorder:
+        timing_recorder.counter.uninstall()
+        timing_recorder.save()
+
+    results_exporter = getattr(session.config, "_results_exporter", None)
+    if getattr(session.config, "_checkpoint_worker", None) is not None:
+        # The main process merges the worker segments and generates the report
+        if results_exporter:
+            results_exporter.save()
+        return
+
+    if results_exporter:
+        run_id = session.config._checkpoint_run
+        results_exporter.merge(sorted(results_exporter.path.parent.glob(f"results_{run_id}.*.xlsx")))
+        results_exporter.save()
+        print(f"\nExcel Results Generated: {results_exporter.path}")
+
+    CONFIG = get_config()
+    regressions = []
+    if timing_recorder:
+        regressions = find_regressions(timing_recorder.database, timing_recorder.run_id,
+                                       timing_recorder.environment, CONFIG['timings'])
+    session.config._timing_regressions = regressions
+
+    checkpoint_store = getattr(session.config, "_checkpoint_store", None)
+    if checkpoint_store and checkpoint_store.path.exists():
+        segments = run_segments(checkpoint_store.path.parent, CONFIG['report']['test_environment'],
+                                session.config._checkpoint_run)
+
+        # Generate HTML report, streamed from the JSONL checkpoint and the worker segments
         results_dir = Path(CONFIG['report']['report_dir'])
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         html_file = results_dir / f"report_{timestamp}.html"
 
         try:
-            generate_html_from_json(str(checkpoint_file), str(html_file))
+            generate_html_from_checkpoint([checkpoint_store.path, *segments], str(html_file), regressions)
             print(f"\n{'='*60}")
             print(f"HTML Report Generated: {html_file}")
             print(f"{'='*60}\n")
         except Exception as e:
             print(f"\nError generating HTML report: {str(e)}")
 
+        # Merge the worker segments and compact the results into the final JSON checkpoint
+        checkpoint_file = checkpoint_store.compact(segments=segments)
+        session.config._checkpoint_file = checkpoint_file
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """Report the test phases that are slower than in the previous runs"""
+    regressions = getattr(config, "_timing_regressions", None)
+    if not regressions:
+        return
+    terminalreporter.write_sep("=", "performance regressions")
+    for regression in regressions:
+        terminalreporter.write_line(format_regression(regression))
+
 
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item, call):
@@ -176,6 +247,20 @@ def pytest_runtest_makereport(item, call):
 
     setattr(item, f"rep_{report.when}", report)
 
+    # Record the duration and WebDriver commands of the phase
+    timing_recorder = getattr(item.config, "_timing_recorder", None)
+    if timing_recorder:
+        item.webdriver_commands = getattr(item, "webdriver_commands", 0) + timing_recorder.add(report)
+
+    # Stream the test's row to the results workbook once it is finished
+    results_exporter = getattr(item.config, "_results_exporter", None)
+    if results_exporter and report.when == "teardown":
+        status, details = determine_test_status(item)
+        duration = sum(getattr(item, f"rep_{when}").duration
+                       for when in ("setup", "call", "teardown") if hasattr(item, f"rep_{when}"))
+        results_exporter.add(item.nodeid.split("::")[0], item.name, status, duration,
+                             getattr(item, "webdriver_commands", None), details)
+
     # Collect all markers
     reporting_marker = item.get_closest_marker("reporting")
     category_marker = item.get_closest_marker("category")
@@ -219,15 +304,14 @@ def pytest_collection_modifyitems(config, items):
     CONFIG = get_config()
     env_name = CONFIG['report']['test_environment']
     results_dir = Path(CONFIG['report']['report_dir'])
-    checkpoint_files = list(results_dir.glob(f"{env_name}_checkpoint_*.json"))
+    # pytest_sessionstart seeded the run's main checkpoint with the merged view of the last run.
+    # Workers read only that seed, not the segments being written, so they all select the same tests.
+    checkpoint_files = run_files(results_dir, env_name, config._checkpoint_run, segments=False)
     if not checkpoint_files:
         return
 
-    checkpoint_file = max(checkpoint_files, key=lambda x: x.stat().st_mtime)
-
     try:
-        with open(checkpoint_file, "r") as f:
-            checkpoint_data = json.load(f)
+        checkpoint_data = load_checkpoint_files(checkpoint_files)
     except (json.JSONDecodeError, FileNotFoundError):
         return
 
@@ -267,8 +351,8 @@ def save_test_result(request):
     """Save test results to checkpoint after each test"""
     yield
 
-    checkpoint_file = getattr(request.config, "_checkpoint_file", None)
-    if not checkpoint_file:
+    checkpoint_store = getattr(request.config, "_checkpoint_store", None)
+    if not checkpoint_store:
         logging.warning("No checkpoint file set in session.config; skipping checkpoint update.")
         return
 
@@ -283,7 +367,7 @@ def save_test_result(request):
     test_case = gather_test_metadata(request.node, test_name, test_class, status, details)
 
     # Update checkpoint
-    update_checkpoint(checkpoint_file, test_case)
+    update_checkpoint(checkpoint_store, test_case)
 
 
 def determine_test_status(node):
@@ -376,49 +460,6 @@ def gather_test_metadata(node, test_name, test_class, status, details):
     }
 
 
-def update_checkpoint(checkpoint_file, test_case):
-    """Update checkpoint file with test result"""
-    CONFIG = get_config()
-
-    # Load existing data
-    data = {
-        "specs": {},
-        "functional_spec_count": {},
-        "testsuites": [{"cases": []}],
-        "test_environment": CONFIG['report']['test_environment'],
-        "timestamp": datetime.datetime.now().strftime("%d %b %Y, %H:%M"),
-        "img_url": CONFIG['report']['img_url'],
-        "test_status": "ongoing",
-        "report_title": CONFIG['report']['title']
-    }
-
-    if checkpoint_file.exists():
-        try:
-            with open(checkpoint_file, "r") as f:
-                file_content = f.read()
-                if file_content.strip():
-                    data = json.loads(file_content)
-                    # Remove existing test case if present
-                    if "testsuites" in data and data["testsuites"][0]["cases"]:
-                        data["testsuites"][0]["cases"] = [
-                            case for case in data["testsuites"][0]["cases"]
-                            if case["name"] != test_case["name"]
-                        ]
-        except json.JSONDecodeError:
-            pass
-
-    # Add test case
-    data["testsuites"][0]["cases"].append(test_case)
-
-    # Reprocess all test data
-    processed_data = process_test_data(
-        data["testsuites"][0]["cases"],
-        data.get("test_environment")
-    )
-
-    # Update data with processed results
-    data.update(processed_data)
-
-    # Save checkpoint
-    with open(checkpoint_file, "w") as f:
-        json.dump(data, f, indent=2)
\ No newline at end of file
+def update_checkpoint(checkpoint_store, test_case):
+    """Append a test result to the checkpoint"""
+    checkpoint_store.append(test_case)
@@ -1,9 +1,12 @@
 import json
 import os
+import shutil
 import xml.etree.ElementTree as ET
 from datetime import datetime
-from typing import Dict, List, Set
+from html import escape
+from typing import Dict, Iterable, List, Optional, Sequence, Set
 from pathlib import Path
+from .checkpoint import CheckpointAggregates, iter_checkpoint, load_checkpoint_files
 from .config import get_config
 
 
@@ -126,6 +129,11 @@ def parse_json_to_data(json_source):
 
         data["all_categories"] = list(all_categories)
 
+        # Compacted checkpoints reference the spec cases by position
+        cases = data["testsuites"][0]["cases"] if data.get("testsuites") else []
+        for spec in data.get("specs", {}).values():
+            spec["cases"] = [cases[case] if isinstance(case, int) else case for case in spec["cases"]]
+
         # Ensure category counts are in functional_spec_count
         for spec_id, counts in data.get("functional_spec_count", {}).items():
             for category in all_categories:
@@ -166,26 +174,10 @@ def create_html_from_data(parsed_data):
 
 def generate_html_content(parsed_data):
     """Generate the main content of the HTML report"""
-    CONFIG = get_config()
     content = ""
 
     # Header
-    report_title = parsed_data.get('report_title', CONFIG['report']['title'])
-    content += (f"<div class='header-container'>"
-                f"<div class='header-content'>"
-                f"<img src='{parsed_data['img_url']}' alt='Logo' class='logo'>"
-                f"<div class='header-title'>"
-                f"<h2>{report_title}</h2>"
-                f"<div class='header-meta'>")
-
-    # Timestamp
-    content += f"<span>Report generation time: {parsed_data['timestamp']}</span>"
-
-    # Test environment
-    if parsed_data.get('test_environment'):
-        content += f"<span>Test Environment: {parsed_data['test_environment']}</span>"
-
-    content += "</div></div></div></div>"
+    content += generate_header(parsed_data)
 
     # Main content container
     content += "<div class='main-container'>\n"
@@ -196,6 +188,9 @@ def generate_html_content(parsed_data):
     # Summary table
     content += generate_summary_table(parsed_data)
 
+    # Slowdowns against the previous runs
+    content += generate_regressions_table(parsed_data)
+
     # Detailed test results
     content += generate_detailed_results(parsed_data)
 
@@ -207,6 +202,28 @@ def generate_html_content(parsed_data):
     return content
 
 
+def generate_header(parsed_data):
+    """Generate the report header"""
+    CONFIG = get_config()
+    report_title = parsed_data.get('report_title', CONFIG['report']['title'])
+    html = (f"<div class='header-container'>"
+            f"<div class='header-content'>"
+            f"<img src='{parsed_data['img_url']}' alt='Logo' class='logo'>"
+            f"<div class='header-title'>"
+            f"<h2>{report_title}</h2>"
+            f"<div class='header-meta'>")
+
+    # Timestamp
+    html += f"<span>Report generation time: {parsed_data['timestamp']}</span>"
+
+    # Test environment
+    if parsed_data.get('test_environment'):
+        html += f"<span>Test Environment: {parsed_data['test_environment']}</span>"
+
+    html += "</div></div></div></div>"
+    return html
+
+
 def generate_filter_buttons(parsed_data):
     """Generate filter button section"""
     all_categories = parsed_data.get("all_categories", [])
@@ -296,6 +313,109 @@ def generate_summary_table(parsed_data):
     return html
 
 
+def generate_regressions_table(parsed_data):
+    """Generate the table of test phases slower than in the previous runs"""
+    regressions = parsed_data.get("regressions", [])
+    if not regressions:
+        return ""
+
+    html = "<div id='performance-regressions' class='test-result-block'>\n"
+    html += "<h2 class='spec-title'>Performance Regressions</h2>\n"
+    html += "<div class='table-wrapper'>\n"
+    html += "<table>\n"
+    html += "<tr><th>Test</th><th>Phase</th><th>Duration</th><th>Baseline</th>"
+    html += "<th>Slowdown</th><th>WebDriver Commands</th></tr>\n"
+
+    for regression in regressions:
+        slowdown = f"{regression['slowdown']:.1f}x" if regression["slowdown"] else "-"
+        html += "<tr>\n"
+        html += f"<td>{regression['test']}</td>\n"
+        html += f"<td>{regression['phase']}</td>\n"
+        html += f"<td class='failed'>{regression['duration']:.2f}s</td>\n"
+        html += f"<td>{regression['baseline']:.2f}s</td>\n"
+        html += f"<td>{slowdown}</td>\n"
+        html += f"<td>{regression['commands']} (baseline {regression['baseline_commands']:g})</td>\n"
+        html += "</tr>\n"
+
+    html += "</table>\n"
+    html += "</div>\n"
+    html += "</div>\n"
+    return html
+
+
+def spec_status_class(status: str) -> str:
+    """CSS class of an overall spec status"""
+    return "passed" if status == "Passing" else ("failed" if status == "Failing" else "skipped")
+
+
+def generate_spec_summary(spec_id, content, counts, all_categories):
+    """Generate the title and counts of a spec result block"""
+    status_class = spec_status_class(content["status"])
+
+    html = f"<h2 class='spec-title'>{spec_id} - {get_functional_spec_name(spec_id)}</h2>\n"
+    html += "<div class='spec-summary'>\n"
+    html += f"<div class='spec-status'>Overall Status: <span class='{status_class}'>{content['status']}</span></div>\n"
+    html += "<div class='test-counts'>\n"
+    html += f"<span class='count passed'>Passed: {counts['pass']}/{counts['total']}</span>\n"
+    html += f"<span class='count failed'>Failed: {counts['fail']}/{counts['total']}</span>\n"
+    html += f"<span class='count skipped'>Skipped: {counts['skip']}/{counts['total']}</span>\n"
+
+    # Add category counts
+    for category in sorted(all_categories):
+        count = counts.get(category, 0)
+        if count > 0:
+            display_name = get_category_display_name(category)
+            # Use different style for unknown categories
+            category_class = 'category' if is_known_category(category) else 'category-unknown'
+            html += f"<span class='count {category_class}'>{display_name}: {count}/{counts['total']}</span>\n"
+
+    html += f"<button id='btn-{spec_id}' onclick='toggleDetails(\"{spec_id}\")'>Expand</button>\n"
+    html += "</div>\n</div>\n"
+    return html
+
+
+def generate_detail_table_header():
+    """Generate the header row of a detailed results table"""
+    html = "<tr><th>Test File</th><th>Test Name</th><th>Developer</th>"
+    html += "<th>Description</th><th>Categories</th><th>Status</th><th>Execution Details</th></tr>\n"
+    return html
+
+
+def generate_case_row(case):
+    """Generate the detailed results row of a test case"""
+    status_class = case["status"].lower()
+    case_id = f"{case['classname']}-{case['name']}".replace(".", "-")
+    categories_str = ",".join(case.get("categories", []))
+
+    html = f"<tr class='{case['status']}' data-categories='{categories_str}'>\n"
+    html += f"<td>{case['classname']}</td>\n"
+    html += f"<td>{case['name']}</td>\n"
+    html += f"<td>{case['developer']}</td>\n"
+    html += f"<td>{case['test_description']}</td>\n"
+
+    # Categories column
+    html += "<td>"
+    for category in case.get("categories", []):
+        display_name = get_category_display_name(category)
+        # Use different style for unknown categories
+        tag_class = 'category-tag' if is_known_category(category) else 'category-tag unknown'
+        html += f"<span class='{tag_class}'>{display_name}</span>"
+    html += "</td>\n"
+
+    # Status column
+    html += f"<td class='{status_class}'>{case['status']}"
+    if case["status"] in ["Failed", "Skipped"]:
+        html += f" <button onclick=\"toggleTestDetails('{case_id}')\">Show details</button>"
+        html += f"<code id='test-details-{case_id}' style='display: none;'>{case['details']}</code>"
+    html += "</td>\n"
+
+    # Execution details column
+    html += f"<td><button onclick=\"toggleExecutionDetails('{case_id}')\">Show logs</button>"
+    html += f"<div id='exec-details-{case_id}' style='display: none;'>{case['logs']}</div></td>\n"
+    html += "</tr>\n"
+    return html
+
+
 def generate_detailed_results(parsed_data):
     """Generate detailed test results"""
     html = ""
@@ -303,68 +423,18 @@ def generate_detailed_results(parsed_data):
 
     for spec_id, content in parsed_data['specs'].items():
         counts = parsed_data['functional_spec_count'][spec_id]
-        status_class = "passed" if content["status"] == "Passing" else (
-            "failed" if content["status"] == "Failing" else "skipped")
 
         html += f"<div id='spec-{spec_id}' class='test-result-block'>\n"
-        html += f"<h2 class='spec-title'>{spec_id} - {get_functional_spec_name(spec_id)}</h2>\n"
-        html += "<div class='spec-summary'>\n"
-        html += f"<div class='spec-status'>Overall Status: <span class='{status_class}'>{content['status']}</span></div>\n"
-        html += "<div class='test-counts'>\n"
-        html += f"<span class='count passed'>Passed: {counts['pass']}/{counts['total']}</span>\n"
-        html += f"<span class='count failed'>Failed: {counts['fail']}/{counts['total']}</span>\n"
-        html += f"<span class='count skipped'>Skipped: {counts['skip']}/{counts['total']}</span>\n"
-
-        # Add category counts
-        for category in sorted(all_categories):
-            count = counts.get(category, 0)
-            if count > 0:
-                display_name = get_category_display_name(category)
-                # Use different style for unknown categories
-                category_class = 'category' if is_known_category(category) else 'category-unknown'
-                html += f"<span class='count {category_class}'>{display_name}: {count}/{counts['total']}</span>\n"
-
-        html += f"<button id='btn-{spec_id}' onclick='toggleDetails(\"{spec_id}\")'>Expand</button>\n"
-        html += "</div>\n</div>\n"
+        html += generate_spec_summary(spec_id, content, counts, all_categories)
 
         # Test cases table with wrapper for horizontal scroll
         html += f"<div id='details-{spec_id}' style='display: none;'>\n"
         html += "<div class='detail-table-wrapper'>\n"  # Add wrapper div
         html += "<table>\n"
-        html += "<tr><th>Test File</th><th>Test Name</th><th>Developer</th>"
-        html += "<th>Description</th><th>Categories</th><th>Status</th><th>Execution Details</th></tr>\n"
+        html += generate_detail_table_header()
 
         for case in content["cases"]:
-            status_class = case["status"].lower()
-            case_id = f"{case['classname']}-{case['name']}".replace(".", "-")
-            categories_str = ",".join(case.get("categories", []))
-
-            html += f"<tr class='{case['status']}' data-categories='{categories_str}'>\n"
-            html += f"<td>{case['classname']}</td>\n"
-            html += f"<td>{case['name']}</td>\n"
-            html += f"<td>{case['developer']}</td>\n"
-            html += f"<td>{case['test_description']}</td>\n"
-
-            # Categories column
-            html += "<td>"
-            for category in case.get("categories", []):
-                display_name = get_category_display_name(category)
-                # Use different style for unknown categories
-                tag_class = 'category-tag' if is_known_category(category) else 'category-tag unknown'
-                html += f"<span class='{tag_class}'>{display_name}</span>"
-            html += "</td>\n"
-
-            # Status column
-            html += f"<td class='{status_class}'>{case['status']}"
-            if case["status"] in ["Failed", "Skipped"]:
-                html += f" <button onclick=\"toggleTestDetails('{case_id}')\">Show details</button>"
-                html += f"<code id='test-details-{case_id}' style='display: none;'>{case['details']}</code>"
-            html += "</td>\n"
-
-            # Execution details column
-            html += f"<td><button onclick=\"toggleExecutionDetails('{case_id}')\">Show logs</button>"
-            html += f"<div id='exec-details-{case_id}' style='display: none;'>{case['logs']}</div></td>\n"
-            html += "</tr>\n"
+            html += generate_case_row(case)
 
         html += "</table>\n"
         html += "</div>\n"  # Close wrapper div
@@ -373,9 +443,177 @@ def generate_detailed_results(parsed_data):
     return html
 
 
-def generate_html_from_json(json_path, output_file):
+def write_shard(shard_file: Path, spec_id: str, page: int, rows: str):
+    """Write one page of detailed results as a sidecar script.
+
+    The page is a JSON payload passed to reportShard(), so the report can load
+    it with a <script> tag (fetch() is not allowed for file:// pages).
+    """
+    payload = json.dumps({"spec": spec_id, "page": page, "rows": rows})
+    with open(shard_file, 'w', encoding='utf-8') as f:
+        f.write(f"reportShard({payload});\n")
+
+
+def write_spec_blocks(out, parsed_data, shard_dir: Path, page_size: int):
+    """Write the spec blocks to `out`, their detailed results are loaded from the shards"""
+    all_categories = parsed_data.get("all_categories", [])
+
+    for spec_index, (spec_id, content) in enumerate(parsed_data['specs'].items()):
+        counts = parsed_data['functional_spec_count'][spec_id]
+        cases = content["cases"]
+        pages = max(1, -(-len(cases) // page_size))
+
+        # Status and categories of the tests, so filters work before the rows are loaded
+        combinations = sorted({f"{case['status']}|{','.join(case.get('categories', []))}" for case in cases})
+
+        out.write(f"<div id='spec-{spec_id}' class='test-result-block' "
+                  f"data-combinations=\"{escape(json.dumps(combinations), quote=True)}\">\n")
+        out.write(generate_spec_summary(spec_id, content, counts, all_categories))
+
+        out.write(f"<div id='details-{spec_id}' style='display: none;' "
+                  f"data-shard='{shard_dir.name}/{spec_index}' data-pages='{pages}'>\n")
+        out.write("<div class='detail-table-wrapper'>\n")
+        out.write("<table>\n<thead>\n")
+        out.write(generate_detail_table_header())
+        out.write(f"</thead>\n<tbody id='rows-{spec_id}'></tbody>\n</table>\n")
+        out.write("</div>\n")
+        if pages > 1:
+            out.write("<div class='pager'>"
+                      f"<button onclick='changePage(\"{spec_id}\", -1)'>Previous</button>"
+                      f"<span id='page-{spec_id}'>Page 1 of {pages}</span>"
+                      f"<button onclick='changePage(\"{spec_id}\", 1)'>Next</button>"
+                      "</div>\n")
+        out.write("</div>\n</div>\n")
+
+
+class ShardWriter:
+    """Writes the detailed results of each spec in pages of `page_size` rows as
+    the test cases come, keeping at most one page per spec in memory"""
+
+    def __init__(self, shard_dir: Path, spec_ids, page_size: int):
+        self.shard_dir = shard_dir
+        self.page_size = page_size
+        self.spec_index = {spec_id: index for index, spec_id in enumerate(spec_ids)}
+        self.rows = {spec_id: [] for spec_id in self.spec_index}
+        self.pages = {spec_id: 0 for spec_id in self.spec_index}
+
+    def add(self, case: Dict):
+        """Add the row of a test case to the pages of its specs"""
+        row = generate_case_row(case)
+        for spec_id in case.get("functional_specifications", []):
+            rows = self.rows[spec_id]
+            rows.append(row)
+            if len(rows) == self.page_size:
+                self._flush(spec_id)
+
+    def _flush(self, spec_id: str):
+        page = self.pages[spec_id]
+        write_shard(self.shard_dir / f"{self.spec_index[spec_id]}-{page}.js", spec_id, page,
+                    "".join(self.rows[spec_id]))
+        self.rows[spec_id] = []
+        self.pages[spec_id] = page + 1
+
+    def close(self):
+        """Write the last, partial page of every spec"""
+        for spec_id, rows in self.rows.items():
+            if rows or not self.pages[spec_id]:
+                self._flush(spec_id)
+
+
+def write_html_report(parsed_data, output_file, page_size: int = 200, cases: Optional[Iterable[Dict]] = None):
+    """Stream the HTML report to disk: header and summary first, then the spec
+    blocks, with the detailed results of each spec in paginated sidecar shards
+    that the page loads when a spec is expanded.
+
+    `cases` are the test cases in report order, by default the ones of
+    `parsed_data`; the spec blocks only need their status and categories."""
+    CONFIG = get_config()
+    output_file = Path(output_file)
+    shard_dir = output_file.with_name(f"{output_file.stem}_shards")
+    if shard_dir.exists():
+        shutil.rmtree(shard_dir)
+    shard_dir.mkdir(parents=True)
+
+    template = load_html_template()
+    for key, value in CONFIG.get('theme', {}).items():
+        template = template.replace(f"{{{{{key}}}}}", value)
+    before, after = template.split("{{content}}")
+
+    with open(output_file, 'w', encoding='utf-8') as out:
+        out.write(before)
+        out.write(generate_header(parsed_data))
+        out.write("<div class='main-container'>\n")
+        out.write(generate_filter_buttons(parsed_data))
+        out.write(generate_summary_table(parsed_data))
+        out.write(generate_regressions_table(parsed_data))
+        write_spec_blocks(out, parsed_data, shard_dir, page_size)
+        out.write("<div id='no-results' class='no-results' style='display: none;'>No tests match the selected filters</div>")
+        out.write("</div>\n")
+        out.write(after)
+
+    if cases is None:
+        cases = parsed_data["testsuites"][0]["cases"] if parsed_data.get("testsuites") else []
+    shards = ShardWriter(shard_dir, parsed_data['specs'], page_size)
+    for case in cases:
+        shards.add(case)
+    shards.close()
+
+
+def generate_html_from_json(json_path, output_file, regressions=None):
     """Generate HTML report from JSON checkpoint file"""
+    CONFIG = get_config()
     data = parse_json_to_data(json_path)
+    data["regressions"] = regressions or []
+
+    # Large runs are streamed with lazily loaded detailed results
+    case_count = sum(len(suite.get("cases", [])) for suite in data.get("testsuites", []))
+    if case_count > CONFIG['report'].get('streaming_threshold', 1000):
+        write_html_report(data, output_file, CONFIG['report'].get('page_size', 200))
+        return
+
     html_output = create_html_from_data(data)
     with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html_output)
\ No newline at end of file
+        f.write(html_output)
+
+
+def generate_html_from_checkpoint(paths: Sequence[Path], output_file, regressions=None):
+    """Generate the HTML report from checkpoint files (JSONL checkpoint and worker
+    segments) without loading all the results.
+
+    A first pass keeps only what the summary needs (status, categories and specs
+    of the latest result of every test), a second pass streams the full results
+    into the detail shards. Small runs are rendered in one page as usual."""
+    CONFIG = get_config()
+    header = {}
+    aggregates = CheckpointAggregates()
+    latest = {}
+    position = 0
+    for path in paths:
+        for record in iter_checkpoint(path):
+            if "header" in record:
+                header = header or record["header"]
+                continue
+            case = record["case"]
+            aggregates.add({"name": case["name"], "status": case["status"],
+                            "categories": case.get("categories", []),
+                            "functional_specifications": case.get("functional_specifications", [])})
+            latest[case["name"]] = position
+            position += 1
+
+    if len(latest) <= CONFIG['report'].get('streaming_threshold', 1000):
+        generate_html_from_json(load_checkpoint_files(paths), output_file, regressions)
+        return
+
+    data = parse_json_to_data(aggregates.to_report_data(header))
+    data["regressions"] = regressions or []
+
+    def latest_cases():
+        index = 0
+        for path in paths:
+            for record in iter_checkpoint(path):
+                if "case" in record:
+                    if latest[record["case"]["name"]] == index:
+                        yield record["case"]
+                    index += 1
+
+    write_html_report(data, output_file, CONFIG['report'].get('page_size', 200), latest_cases())
@@ -0,0 +1,56 @@
+import os
+from pathlib import Path
+from typing import List, Optional
+
+from openpyxl import Workbook, load_workbook
+
+HEADER = ["Test File", "Test Name", "Status", "Duration (s)", "WebDriver Commands", "Failure Message"]
+COLUMN_WIDTHS = {"A": 40, "B": 40, "C": 10, "D": 14, "E": 20, "F": 80}
+
+
+def failure_message(details: str) -> str:
+    """First line of the failure details, without the checkpoint prefixes"""
+    if not details:
+        return ""
+    line = details.strip().splitlines()[0]
+    for prefix in ("Message: ", "Details: "):
+        if line.startswith(prefix):
+            return line[len(prefix):]
+    return line
+
+
+class ResultsExporter:
+    """Results workbook written one row per test as results arrive.
+
+    The workbook is in openpyxl's write-only mode: appended rows go straight
+    to a temporary file, so memory stays constant however many tests run.
+    Parallel workers write their own segment, which the main process appends
+    to its workbook before saving it.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet("Results")
+        for column, width in COLUMN_WIDTHS.items():
+            self.sheet.column_dimensions[column].width = width
+        self.sheet.freeze_panes = "A2"
+        self.sheet.append(HEADER)
+
+    def add(self, test_file: str, test_name: str, status: str, duration: float,
+            commands: Optional[int], details: str):
+        """Append the row of a finished test"""
+        self.sheet.append([test_file, test_name, status, round(duration, 3), commands, failure_message(details)])
+
+    def merge(self, segments: List[Path]):
+        """Append the rows of worker segments, and remove them"""
+        for segment in segments:
+            workbook = load_workbook(segment, read_only=True)
+            rows = workbook.worksheets[0].iter_rows(min_row=2, values_only=True)
+            for row in rows:
+                self.sheet.append(row)
+            workbook.close()
+            os.remove(segment)
+
+    def save(self):
+        self.workbook.save(self.path)
@@ -0,0 +1,165 @@
+import sqlite3
+import statistics
+import time
+from pathlib import Path
+from typing import Dict, List
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS timings (
+    run_id TEXT NOT NULL,
+    environment TEXT NOT NULL,
+    test TEXT NOT NULL,
+    phase TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    duration REAL NOT NULL,
+    commands INTEGER NOT NULL,
+    recorded REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS timings_test ON timings (environment, test, phase, recorded);
+"""
+
+# scale factor making the median absolute deviation comparable to a standard deviation
+MAD_SCALE = 0.6745
+
+
+class CommandCounter:
+    """Counts the WebDriver commands sent by this process, when selenium is installed.
+
+    WebDriver.execute is wrapped for every driver of the process while the
+    counter is installed, which is why the timings are off by default.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._reported = 0
+        self._original = None
+
+    def install(self):
+        try:
+            from selenium.webdriver.remote.webdriver import WebDriver
+        except ImportError:
+            return
+        original = self._original = WebDriver.execute
+        counter = self
+
+        def execute(driver, driver_command, params=None):
+            counter.count += 1
+            return original(driver, driver_command, params)
+
+        WebDriver.execute = execute
+
+    def uninstall(self):
+        if self._original is not None:
+            from selenium.webdriver.remote.webdriver import WebDriver
+            WebDriver.execute = self._original
+            self._original = None
+
+    def since_last_report(self) -> int:
+        """Commands sent since the previous call (i.e. during the test phase that just finished)"""
+        count = self.count - self._reported
+        self._reported = self.count
+        return count
+
+
+class TimingRecorder:
+    """Collects the duration and command count of every test phase and saves them in one transaction"""
+
+    def __init__(self, database: Path, run_id: str, environment: str):
+        self.database = Path(database)
+        self.run_id = run_id
+        self.environment = environment
+        self.counter = CommandCounter()
+        self.rows = []
+
+    def add(self, report) -> int:
+        """Record a test phase from its report, returns the WebDriver commands sent during the phase"""
+        commands = self.counter.since_last_report()
+        self.rows.append((self.run_id, self.environment, report.nodeid, report.when, report.outcome,
+                          report.duration, commands, time.time()))
+        return commands
+
+    def save(self):
+        if not self.rows:
+            return
+        connection = connect(self.database)
+        with connection:
+            connection.executemany("INSERT INTO timings VALUES (?, ?, ?, ?, ?, ?, ?, ?)", self.rows)
+        connection.close()
+        self.rows = []
+
+
+def timings_database(config: Dict) -> Path:
+    """Path of the timing database, in the report directory unless configured"""
+    return Path(config['timings'].get('database') or Path(config['report']['report_dir']) / "timings.sqlite")
+
+
+def connect(database: Path) -> sqlite3.Connection:
+    """Open the timing database, creating it when needed"""
+    Path(database).parent.mkdir(exist_ok=True, parents=True)
+    # parallel workers save at the same time, wait for each other's write lock
+    connection = sqlite3.connect(str(database), timeout=30)
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def is_slowdown(duration: float, baseline: List[float], settings: Dict) -> bool:
+    """Whether a duration is significantly slower than its baseline durations.
+
+    The baseline median and median absolute deviation are used rather than
+    the mean and standard deviation, so a single slow run in the baseline
+    does not hide the next ones.
+    """
+    if len(baseline) < settings['min_runs']:
+        return False
+    median = statistics.median(baseline)
+    if duration - median < settings['min_seconds'] or duration < median * (1 + settings['min_slowdown']):
+        return False
+    deviation = statistics.median(abs(value - median) for value in baseline)
+    if deviation == 0:
+        return True
+    return MAD_SCALE * (duration - median) / deviation > settings['threshold']
+
+
+def find_regressions(database: Path, run_id: str, environment: str, settings: Dict) -> List[Dict]:
+    """Test phases of a run that are significantly slower than the previous passing runs"""
+    if not Path(database).exists():
+        return []
+
+    regressions = []
+    connection = connect(database)
+    with connection:
+        current = connection.execute(
+            "SELECT test, phase, MAX(duration), MAX(commands) FROM timings "
+            "WHERE run_id = ? AND environment = ? AND outcome = 'passed' GROUP BY test, phase",
+            (run_id, environment)).fetchall()
+        for test, phase, duration, commands in current:
+            # one row per run (reruns keep the slowest), for the last baseline_runs runs
+            baseline = connection.execute(
+                "SELECT MAX(duration), MAX(commands) FROM timings "
+                "WHERE environment = ? AND test = ? AND phase = ? AND run_id != ? AND outcome = 'passed' "
+                "GROUP BY run_id ORDER BY MAX(recorded) DESC LIMIT ?",
+                (environment, test, phase, run_id, settings['baseline_runs'])).fetchall()
+            durations = [row[0] for row in baseline]
+            if is_slowdown(duration, durations, settings):
+                median = statistics.median(durations)
+                regressions.append({
+                    "test": test,
+                    "phase": phase,
+                    "duration": duration,
+                    "baseline": median,
+                    "slowdown": duration / median if median else None,
+                    "commands": commands,
+                    "baseline_commands": statistics.median(row[1] for row in baseline),
+                })
+    connection.close()
+
+    # largest extra time first
+    return sorted(regressions, key=lambda regression: regression["baseline"] - regression["duration"])
+
+
+def format_regression(regression: Dict) -> str:
+    """One line description of a regression for the terminal"""
+    slowdown = f" ({regression['slowdown']:.1f}x)" if regression["slowdown"] else ""
+    return (f"{regression['duration']:8.2f}s vs {regression['baseline']:.2f}s{slowdown}  "
+            f"{regression['commands']} commands vs {regression['baseline_commands']:g}  "
+            f"{regression['test']} [{regression['phase']}]")
@@ -21,6 +21,7 @@ import platform
 import subprocess
 import sys
 import sysconfig
+import threading
 from pathlib import Path
 from typing import Optional
 
@@ -33,8 +34,17 @@ class SeleniumManager:
     """Wrapper for getting information from the Selenium Manager binaries.
 
     This implementation is still in beta, and may change.
+
+    Results of ``binary_paths`` are cached in memory and on disk (in the
+    Selenium cache folder, ``SE_CACHE_PATH``), keyed by the requested
+    arguments. A cached result is used only while the Selenium Manager,
+    driver and browser files are unchanged. Set ``SE_BINARY_PATHS_CACHE``
+    to ``false`` to always run Selenium Manager.
     """
 
+    _cache: Optional[dict] = None
+    _cache_lock = threading.Lock()
+
     def binary_paths(self, args: list) -> dict:
         """Determines the locations of the requested assets.
 
@@ -45,7 +55,16 @@ class SeleniumManager:
             Dictionary of assets and their path.
         """
 
-        args = [str(self._get_binary())] + args
+        binary = self._get_binary()
+        use_cache = os.getenv("SE_BINARY_PATHS_CACHE", "true").lower() != "false"
+        key = json.dumps([str(binary), _file_signature(binary)] + [str(arg) for arg in args])
+        if use_cache:
+            result = self._cached_result(key)
+            if result is not None:
+                logger.debug("Using cached Selenium Manager result for: %s", " ".join(map(str, args)))
+                return result
+
+        args = [str(binary)] + args
         if logger.getEffectiveLevel() == logging.DEBUG:
             args.append("--debug")
         args.append("--language-binding")
@@ -53,7 +72,55 @@ class SeleniumManager:
         args.append("--output")
         args.append("json")
 
-        return self._run(args)
+        result = self._run(args)
+        if use_cache:
+            self._store_result(key, result)
+        return result
+
+    @staticmethod
+    def _cache_file() -> Path:
+        cache_path = os.getenv("SE_CACHE_PATH") or Path.home().joinpath(".cache", "selenium")
+        return Path(cache_path).joinpath("se-binary-paths.json")
+
+    @classmethod
+    def _load_cache(cls) -> dict:
+        if cls._cache is None:
+            try:
+                cls._cache = json.loads(cls._cache_file().read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                cls._cache = {}
+        return cls._cache
+
+    @classmethod
+    def _cached_result(cls, key: str) -> Optional[dict]:
+        with cls._cache_lock:
+            entry = cls._load_cache().get(key)
+        if entry is None:
+            return None
+        for name, signature in entry["files"].items():
+            if _file_signature(entry["result"][name]) != signature:
+                logger.debug("Cached Selenium Manager result is stale, %s has changed", entry["result"][name])
+                return None
+        return dict(entry["result"])
+
+    @classmethod
+    def _store_result(cls, key: str, result: dict) -> None:
+        files = {
+            name: _file_signature(result[name]) for name in ("driver_path", "browser_path") if result.get(name)
+        }
+        if not files or None in files.values():
+            return
+        with cls._cache_lock:
+            cache = cls._load_cache()
+            cache[key] = {"result": result, "files": files}
+            cache_file = cls._cache_file()
+            try:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+                tmp_file.write_text(json.dumps(cache), encoding="utf-8")
+                os.replace(tmp_file, cache_file)
+            except OSError as err:
+                logger.debug("Unable to write Selenium Manager cache %s: %s", cache_file, err)
 
     @staticmethod
     def _get_binary() -> Path:
@@ -143,3 +210,13 @@ class SeleniumManager:
                 logger.warning(item["message"])
             elif item["level"] in ["DEBUG", "INFO"]:
                 logger.debug(item["message"])
+
+
+def _file_signature(path) -> Optional[list]:
+    """Returns the size and modification time of a file, or None if it does
+    not exist."""
+    try:
+        stat = os.stat(path)
+    except (OSError, TypeError, ValueError):
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
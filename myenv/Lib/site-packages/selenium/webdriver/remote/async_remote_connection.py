@@ -0,0 +1,250 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""An asyncio connection to the Remote WebDriver server.
+
+The HTTP/1.1 requests are written with h11 on asyncio streams, so one event
+loop can drive many sessions without a thread per session. The keep-alive
+connections are pooled per host and shared by all the sessions using the
+same AsyncRemoteConnection.
+"""
+
+import asyncio
+import logging
+import ssl
+from collections import defaultdict
+from typing import Optional
+from urllib import parse
+
+import h11
+
+from selenium.webdriver.remote.client_config import ClientConfig
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+from selenium.webdriver.remote.remote_connection import command_request
+from selenium.webdriver.remote.remote_connection import parse_response
+from selenium.webdriver.remote.remote_connection import remote_commands
+
+LOGGER = logging.getLogger(__name__)
+
+# requests that can be sent again when a pooled connection fails after sending them
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class _HttpConnection:
+    """A keep-alive HTTP/1.1 connection on an asyncio stream."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.http = h11.Connection(our_role=h11.CLIENT)
+        # whether any byte of the current request may have reached the remote end
+        self.sent = False
+
+    async def request(self, method: str, target: str, headers: list, body: bytes) -> tuple[int, str, dict, bytes]:
+        data = self.http.send(h11.Request(method=method, target=target, headers=headers))
+        if body:
+            data += self.http.send(h11.Data(data=body))
+        data += self.http.send(h11.EndOfMessage())
+        self.sent = True
+        self.writer.write(data)
+        await self.writer.drain()
+
+        response = None
+        chunks = []
+        while True:
+            event = self.http.next_event()
+            if event is h11.NEED_DATA:
+                self.http.receive_data(await self.reader.read(65536))
+            elif isinstance(event, h11.Response):
+                response = event
+            elif isinstance(event, h11.Data):
+                chunks.append(bytes(event.data))
+            elif isinstance(event, h11.EndOfMessage):
+                break
+            elif isinstance(event, h11.ConnectionClosed):
+                # closed before the end of the response, the body would be truncated
+                raise ConnectionError("The remote end closed the connection before the end of the response")
+        if response is None:
+            raise ConnectionError("The remote end closed the connection without a response")
+        headers = {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in response.headers}
+        return response.status_code, response.reason.decode("latin-1"), headers, b"".join(chunks)
+
+    @property
+    def reusable(self) -> bool:
+        if self.http.our_state is h11.DONE and self.http.their_state is h11.DONE:
+            self.http.start_next_cycle()
+            self.sent = False
+            return True
+        return False
+
+    @property
+    def closed_by_remote(self) -> bool:
+        """The remote end closed the idle connection (end of stream received)."""
+        return self.reader.at_eof()
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class AsyncRemoteConnection:
+    """An asyncio connection with the Remote WebDriver server.
+
+    One connection can be shared by any number of AsyncWebDriver sessions:
+    requests are sent on pooled keep-alive connections, at most
+    `max_connections` per host at the same time. HTTP proxies are not
+    supported.
+
+    Example:
+    --------
+    >>> connection = AsyncRemoteConnection(client_config=ClientConfig("http://grid:4444"))
+    >>> drivers = await asyncio.gather(*(AsyncWebDriver.start(connection, ChromeOptions()) for _ in range(100)))
+    """
+
+    extra_commands = RemoteConnection.extra_commands
+
+    def __init__(
+        self,
+        remote_server_addr: Optional[str] = None,
+        client_config: Optional[ClientConfig] = None,
+        max_connections: int = 100,
+    ):
+        self._client_config = client_config or ClientConfig(remote_server_addr=remote_server_addr)
+        if self._client_config.get_proxy_url():
+            raise ValueError("AsyncRemoteConnection does not support proxies, use a direct ClientConfig proxy")
+        self._commands = remote_commands
+        self._max_connections = max_connections
+        # (scheme, host, port) -> idle connections
+        self._idle: dict[tuple, list[_HttpConnection]] = defaultdict(list)
+        self._limits: dict[tuple, asyncio.Semaphore] = {}
+        self._ssl_context: Optional[ssl.SSLContext] = None
+
+    @property
+    def client_config(self) -> ClientConfig:
+        return self._client_config
+
+    def add_command(self, name, method, url):
+        """Register a new command."""
+        self._commands[name] = (method, url)
+
+    def get_command(self, name: str):
+        """Retrieve a command if it exists."""
+        return self._commands.get(name)
+
+    def _get_ssl_context(self) -> ssl.SSLContext:
+        if self._ssl_context is None:
+            if self._client_config.ignore_certificates:
+                context = ssl.create_default_context()
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+            else:
+                context = ssl.create_default_context(cafile=self._client_config.ca_certs)
+            self._ssl_context = context
+        return self._ssl_context
+
+    async def _open(self, key: tuple) -> _HttpConnection:
+        scheme, host, port = key
+        reader, writer = await asyncio.open_connection(
+            host, port, ssl=self._get_ssl_context() if scheme == "https" else None
+        )
+        return _HttpConnection(reader, writer)
+
+    async def execute(self, command, params):
+        """Send a command to the remote server.
+
+        Any path substitutions required for the URL mapped to the command should be
+        included in the command parameters.
+
+        Args:
+            command: A string specifying the command to execute.
+            params: A dictionary of named parameters to send with the command as
+                its JSON payload.
+        """
+        command_info = self._commands.get(command) or self.extra_commands.get(command)
+        assert command_info is not None, f"Unrecognised command {command}"
+        method, url, data = command_request(command_info, params, self._client_config.remote_server_addr)
+        LOGGER.debug("%s %s", method, url)
+        return await self._request(method, url, body=data)
+
+    async def _request(self, method, url, body=None) -> dict:
+        """Send an HTTP request to the remote server.
+
+        Args:
+            method: A string for the HTTP method to send the request with.
+            url: A string for the URL to send the request to.
+            body: A string for request body. Ignored unless method is POST or PUT.
+
+        Returns:
+            A dictionary with the server's parsed JSON response.
+        """
+        parsed_url = parse.urlparse(url)
+        headers = RemoteConnection.get_remote_connection_headers(parsed_url, keep_alive=True)
+        auth_header = self._client_config.get_auth_header()
+        if auth_header:
+            headers.update(auth_header)
+        if body and method not in ("POST", "PUT"):
+            body = None
+        payload = body.encode("utf-8") if body else b""
+
+        port = parsed_url.port or (443 if parsed_url.scheme == "https" else 80)
+        key = (parsed_url.scheme, parsed_url.hostname, port)
+        host = parsed_url.netloc.rpartition("@")[2]
+        request_headers = [("Host", host), *headers.items(), ("Content-Length", str(len(payload)))]
+        target = parsed_url.path + (f"?{parsed_url.query}" if parsed_url.query else "")
+
+        limit = self._limits.setdefault(key, asyncio.Semaphore(self._max_connections))
+        async with limit:
+            idle = self._idle[key]
+            while True:
+                connection = None
+                while idle and connection is None:
+                    connection = idle.pop()
+                    if connection.closed_by_remote:
+                        connection.close()
+                        connection = None
+                reused = connection is not None
+                if not reused:
+                    connection = await self._open(key)
+                try:
+                    statuscode, reason, response_headers, data = await asyncio.wait_for(
+                        connection.request(method, target, request_headers, payload), self._client_config.timeout
+                    )
+                    break
+                except (ConnectionError, h11.RemoteProtocolError):
+                    connection.close()
+                    # the server closed an idle keep-alive connection, use another one, unless
+                    # the request may have been handled: commands like click must not run twice
+                    if not reused or (connection.sent and method not in IDEMPOTENT_METHODS):
+                        raise
+                except BaseException:
+                    connection.close()
+                    raise
+            if connection.reusable:
+                idle.append(connection)
+            else:
+                connection.close()
+
+        data = data.decode("UTF-8")
+        LOGGER.debug("Remote response: status=%s | data=%s | headers=%s", statuscode, data, response_headers)
+        if 300 <= statuscode < 304:
+            return await self._request("GET", response_headers.get("location", None))
+        return parse_response(statuscode, reason, response_headers.get("content-type", None), data)
+
+    async def close(self):
+        """Close the pooled connections."""
+        for connections in self._idle.values():
+            for connection in connections:
+                connection.close()
+        self._idle.clear()
@@ -0,0 +1,289 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""An asyncio WebDriver client, driving a session of a remote end (a
+Selenium Grid or a driver server that is already running) from an event
+loop. Many sessions can share one AsyncRemoteConnection and run
+concurrently without a thread per session."""
+
+from hashlib import md5 as md5_hash
+from typing import Any
+from typing import Optional
+from typing import Union
+
+from selenium.common.exceptions import InvalidSelectorException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.options import BaseOptions
+from selenium.webdriver.common.utils import keys_to_typing
+from selenium.webdriver.remote.async_remote_connection import AsyncRemoteConnection
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.errorhandler import ErrorHandler
+from selenium.webdriver.remote.locator_converter import LocatorConverter
+from selenium.webdriver.remote.webdriver import _create_caps
+from selenium.webdriver.remote.webelement import atom_missing
+from selenium.webdriver.remote.webelement import atom_script
+
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+
+class AsyncWebElement:
+    """A DOM element of an AsyncWebDriver session, see WebElement."""
+
+    def __init__(self, parent: "AsyncWebDriver", id_: str) -> None:
+        self._parent = parent
+        self._id = id_
+
+    def __repr__(self):
+        return f'<{type(self).__module__}.{type(self).__name__} (session="{self._parent.session_id}", element="{self._id}")>'
+
+    @property
+    def parent(self) -> "AsyncWebDriver":
+        """The AsyncWebDriver instance this element was found from."""
+        return self._parent
+
+    @property
+    def id(self) -> str:
+        """Internal ID used by selenium."""
+        return self._id
+
+    def __eq__(self, element):
+        return hasattr(element, "id") and self._id == element.id
+
+    def __ne__(self, element):
+        return not self.__eq__(element)
+
+    def __hash__(self) -> int:
+        return int(md5_hash(self._id.encode("utf-8")).hexdigest(), 16)
+
+    async def _execute(self, command, params=None):
+        if not params:
+            params = {}
+        params["id"] = self._id
+        return await self._parent.execute(command, params)
+
+    async def tag_name(self) -> str:
+        """This element's ``tagName`` property."""
+        return (await self._execute(Command.GET_ELEMENT_TAG_NAME))["value"]
+
+    async def text(self) -> str:
+        """The text of the element."""
+        return (await self._execute(Command.GET_ELEMENT_TEXT))["value"]
+
+    async def click(self) -> None:
+        """Clicks the element."""
+        await self._execute(Command.CLICK_ELEMENT)
+
+    async def clear(self) -> None:
+        """Clears the text if it's a text entry element."""
+        await self._execute(Command.CLEAR_ELEMENT)
+
+    async def send_keys(self, *value: str) -> None:
+        """Simulates typing into the element. Local files are not uploaded
+        to the remote end, unlike WebElement.send_keys."""
+        await self._execute(
+            Command.SEND_KEYS_TO_ELEMENT, {"text": "".join(keys_to_typing(value)), "value": keys_to_typing(value)}
+        )
+
+    async def get_property(self, name) -> Any:
+        """Gets the given property of the element."""
+        return (await self._execute(Command.GET_ELEMENT_PROPERTY, {"name": name}))["value"]
+
+    async def get_dom_attribute(self, name) -> str:
+        """Gets the given attribute of the element, as declared in the HTML markup."""
+        return (await self._execute(Command.GET_ELEMENT_ATTRIBUTE, {"name": name}))["value"]
+
+    async def is_selected(self) -> bool:
+        """Returns whether the element is selected."""
+        return (await self._execute(Command.IS_ELEMENT_SELECTED))["value"]
+
+    async def is_enabled(self) -> bool:
+        """Returns whether the element is enabled."""
+        return (await self._execute(Command.IS_ELEMENT_ENABLED))["value"]
+
+    async def is_displayed(self) -> bool:
+        """Whether the element is visible to a user."""
+        result = await self._parent.execute_script(atom_script("isDisplayed"), self)
+        if atom_missing(result):
+            result = await self._parent.execute_script(atom_script("isDisplayed", install=True), self)
+        return result
+
+    async def find_element(self, by=By.ID, value=None) -> "AsyncWebElement":
+        """Find an element in the children of this element, see WebElement.find_element."""
+        by, value = self._parent.locator_converter.convert(by, value)
+        return (await self._execute(Command.FIND_CHILD_ELEMENT, {"using": by, "value": value}))["value"]
+
+    async def find_elements(self, by=By.ID, value=None) -> list["AsyncWebElement"]:
+        """Find elements in the children of this element, see WebElement.find_elements."""
+        by, value = self._parent.locator_converter.convert(by, value)
+        return (await self._execute(Command.FIND_CHILD_ELEMENTS, {"using": by, "value": value}))["value"]
+
+
+class AsyncWebDriver:
+    """Controls a browser session of a remote end from an asyncio event loop.
+
+    The commands are coroutines and the element methods of AsyncWebElement
+    too. Relative locators, BiDi and the local file upload of send_keys are
+    not supported.
+
+    Example:
+    --------
+    >>> connection = AsyncRemoteConnection("http://localhost:4444")
+    >>> async with await AsyncWebDriver.start(connection, ChromeOptions()) as driver:
+    ...     await driver.get("https://www.selenium.dev")
+    ...     await (await driver.find_element(By.LINK_TEXT, "Downloads")).click()
+    """
+
+    def __init__(self, command_executor: Union[str, AsyncRemoteConnection]) -> None:
+        """Creates a client without a session, use `start` or `start_session`.
+
+        Parameters:
+        -----------
+        command_executor : str or AsyncRemoteConnection
+            - The URL of the remote server, or a connection shared with other drivers.
+        """
+        if isinstance(command_executor, str):
+            command_executor = AsyncRemoteConnection(remote_server_addr=command_executor)
+        self.command_executor = command_executor
+        self.session_id: Optional[str] = None
+        self.caps: dict[str, Any] = {}
+        self.error_handler = ErrorHandler()
+        self.locator_converter = LocatorConverter()
+
+    @classmethod
+    async def start(
+        cls, command_executor: Union[str, AsyncRemoteConnection], options: BaseOptions
+    ) -> "AsyncWebDriver":
+        """Creates a client and starts a new session with the capabilities of
+        `options`."""
+        driver = cls(command_executor)
+        await driver.start_session(options.to_capabilities())
+        return driver
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.quit()
+
+    def __repr__(self):
+        return f'<{type(self).__module__}.{type(self).__name__} (session="{self.session_id}")>'
+
+    async def start_session(self, capabilities: dict) -> None:
+        """Creates a new session with the desired capabilities.
+
+        Parameters:
+        -----------
+        capabilities : dict
+            - A capabilities dict to start the session with.
+        """
+        response = (await self.execute(Command.NEW_SESSION, _create_caps(capabilities)))["value"]
+        self.session_id = response.get("sessionId")
+        self.caps = response.get("capabilities")
+
+    def _wrap_value(self, value):
+        if isinstance(value, dict):
+            return {key: self._wrap_value(val) for key, val in value.items()}
+        if isinstance(value, AsyncWebElement):
+            return {ELEMENT_KEY: value.id}
+        if isinstance(value, list):
+            return [self._wrap_value(item) for item in value]
+        return value
+
+    def _unwrap_value(self, value):
+        if isinstance(value, dict):
+            if ELEMENT_KEY in value:
+                return AsyncWebElement(self, value[ELEMENT_KEY])
+            for key, val in value.items():
+                value[key] = self._unwrap_value(val)
+            return value
+        if isinstance(value, list):
+            return [self._unwrap_value(item) for item in value]
+        return value
+
+    async def execute(self, driver_command: str, params: Optional[dict[str, Any]] = None) -> dict[str, Any]:
+        """Sends a command to the remote end, see WebDriver.execute."""
+        params = self._wrap_value(params)
+
+        if self.session_id:
+            if not params:
+                params = {"sessionId": self.session_id}
+            elif "sessionId" not in params:
+                params["sessionId"] = self.session_id
+
+        response = await self.command_executor.execute(driver_command, params)
+
+        if response:
+            self.error_handler.check_response(response)
+            response["value"] = self._unwrap_value(response.get("value", None))
+            return response
+        return {"success": 0, "value": None, "sessionId": self.session_id}
+
+    async def get(self, url: str) -> None:
+        """Navigate the browser to the specified URL."""
+        await self.execute(Command.GET, {"url": url})
+
+    async def title(self) -> str:
+        """Returns the title of the current page."""
+        return (await self.execute(Command.GET_TITLE)).get("value", "")
+
+    async def current_url(self) -> str:
+        """Gets the URL of the current page."""
+        return (await self.execute(Command.GET_CURRENT_URL))["value"]
+
+    async def page_source(self) -> str:
+        """Gets the source of the current page."""
+        return (await self.execute(Command.GET_PAGE_SOURCE))["value"]
+
+    async def implicitly_wait(self, time_to_wait: float) -> None:
+        """Sets the implicit wait of the session, in seconds."""
+        await self.execute(Command.SET_TIMEOUTS, {"implicit": int(float(time_to_wait) * 1000)})
+
+    async def execute_script(self, script: str, *args):
+        """Synchronously executes JavaScript in the current window/frame."""
+        return (await self.execute(Command.W3C_EXECUTE_SCRIPT, {"script": script, "args": list(args)}))["value"]
+
+    async def execute_async_script(self, script: str, *args):
+        """Asynchronously executes JavaScript in the current window/frame."""
+        return (await self.execute(Command.W3C_EXECUTE_SCRIPT_ASYNC, {"script": script, "args": list(args)}))[
+            "value"
+        ]
+
+    async def find_element(self, by=By.ID, value: Optional[str] = None) -> AsyncWebElement:
+        """Find an element given a By strategy and locator, see WebDriver.find_element."""
+        by, value = self.locator_converter.convert(by, value)
+        if not isinstance(by, str):
+            raise InvalidSelectorException("Relative locators are not supported by AsyncWebDriver")
+        return (await self.execute(Command.FIND_ELEMENT, {"using": by, "value": value}))["value"]
+
+    async def find_elements(self, by=By.ID, value: Optional[str] = None) -> list[AsyncWebElement]:
+        """Find elements given a By strategy and locator, see WebDriver.find_elements."""
+        by, value = self.locator_converter.convert(by, value)
+        if not isinstance(by, str):
+            raise InvalidSelectorException("Relative locators are not supported by AsyncWebDriver")
+        return (await self.execute(Command.FIND_ELEMENTS, {"using": by, "value": value}))["value"] or []
+
+    async def close(self) -> None:
+        """Closes the current window."""
+        await self.execute(Command.CLOSE)
+
+    async def quit(self) -> None:
+        """Ends the session. The connection is left open for the other
+        sessions sharing it."""
+        if self.session_id:
+            try:
+                await self.execute(Command.QUIT)
+            finally:
+                self.session_id = None
@@ -0,0 +1,181 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Process-wide HTTP connection pools shared by the RemoteConnections of
+all the drivers talking to the same remote end.
+
+By default every RemoteConnection has its own urllib3 pool manager. When
+many drivers run in threads against one grid, that multiplies the sockets
+and the TLS handshakes. Once `shared_pools.enable()` is called, the
+connections created afterwards use one pool manager per remote host and
+connection settings, and the pools count how they are used so their size
+can be tuned.
+
+Example:
+--------
+>>> from selenium.webdriver.remote.connection_pools import shared_pools
+>>> shared_pools.enable(maxsize=8, block=True)  # 8 driver threads
+>>> ...
+>>> for host, stats in shared_pools.stats().items():
+...     print(host, stats)
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import urllib3
+
+
+@dataclass
+class PoolStats:
+    """Usage of a shared pool.
+
+    `hits` are requests sent on an open pooled connection, `new_connections`
+    the requests that had to open a connection (a new one or one the server
+    dropped) and `waits` the requests that found every connection in use and
+    waited for one, `wait_seconds` in total. Many waits mean that `maxsize`
+    is smaller than the number of threads using the pool.
+    """
+
+    requests: int = 0
+    hits: int = 0
+    new_connections: int = 0
+    waits: int = 0
+    wait_seconds: float = 0.0
+
+
+class _CountingPoolMixin:
+    """urllib3 connection pool counting its connection checkouts."""
+
+    stats: PoolStats
+    stats_lock: threading.Lock
+
+    def _get_conn(self, timeout: Optional[float] = None):
+        # every connection is in use, urllib3 waits for one to be put back
+        busy = self.block and self.pool is not None and self.pool.empty()
+        start = time.monotonic()
+        conn = super()._get_conn(timeout)
+        waited = time.monotonic() - start
+
+        # urllib3 closes the pooled connections the server dropped, they
+        # connect again like the new ones
+        reused = conn.is_connected
+        with self.stats_lock:
+            self.stats.requests += 1
+            if busy:
+                self.stats.waits += 1
+                self.stats.wait_seconds += waited
+            if reused:
+                self.stats.hits += 1
+            else:
+                self.stats.new_connections += 1
+        return conn
+
+
+class CountingHTTPConnectionPool(_CountingPoolMixin, urllib3.HTTPConnectionPool):
+    pass
+
+
+class CountingHTTPSConnectionPool(_CountingPoolMixin, urllib3.HTTPSConnectionPool):
+    pass
+
+
+class ConnectionPoolRegistry:
+    """Pool managers shared by the RemoteConnections of the process, one per
+    remote host and connection settings."""
+
+    def __init__(self):
+        self.enabled = False
+        self.maxsize = 10
+        self.block = True
+        self._managers: dict[tuple, urllib3.PoolManager] = {}
+        self._stats: dict[str, PoolStats] = {}
+        self._lock = threading.Lock()
+
+    def enable(self, maxsize: int = 10, block: bool = True) -> None:
+        """Shares the pools of the RemoteConnections created from now on.
+
+        Parameters:
+        -----------
+        maxsize : int
+            - Connections kept open per remote host, the number of threads
+            sending commands to that host at the same time.
+        block : bool
+            - Wait for a free connection when all of them are in use,
+            instead of opening an extra connection that is closed after
+            the request.
+        """
+        self.maxsize = maxsize
+        self.block = block
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stops sharing pools and closes the shared connections. The
+        RemoteConnections that got a shared pool must not be used anymore."""
+        with self._lock:
+            self.enabled = False
+            for manager in self._managers.values():
+                manager.clear()
+            self._managers.clear()
+            self._stats.clear()
+
+    def is_shared(self, manager) -> bool:
+        return any(shared is manager for shared in self._managers.values())
+
+    def get(self, host: str, settings: tuple, factory: Callable[..., urllib3.PoolManager], **kwargs):
+        """Returns the shared pool manager of a remote host, created with
+        `factory(**kwargs)` on first use.
+
+        Parameters:
+        -----------
+        host : str
+            - scheme://host:port of the remote end.
+        settings : tuple
+            - The other settings of the connections (proxy, certificates),
+            connections with different settings are not shared.
+        """
+        key = (host, settings)
+        with self._lock:
+            manager = self._managers.get(key)
+            if manager is None:
+                kwargs.setdefault("maxsize", self.maxsize)
+                kwargs.setdefault("block", self.block)
+                manager = factory(**kwargs)
+                self._managers[key] = manager
+                if manager.pool_classes_by_scheme.get("http") is not urllib3.HTTPConnectionPool:
+                    # SOCKS proxies have their own pool classes, they are shared but not counted
+                    return manager
+                stats = self._stats.setdefault(host, PoolStats())
+                lock = threading.Lock()
+                # the pool classes are shared by all the pools of the manager
+                manager.pool_classes_by_scheme = {
+                    scheme: type(pool_class.__name__, (pool_class,), {"stats": stats, "stats_lock": lock})
+                    for scheme, pool_class in (
+                        ("http", CountingHTTPConnectionPool),
+                        ("https", CountingHTTPSConnectionPool),
+                    )
+                }
+            return manager
+
+    def stats(self) -> dict[str, PoolStats]:
+        """Usage of the shared pools, per remote host."""
+        with self._lock:
+            return {host: PoolStats(**vars(stats)) for host, stats in self._stats.items()}
+
+
+shared_pools = ConnectionPoolRegistry()
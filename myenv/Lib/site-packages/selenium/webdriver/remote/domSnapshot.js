@@ -0,0 +1,12 @@
+function(frames) {
+  // frames: null to leave the frames out, "elements" to return the frame
+  // elements, "windows" to return their windows (BiDi browsing contexts)
+  var owners = frames ? Array.prototype.slice.call(document.querySelectorAll('iframe, frame')) : [];
+  if (frames === 'windows') {
+    owners = owners.map(function(frame) {
+      return frame.contentWindow;
+    });
+  }
+  var root = document.documentElement;
+  return [root ? root.outerHTML : '', document.URL, document.title, owners];
+}
@@ -0,0 +1,411 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""A read-only copy of the DOM, queried locally.
+
+`snapshot` reads the serialized document (and optionally its frames) once
+and parses it with BeautifulSoup. The CSS selectors are evaluated with
+soupsieve and the xpaths with selenium.webdriver.remote.xpath, so the
+lookups and reads of a DomSnapshot send no command to the browser. Requires
+the beautifulsoup4 package.
+"""
+
+import pkgutil
+from typing import Iterator
+from typing import Optional
+
+import soupsieve
+from bs4 import BeautifulSoup
+from bs4.element import NavigableString
+from bs4.element import PreformattedString
+from bs4.element import Tag
+
+from selenium.common.exceptions import InvalidSelectorException
+from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.bidi.common import command_builder
+from selenium.webdriver.common.bidi.script import EvaluateResult
+from selenium.webdriver.remote.frames import _contexts
+from selenium.webdriver.remote.frames import _remote_value
+from selenium.webdriver.remote.xpath import XPathDocument
+
+domSnapshot_js = None
+
+# elements whose content is not rendered as text
+_HIDDEN_TEXT = frozenset(("head", "script", "style", "noscript", "template"))
+
+
+def _load_js():
+    global domSnapshot_js
+    _pkg = ".".join(__name__.split(".")[:-1])
+    domSnapshot_js = pkgutil.get_data(_pkg, "domSnapshot.js").decode("utf8")
+
+
+class SnapshotElement:
+    """An element of a DomSnapshot, with the read-only part of the
+    WebElement API."""
+
+    __slots__ = ("_snapshot", "_tag")
+
+    def __init__(self, snapshot: "DomSnapshot", tag: Tag):
+        self._snapshot = snapshot
+        self._tag = tag
+
+    def __repr__(self):
+        return f"<{type(self).__module__}.{type(self).__name__} ({self._tag.name})>"
+
+    def __eq__(self, element):
+        return isinstance(element, SnapshotElement) and self._tag is element._tag
+
+    def __ne__(self, element):
+        return not self.__eq__(element)
+
+    def __hash__(self) -> int:
+        return id(self._tag)
+
+    @property
+    def snapshot(self) -> "DomSnapshot":
+        """The snapshot (document or frame) of the element."""
+        return self._snapshot
+
+    @property
+    def tag_name(self) -> str:
+        """The tag name of the element, in lower case."""
+        return self._tag.name
+
+    @property
+    def text(self) -> str:
+        """The text of the element and its descendants, without the content
+        of script and style elements, with the white space collapsed. The
+        CSS of the page is not applied: hidden elements have a text too."""
+        return " ".join(_text(self._tag).split())
+
+    @property
+    def attributes(self) -> dict[str, str]:
+        """The attributes of the element, as declared in the HTML markup."""
+        return dict(self._tag.attrs)
+
+    def get_dom_attribute(self, name: str) -> Optional[str]:
+        """Gets the given attribute of the element, as declared in the HTML
+        markup, None when it is missing."""
+        return self._tag.attrs.get(name.lower())
+
+    @property
+    def html(self) -> str:
+        """The outer HTML of the element."""
+        return str(self._tag)
+
+    @property
+    def parent(self) -> Optional["SnapshotElement"]:
+        """The parent element, None for the root element."""
+        parent = self._tag.parent
+        if parent is None or parent is self._snapshot._soup:
+            return None
+        return SnapshotElement(self._snapshot, parent)
+
+    @property
+    def frame(self) -> Optional["DomSnapshot"]:
+        """The snapshot of the document of an iframe or frame element, when
+        the frames were included."""
+        for frame in self._snapshot.frames:
+            if frame._frame_tag is self._tag:
+                return frame
+        return None
+
+    def find_element(self, by=By.ID, value: Optional[str] = None) -> "SnapshotElement":
+        """Find an element in the descendants of this element, see
+        DomSnapshot.find_element."""
+        return self._snapshot._find(self._tag, by, value, first=True)[0]
+
+    def find_elements(self, by=By.ID, value: Optional[str] = None) -> list["SnapshotElement"]:
+        """Find elements in the descendants of this element, see
+        DomSnapshot.find_elements."""
+        return self._snapshot._find(self._tag, by, value, first=False)
+
+
+def _text(tag: Tag) -> str:
+    parts = []
+    for child in tag.children:
+        if isinstance(child, Tag):
+            if child.name not in _HIDDEN_TEXT:
+                parts.append(_text(child))
+        # comments and doctypes are preformatted strings
+        elif isinstance(child, NavigableString) and not isinstance(child, PreformattedString):
+            parts.append(child)
+    return "".join(parts)
+
+
+class DomSnapshot:
+    """The serialized DOM of a document, taken with `WebDriver.snapshot`.
+
+    The elements are found and read locally, at no round trip cost, with
+    the locator strategies of WebDriver. The snapshot does not change with
+    the page: take a new one after the page changed.
+
+    Example:
+    --------
+    >>> page = driver.snapshot()
+    >>> assert page.title == "Products"
+    >>> prices = [price.text for price in page.find_elements(By.CSS_SELECTOR, ".price")]
+    """
+
+    def __init__(
+        self,
+        html: str,
+        url: str,
+        title: str,
+        locator_converter=None,
+        parent: Optional["DomSnapshot"] = None,
+        frame_index: Optional[int] = None,
+    ):
+        self._html = html
+        self._url = url
+        self._title = title
+        self._locator_converter = locator_converter
+        self._soup = BeautifulSoup(html, "html.parser", multi_valued_attributes=None)
+        self._xpath: Optional[XPathDocument] = None
+        self._parent = parent
+        self._frames: list[DomSnapshot] = []
+        self._frame_tag: Optional[Tag] = None
+        if parent is not None and frame_index is not None:
+            owners = parent._soup.select("iframe, frame")
+            if frame_index < len(owners):
+                self._frame_tag = owners[frame_index]
+
+    def __repr__(self):
+        return f'<{type(self).__module__}.{type(self).__name__} (url="{self._url}")>'
+
+    @property
+    def url(self) -> str:
+        """The URL of the document."""
+        return self._url
+
+    @property
+    def title(self) -> str:
+        """The title of the document."""
+        return self._title
+
+    @property
+    def html(self) -> str:
+        """The serialized document element."""
+        return self._html
+
+    @property
+    def parent(self) -> Optional["DomSnapshot"]:
+        """The snapshot of the parent document of a frame."""
+        return self._parent
+
+    @property
+    def frame_element(self) -> Optional[SnapshotElement]:
+        """The iframe or frame element of this document in the parent snapshot."""
+        if self._frame_tag is None:
+            return None
+        return SnapshotElement(self._parent, self._frame_tag)
+
+    @property
+    def frames(self) -> tuple["DomSnapshot", ...]:
+        """The snapshots of the frames of the document, when they were included."""
+        return tuple(self._frames)
+
+    def iter_documents(self) -> Iterator["DomSnapshot"]:
+        """This document and the documents of its frames, nested ones
+        included, parents before their children."""
+        yield self
+        for frame in self._frames:
+            yield from frame.iter_documents()
+
+    @property
+    def root(self) -> Optional[SnapshotElement]:
+        """The document element (html)."""
+        for child in self._soup.children:
+            if isinstance(child, Tag):
+                return SnapshotElement(self, child)
+        return None
+
+    def find_element(self, by=By.ID, value: Optional[str] = None) -> SnapshotElement:
+        """Find an element given a By strategy and locator.
+
+        Parameters:
+        -----------
+        by : selenium.webdriver.common.by.By
+            The locating strategy to use, relative locators excepted.
+        value : str
+            The locator value.
+
+        Example:
+        --------
+        >>> page.find_element(By.LINK_TEXT, "Contact").get_dom_attribute("href")
+
+        Returns:
+        -------
+        SnapshotElement
+            The first matching element of the snapshot.
+        """
+        return self._find(self._soup, by, value, first=True)[0]
+
+    def find_elements(self, by=By.ID, value: Optional[str] = None) -> list[SnapshotElement]:
+        """Find elements given a By strategy and locator.
+
+        Parameters:
+        -----------
+        by : selenium.webdriver.common.by.By
+            The locating strategy to use, relative locators excepted.
+        value : str
+            The locator value.
+
+        Returns:
+        -------
+        List[SnapshotElement]
+            The matching elements of the snapshot, in document order.
+        """
+        return self._find(self._soup, by, value, first=False)
+
+    def _find(self, scope: Tag, by, value: Optional[str], first: bool) -> list[SnapshotElement]:
+        if self._locator_converter is not None:
+            by, value = self._locator_converter.convert(by, value)
+        if not isinstance(by, str):
+            raise InvalidSelectorException("Relative locators are not supported by DomSnapshot")
+        if by == By.ID:
+            by, value = By.CSS_SELECTOR, f'[id="{soupsieve.escape(value)}"]'
+        elif by == By.NAME:
+            by, value = By.CSS_SELECTOR, f'[name="{soupsieve.escape(value)}"]'
+        elif by == By.CLASS_NAME:
+            by, value = By.CSS_SELECTOR, f".{value}"
+
+        if by == By.CSS_SELECTOR:
+            try:
+                if first:
+                    tag = scope.select_one(value)
+                    tags = [] if tag is None else [tag]
+                else:
+                    tags = scope.select(value)
+            except soupsieve.SelectorSyntaxError as e:
+                raise InvalidSelectorException(f"Invalid css selector {value!r}: {e}") from e
+        elif by == By.TAG_NAME:
+            tags = scope.find_all(value.lower(), limit=1 if first else None)
+        elif by in (By.LINK_TEXT, By.PARTIAL_LINK_TEXT):
+            links = scope.find_all("a")
+            if by == By.LINK_TEXT:
+                tags = [link for link in links if " ".join(_text(link).split()) == value]
+            else:
+                tags = [link for link in links if value in " ".join(_text(link).split())]
+        elif by == By.XPATH:
+            if self._xpath is None:
+                self._xpath = XPathDocument(self._soup)
+            tags = self._xpath.select(value, scope)
+        else:
+            raise InvalidSelectorException(f"Unsupported locator strategy for DomSnapshot: {by}")
+
+        if first and not tags:
+            raise NoSuchElementException(f"Unable to locate element in the snapshot: {by}={value}")
+        if first:
+            tags = tags[:1]
+        return [SnapshotElement(self, tag) for tag in tags]
+
+
+def _classic_snapshot(driver, frames: bool, parent=None, frame_index=None) -> DomSnapshot:
+    html, url, title, owners = driver.execute_script(
+        f"return ({domSnapshot_js}).apply(null, arguments);", "elements" if frames else None
+    )
+    document = DomSnapshot(html, url, title, driver.locator_converter, parent, frame_index)
+    for index, owner in enumerate(owners):
+        try:
+            driver.switch_to.frame(owner)
+        except WebDriverException:
+            # the frame went away
+            continue
+        try:
+            document._frames.append(_classic_snapshot(driver, frames, document, index))
+        finally:
+            driver.switch_to.parent_frame()
+    return document
+
+
+def _bidi_snapshot(driver) -> DomSnapshot:
+    contexts = _contexts(driver)
+    commands = [
+        command_builder(
+            "script.callFunction",
+            {
+                "functionDeclaration": domSnapshot_js,
+                "awaitPromise": False,
+                "target": {"context": info.context},
+                "arguments": [{"type": "string", "value": "windows"}],
+                "serializationOptions": {"maxDomDepth": 0, "maxObjectDepth": 2},
+            },
+        )
+        for info, _ in contexts
+    ]
+    responses = driver._websocket_connection.execute_many(commands, return_exceptions=True)
+
+    documents: dict[str, DomSnapshot] = {}
+    # context -> (parent document, index of the frame element in it)
+    owners: dict[str, tuple[DomSnapshot, int]] = {}
+    top = None
+    for (info, depth), response in zip(contexts, responses):
+        if isinstance(response, WebDriverException):
+            continue
+        result = EvaluateResult.from_json(response)
+        if result.type != "success":
+            continue
+        html, url, title, windows = _remote_value(driver, result.result)
+        parent, frame_index = owners.get(info.context, (documents.get(info.parent), None))
+        if depth and parent is None:
+            # the parent document could not be read
+            continue
+        document = DomSnapshot(html, url, title, driver.locator_converter, parent, frame_index)
+        documents[info.context] = document
+        if parent is None:
+            top = document
+        else:
+            parent._frames.append(document)
+        for index, window in enumerate(windows):
+            if window:
+                owners[window] = (document, index)
+    if top is None:
+        raise WebDriverException("The document of the current window could not be read")
+    return top
+
+
+def snapshot(driver, frames: bool = False) -> DomSnapshot:
+    """Reads the DOM of the current frame, or of the whole current window and
+    its frames, and returns it as a DomSnapshot.
+
+    Parameters:
+    -----------
+    driver : WebDriver
+        - The driver.
+    frames : bool
+        - Include the frames, nested ones included. The snapshot is then the
+        top-level document of the current window. With the BiDi
+        `web_socket_url` capability all the documents are read in one batch
+        and the current frame is kept, otherwise the frames are read in turn
+        with switch_to and the current frame is reset to the top-level
+        document.
+
+    Returns:
+    --------
+    DomSnapshot : the snapshot, its frames in `DomSnapshot.frames`.
+    """
+    if domSnapshot_js is None:
+        _load_js()
+    if not frames:
+        return _classic_snapshot(driver, frames=False)
+    if driver.caps.get("webSocketUrl"):
+        return _bidi_snapshot(driver)
+    driver.switch_to.default_content()
+    return _classic_snapshot(driver, frames=True)
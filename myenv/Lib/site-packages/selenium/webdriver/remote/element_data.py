@@ -0,0 +1,95 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Reads data of many elements in a single script execution."""
+
+import pkgutil
+from typing import Any, Optional
+
+elementsData_js = None
+
+
+def _load_js():
+    global elementsData_js
+    _pkg = ".".join(__name__.split(".")[:-1])
+    elementsData_js = pkgutil.get_data(_pkg, "elementsData.js").decode("utf8")
+
+
+def extract_elements_data(
+    driver,
+    elements: Optional[list] = None,
+    root=None,
+    by=None,
+    value: Optional[str] = None,
+    text: bool = True,
+    attributes: Optional[list[str]] = None,
+    properties: Optional[list[str]] = None,
+    rect: bool = False,
+) -> list[dict[str, Any]]:
+    """Returns the requested data of a list of elements, or of the elements
+    matching a locator, with one round trip to the browser.
+
+    Parameters:
+    -----------
+    driver : WebDriver
+        - The driver used to execute the script.
+    elements : list of WebElement or None
+        - The elements to read. Ignored when `by` is given.
+    root : WebElement or None
+        - Element the locator is searched in. Defaults to the document.
+    by : selenium.webdriver.common.by.By or None
+        - The locating strategy to use.
+    value : str or None
+        - The locator value.
+    text : bool
+        - Read the rendered text of each element (`innerText`, empty for elements that are not rendered).
+    attributes : list of str or None
+        - Names of the DOM attributes to read.
+    properties : list of str or None
+        - Names of the JavaScript properties to read.
+    rect : bool
+        - Read the position and size of each element, relative to the document.
+
+    Returns:
+    --------
+    list of dict : one dict per element with the key `element` (the WebElement) and the
+        keys `text`, `attributes`, `properties` and `rect` that were requested.
+    """
+    if by is not None:
+        by, value = driver.locator_converter.convert(by, value)
+        if not isinstance(by, str):
+            # relative locators are resolved by find_elements first
+            elements = driver.find_elements(by, value)
+            by = value = None
+    if elements is None and by is None:
+        raise ValueError("Either elements or a locator must be given")
+
+    if elementsData_js is None:
+        _load_js()
+    fields = {
+        "text": text,
+        "attributes": list(attributes) if attributes else None,
+        "properties": list(properties) if properties else None,
+        "rect": rect,
+    }
+    return driver.execute_script(
+        f"/* elementsData */return ({elementsData_js}).apply(null, arguments);",
+        list(elements or []),
+        root,
+        by,
+        value,
+        fields,
+    )
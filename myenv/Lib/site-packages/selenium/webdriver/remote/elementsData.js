@@ -0,0 +1,59 @@
+function(elements, root, using, value, fields) {
+  var scope = root || document;
+  var doc = scope.ownerDocument || scope;
+
+  function linkText(link) {
+    return (link.innerText || link.textContent || '').replace(/^\s+|\s+$/g, '');
+  }
+
+  if (using !== null) {
+    var i;
+    elements = [];
+    if (using === 'css selector' || using === 'tag name') {
+      elements = Array.prototype.slice.call(scope.querySelectorAll(value));
+    } else if (using === 'xpath') {
+      var result = doc.evaluate(value, scope, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+      for (i = 0; i < result.snapshotLength; i++) {
+        if (result.snapshotItem(i).nodeType === 1) {
+          elements.push(result.snapshotItem(i));
+        }
+      }
+    } else if (using === 'link text' || using === 'partial link text') {
+      var links = scope.querySelectorAll('a');
+      for (i = 0; i < links.length; i++) {
+        var text = linkText(links[i]);
+        if (using === 'link text' ? text === value : text.indexOf(value) !== -1) {
+          elements.push(links[i]);
+        }
+      }
+    } else {
+      throw new Error('Unsupported locator strategy: ' + using);
+    }
+  }
+
+  return elements.map(function(element) {
+    var data = {element: element};
+    if (fields.text) {
+      var rendered = element.getClientRects().length > 0;
+      data.text = rendered ? (element.innerText || '').replace(/^\s+|\s+$/g, '') : '';
+    }
+    if (fields.attributes) {
+      data.attributes = {};
+      fields.attributes.forEach(function(name) {
+        data.attributes[name] = element.getAttribute(name);
+      });
+    }
+    if (fields.properties) {
+      data.properties = {};
+      fields.properties.forEach(function(name) {
+        data.properties[name] = element[name] === undefined ? null : element[name];
+      });
+    }
+    if (fields.rect) {
+      var box = element.getBoundingClientRect();
+      var view = doc.defaultView;
+      data.rect = {x: box.left + view.pageXOffset, y: box.top + view.pageYOffset, width: box.width, height: box.height};
+    }
+    return data;
+  });
+}
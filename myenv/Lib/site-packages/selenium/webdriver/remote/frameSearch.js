@@ -0,0 +1,59 @@
+function(query) {
+  query = JSON.parse(query);
+
+  function linkText(link) {
+    return (link.innerText || link.textContent || '').replace(/^\s+|\s+$/g, '');
+  }
+
+  // the frames of this document, with their window so that the caller can
+  // match them with their browsing context
+  var frames = Array.prototype.slice.call(document.querySelectorAll('iframe, frame'));
+  var owners = frames.map(function(frame) {
+    return [frame, frame.contentWindow];
+  });
+  var ownerData = frames.map(function(frame) {
+    return {id: frame.id, name: frame.getAttribute('name'), title: frame.getAttribute('title')};
+  });
+
+  var elements = [];
+  var i;
+  if (query.using === 'css selector' || query.using === 'tag name') {
+    elements = Array.prototype.slice.call(document.querySelectorAll(query.value));
+  } else if (query.using === 'xpath') {
+    var result = document.evaluate(query.value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (i = 0; i < result.snapshotLength; i++) {
+      if (result.snapshotItem(i).nodeType === 1) {
+        elements.push(result.snapshotItem(i));
+      }
+    }
+  } else if (query.using === 'link text' || query.using === 'partial link text') {
+    var links = document.querySelectorAll('a');
+    for (i = 0; i < links.length; i++) {
+      var text = linkText(links[i]);
+      if (query.using === 'link text' ? text === query.value : text.indexOf(query.value) !== -1) {
+        elements.push(links[i]);
+      }
+    }
+  } else if (query.using !== null) {
+    throw new Error('Unsupported locator strategy: ' + query.using);
+  }
+
+  var elementData = elements.map(function(element) {
+    var data = {};
+    if (query.text) {
+      var rendered = element.getClientRects().length > 0;
+      data.text = rendered ? (element.innerText || '').replace(/^\s+|\s+$/g, '') : '';
+    }
+    if (query.attributes) {
+      data.attributes = {};
+      query.attributes.forEach(function(name) {
+        data.attributes[name] = element.getAttribute(name);
+      });
+    }
+    return data;
+  });
+
+  // plain data is returned as one string, only nodes and windows need the
+  // BiDi serialization
+  return [owners, elements, JSON.stringify({owners: ownerData, elements: elementData})];
+}
@@ -0,0 +1,244 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Lists the frames of a page and searches all of them at once through
+WebDriver BiDi, without switching the current frame."""
+
+import json
+import pkgutil
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.bidi.common import command_builder
+from selenium.webdriver.common.bidi.script import EvaluateResult
+from selenium.webdriver.remote.webelement import WebElement
+
+frameSearch_js = None
+
+
+def _load_js():
+    global frameSearch_js
+    _pkg = ".".join(__name__.split(".")[:-1])
+    frameSearch_js = pkgutil.get_data(_pkg, "frameSearch.js").decode("utf8")
+
+
+@dataclass
+class FrameInfo:
+    """A frame of the page and its BiDi browsing context.
+
+    `element` is the iframe (or frame) element in the parent document,
+    `path` the frame elements to switch to from the top-level document.
+    """
+
+    context: str
+    url: str
+    parent: str
+    depth: int
+    element: Optional[WebElement] = None
+    id: Optional[str] = None
+    name: Optional[str] = None
+    title: Optional[str] = None
+    path: list[WebElement] = field(default_factory=list)
+
+
+@dataclass
+class FrameMatch:
+    """An element found by `find_elements_in_frames`.
+
+    `frame` is None for the elements of the top-level document. `element`
+    belongs to its frame: switch to it with `switch_to_frame` before using
+    it in WebDriver commands.
+    """
+
+    frame: Optional[FrameInfo]
+    element: WebElement
+    text: Optional[str] = None
+    attributes: dict[str, Optional[str]] = field(default_factory=dict)
+
+
+def _remote_value(driver, value: dict) -> Any:
+    kind = value["type"]
+    if kind in ("array", "set"):
+        return [_remote_value(driver, item) for item in value.get("value", [])]
+    if kind == "node":
+        return WebElement(driver, value["sharedId"])
+    if kind == "window":
+        return value["value"]["context"]
+    if kind in ("null", "undefined"):
+        return None
+    return value.get("value")
+
+
+def _contexts(driver) -> list[tuple[Any, int]]:
+    # the current top-level context and all its descendants, parents first.
+    # The top-level contexts are the window handles, the classic current
+    # window is only asked for when there is more than one to choose from.
+    tree = driver.browsing_context.get_tree()
+    if len(tree) > 1:
+        handle = driver.current_window_handle
+        tree = [info for info in tree if info.context == handle]
+    contexts = []
+    pending = [(info, 0) for info in tree]
+    while pending:
+        info, depth = pending.pop(0)
+        contexts.append((info, depth))
+        pending.extend((child, depth + 1) for child in info.children or [])
+    return contexts
+
+
+def _search(driver, by=None, value: Optional[str] = None, attributes=None, text: bool = False):
+    """Runs frameSearch.js in every browsing context of the current window,
+    all the calls being sent before waiting for the first response.
+
+    Returns the frames and, per browsing context, the found elements with
+    their data. Contexts that went away during the call (a frame navigating
+    or being removed) are left out.
+    """
+    if by is not None:
+        by, value = driver.locator_converter.convert(by, value)
+        if not isinstance(by, str):
+            raise ValueError("Relative locators cannot be searched across frames")
+    if frameSearch_js is None:
+        _load_js()
+
+    contexts = _contexts(driver)
+    query = json.dumps({"using": by, "value": value, "attributes": list(attributes) if attributes else None, "text": text})
+    commands = [
+        command_builder(
+            "script.callFunction",
+            {
+                "functionDeclaration": frameSearch_js,
+                "awaitPromise": False,
+                "target": {"context": info.context},
+                "arguments": [{"type": "string", "value": query}],
+                "serializationOptions": {"maxDomDepth": 0, "maxObjectDepth": 3},
+            },
+        )
+        for info, _ in contexts
+    ]
+    responses = driver._websocket_connection.execute_many(commands, return_exceptions=True)
+
+    results = {}
+    for (info, _), response in zip(contexts, responses):
+        if isinstance(response, WebDriverException):
+            continue
+        result = EvaluateResult.from_json(response)
+        if result.type != "success":
+            if by is not None and result.exception_details and "Unsupported locator" in str(result.exception_details):
+                raise WebDriverException(f"Unsupported locator strategy for frame search: {by}")
+            continue
+        owners, elements, data = _remote_value(driver, result.result)
+        results[info.context] = (owners, elements, json.loads(data))
+
+    frames = {}
+    for info, depth in contexts:
+        if depth == 0:
+            continue
+        frame = FrameInfo(context=info.context, url=info.url, parent=info.parent, depth=depth)
+        parent = results.get(info.parent)
+        if parent:
+            owners, _, data = parent
+            for (element, window), owner in zip(owners, data["owners"]):
+                if window == info.context:
+                    frame.element = element
+                    frame.id = owner["id"] or None
+                    frame.name = owner["name"]
+                    frame.title = owner["title"]
+                    break
+        if frame.element is not None:
+            above = frames.get(info.parent)
+            frame.path = (above.path if above else []) + [frame.element]
+        frames[info.context] = frame
+    return frames, results
+
+
+def get_frames(driver) -> list[FrameInfo]:
+    """Returns all the frames of the current window, nested ones included,
+    with two round trips whatever the number of frames.
+
+    Parameters:
+    -----------
+    driver : WebDriver
+        - The driver, started with the BiDi `web_socket_url` capability.
+
+    Returns:
+    --------
+    list of FrameInfo : the frames, parents before their children.
+    """
+    frames, _ = _search(driver)
+    return list(frames.values())
+
+
+def find_elements_in_frames(
+    driver, by, value: Optional[str] = None, attributes: Optional[list[str]] = None, text: bool = True
+) -> list[FrameMatch]:
+    """Finds the elements matching a locator in the top-level document and
+    in every frame of the current window. The search runs in all the frames
+    at once and does not change the current frame.
+
+    Parameters:
+    -----------
+    driver : WebDriver
+        - The driver, started with the BiDi `web_socket_url` capability.
+    by : selenium.webdriver.common.by.By
+        - The locating strategy to use.
+    value : str
+        - The locator value.
+    attributes : list of str or None
+        - Names of the DOM attributes to read.
+    text : bool
+        - Read the rendered text of each element.
+
+    Returns:
+    --------
+    list of FrameMatch : the matches, top-level document first, then the
+        frames, parents before their children.
+    """
+    frames, results = _search(driver, by, value, attributes, text)
+    matches = []
+    for context, (_, elements, data) in results.items():
+        frame = frames.get(context)
+        for element, element_data in zip(elements, data["elements"]):
+            matches.append(
+                FrameMatch(
+                    frame=frame,
+                    element=element,
+                    text=element_data.get("text"),
+                    attributes=element_data.get("attributes") or {},
+                )
+            )
+    return matches
+
+
+def switch_to_frame(driver, frame: Optional[FrameInfo]) -> None:
+    """Switches the WebDriver classic commands to a frame returned by
+    `get_frames` or `find_elements_in_frames`, nested frames included.
+
+    Parameters:
+    -----------
+    driver : WebDriver
+        - The driver.
+    frame : FrameInfo or None
+        - The frame, None for the top-level document.
+    """
+    driver.switch_to.default_content()
+    if frame is None:
+        return
+    if len(frame.path) != frame.depth:
+        raise WebDriverException(f"The frame elements of {frame.context} were not found")
+    for element in frame.path:
+        driver.switch_to.frame(element)
@@ -30,7 +30,9 @@ from selenium import __version__
 from selenium.webdriver.remote import utils
 from selenium.webdriver.remote.client_config import ClientConfig
 from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.connection_pools import shared_pools
 from selenium.webdriver.remote.errorhandler import ErrorCode
+from selenium.webdriver.remote.tracing import tracer
 
 LOGGER = logging.getLogger(__name__)
 
@@ -137,6 +139,63 @@ remote_commands = {
 }
 
 
+def command_request(command_info: tuple[str, str], params: dict, remote_server_addr: str) -> tuple[str, str, str]:
+    """Builds the HTTP request of a command.
+
+    The parameters used in the URL of the command are removed from `params`.
+
+    Args:
+        command_info: The HTTP method and URL template of the command.
+        params: The parameters of the command.
+        remote_server_addr: The address of the remote server.
+
+    Returns:
+        The HTTP method, the URL and the JSON body of the request.
+    """
+    path_string = command_info[1]
+    path = string.Template(path_string).substitute(params)
+    substitute_params = {word[1:] for word in path_string.split("/") if word.startswith("$")}  # remove dollar sign
+    if isinstance(params, dict) and substitute_params:
+        for word in substitute_params:
+            del params[word]
+    return command_info[0], f"{remote_server_addr}{path}", utils.dump_json(params)
+
+
+def parse_response(statuscode: int, reason: Optional[str], content_type: Optional[str], data: str) -> dict:
+    """Converts the HTTP response to a command into the response dictionary.
+
+    Args:
+        statuscode: The HTTP status code of the response.
+        reason: The HTTP reason phrase of the response.
+        content_type: The Content-Type header of the response, if any.
+        data: The decoded body of the response.
+
+    Returns:
+        A dictionary with the server's parsed JSON response.
+    """
+    if statuscode == 401:
+        return {"status": statuscode, "value": "Authorization Required"}
+    if statuscode >= 400:
+        return {"status": statuscode, "value": reason if not data else data.strip()}
+    content_types = content_type.split(";") if content_type else []
+    if not any([x.startswith("image/png") for x in content_types]):
+        try:
+            data = utils.load_json(data.strip())
+        except ValueError:
+            if 199 < statuscode < 300:
+                status = ErrorCode.SUCCESS
+            else:
+                status = ErrorCode.UNKNOWN_ERROR
+            return {"status": status, "value": data.strip()}
+
+        # Some drivers incorrectly return a response
+        # with no 'value' field when they should return null.
+        if "value" not in data:
+            data["value"] = None
+        return data
+    return {"status": 0, "value": data}
+
+
 class RemoteConnection:
     """A connection with the Remote WebDriver server.
 
@@ -292,19 +351,29 @@ class RemoteConnection:
             pool_manager_init_args["cert_reqs"] = "CERT_REQUIRED"
             pool_manager_init_args["ca_certs"] = self._client_config.ca_certs
 
+        manager_cls = urllib3.PoolManager
         if self._proxy_url:
             if self._proxy_url.lower().startswith("sock"):
                 from urllib3.contrib.socks import SOCKSProxyManager
 
-                return SOCKSProxyManager(self._proxy_url, **pool_manager_init_args)
-            if self._identify_http_proxy_auth():
-                self._proxy_url, self._basic_proxy_auth = self._separate_http_proxy_auth()
-                pool_manager_init_args["proxy_headers"] = urllib3.make_headers(
-                    proxy_basic_auth=unquote(self._basic_proxy_auth)
-                )
-            return urllib3.ProxyManager(self._proxy_url, **pool_manager_init_args)
-
-        return urllib3.PoolManager(**pool_manager_init_args)
+                manager_cls = SOCKSProxyManager
+            else:
+                manager_cls = urllib3.ProxyManager
+                if self._identify_http_proxy_auth():
+                    self._proxy_url, self._basic_proxy_auth = self._separate_http_proxy_auth()
+                    pool_manager_init_args["proxy_headers"] = urllib3.make_headers(
+                        proxy_basic_auth=unquote(self._basic_proxy_auth)
+                    )
+            pool_manager_init_args["proxy_url"] = self._proxy_url
+
+        if shared_pools.enabled:
+            parsed_url = urlparse(self._client_config.remote_server_addr)
+            port = parsed_url.port or (443 if parsed_url.scheme == "https" else 80)
+            settings = (manager_cls.__name__, repr(sorted(pool_manager_init_args.items())))
+            return shared_pools.get(
+                f"{parsed_url.scheme}://{parsed_url.hostname}:{port}", settings, manager_cls, **pool_manager_init_args
+            )
+        return manager_cls(**pool_manager_init_args)
 
     def __init__(
         self,
@@ -394,17 +463,29 @@ class RemoteConnection:
         """
         command_info = self._commands.get(command) or self.extra_commands.get(command)
         assert command_info is not None, f"Unrecognised command {command}"
-        path_string = command_info[1]
-        path = string.Template(path_string).substitute(params)
-        substitute_params = {word[1:] for word in path_string.split("/") if word.startswith("$")}  # remove dollar sign
-        if isinstance(params, dict) and substitute_params:
-            for word in substitute_params:
-                del params[word]
-        data = utils.dump_json(params)
-        url = f"{self._client_config.remote_server_addr}{path}"
-        trimmed = self._trim_large_entries(params)
-        LOGGER.debug("%s %s %s", command_info[0], url, str(trimmed))
-        return self._request(command_info[0], url, body=data)
+        if tracer.enabled:
+            return self._traced_execute(command_info, params)
+        method, url, data = command_request(command_info, params, self._client_config.remote_server_addr)
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug("%s %s %s", method, url, self._trim_large_entries(params))
+        return self._request(method, url, body=data)
+
+    def _traced_execute(self, command_info, params):
+        with tracer.span("encode"):
+            method, url, data = command_request(command_info, params, self._client_config.remote_server_addr)
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug("%s %s %s", method, url, self._trim_large_entries(params))
+        with tracer.span("http", method=method, url=url) as http:
+            response = self._send(method, url, body=data)
+        tracer.annotate(
+            "command",
+            request_bytes=len(data.encode("utf-8")) if data else 0,
+            response_bytes=len(response[3].encode("utf-8")),
+            status=response[0],
+            server_ms=http.duration * 1000,
+        )
+        with tracer.span("decode"):
+            return self._handle_response(*response)
 
     def _request(self, method, url, body=None) -> dict:
         """Send an HTTP request to the remote server.
@@ -417,6 +498,14 @@ class RemoteConnection:
         Returns:
             A dictionary with the server's parsed JSON response.
         """
+        return self._handle_response(*self._send(method, url, body))
+
+    def _send(self, method, url, body=None) -> tuple[int, str, dict, str]:
+        """Send an HTTP request to the remote server and read the response.
+
+        Returns:
+            The status code, reason, headers and decoded body of the response.
+        """
         parsed_url = parse.urlparse(url)
         headers = self.get_remote_connection_headers(parsed_url, self._client_config.keep_alive)
         auth_header = self._client_config.get_auth_header()
@@ -432,45 +521,33 @@ class RemoteConnection:
             statuscode = response.status
         else:
             conn = self._get_connection_manager()
-            with conn as http:
-                response = http.request(method, url, body=body, headers=headers, timeout=self._client_config.timeout)
+            if shared_pools.is_shared(conn):
+                response = conn.request(method, url, body=body, headers=headers, timeout=self._client_config.timeout)
+            else:
+                with conn as http:
+                    response = http.request(
+                        method, url, body=body, headers=headers, timeout=self._client_config.timeout
+                    )
             statuscode = response.status
-        data = response.data.decode("UTF-8")
-        LOGGER.debug("Remote response: status=%s | data=%s | headers=%s", response.status, data, response.headers)
+        try:
+            data = response.data.decode("UTF-8")
+        finally:
+            response.close()
+        LOGGER.debug("Remote response: status=%s | data=%s | headers=%s", statuscode, data, response.headers)
+        return statuscode, response.reason, response.headers, data
+
+    def _handle_response(self, statuscode, reason, headers, data) -> dict:
         try:
             if 300 <= statuscode < 304:
-                return self._request("GET", response.headers.get("location", None))
-            if statuscode == 401:
-                return {"status": statuscode, "value": "Authorization Required"}
-            if statuscode >= 400:
-                return {"status": statuscode, "value": response.reason if not data else data.strip()}
-            content_type = []
-            if response.headers.get("Content-Type", None):
-                content_type = response.headers.get("Content-Type", None).split(";")
-            if not any([x.startswith("image/png") for x in content_type]):
-                try:
-                    data = utils.load_json(data.strip())
-                except ValueError:
-                    if 199 < statuscode < 300:
-                        status = ErrorCode.SUCCESS
-                    else:
-                        status = ErrorCode.UNKNOWN_ERROR
-                    return {"status": status, "value": data.strip()}
-
-                # Some drivers incorrectly return a response
-                # with no 'value' field when they should return null.
-                if "value" not in data:
-                    data["value"] = None
-                return data
-            data = {"status": 0, "value": data}
-            return data
+                return self._request("GET", headers.get("location", None))
+            return parse_response(statuscode, reason, headers.get("Content-Type", None), data)
         finally:
             LOGGER.debug("Finished Request")
-            response.close()
 
     def close(self):
         """Clean up resources when finished with the remote_connection."""
-        if hasattr(self, "_conn"):
+        # shared pools are left open for the other connections
+        if hasattr(self, "_conn") and not shared_pools.is_shared(self._conn):
             self._conn.clear()
 
     def _trim_large_entries(self, input_dict, max_length=100) -> dict:
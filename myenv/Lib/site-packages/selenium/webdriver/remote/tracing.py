@@ -0,0 +1,177 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Spans recording where the time of the WebDriver commands goes.
+
+When `tracer` is started, every WebDriver.execute records a span named
+after the command, with child spans for the JSON encoding of the
+parameters, the HTTP round trip, the JSON decoding of the response and the
+unwrapping of the elements. The command span has the request and response
+sizes and splits its duration in `server_ms` (the HTTP round trip) and
+`client_ms` (everything else). When the tracer is stopped, the commands
+only check `tracer.enabled`.
+
+The spans are exported as Chrome trace events (chrome://tracing, Perfetto)
+or as folded stacks for flamegraph.pl / speedscope.
+
+Example:
+--------
+>>> from selenium.webdriver.remote.tracing import tracer
+>>> tracer.start()
+>>> driver.get("https://www.selenium.dev")
+>>> tracer.export_chrome_trace("trace.json", tracer.clear())
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Optional
+
+
+@dataclass
+class Span:
+    """A timed operation, times are `time.perf_counter` seconds."""
+
+    name: str
+    category: str
+    start: float
+    thread: int
+    # names of the enclosing spans, outermost first
+    stack: tuple[str, ...]
+    duration: float = 0.0
+    # time spent in the child spans
+    children: float = 0.0
+    args: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def self_time(self) -> float:
+        return self.duration - self.children
+
+
+class Tracer:
+    """Records spans of the threads using the drivers of the process."""
+
+    def __init__(self):
+        self.enabled = False
+        self._spans: list[Span] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def start(self) -> None:
+        """Starts recording spans."""
+        self.enabled = True
+
+    def stop(self) -> None:
+        """Stops recording spans, the recorded ones are kept."""
+        self.enabled = False
+
+    def clear(self) -> list[Span]:
+        """Returns the spans recorded so far and forgets them."""
+        with self._lock:
+            spans, self._spans = self._spans, []
+        return spans
+
+    @property
+    def spans(self) -> list[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def _stack(self) -> list[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def span(self, name: str, category: str = "selenium", **args):
+        """Records the time of the block as a span, nested in the span of the
+        enclosing block of the same thread."""
+        stack = self._stack()
+        span = Span(
+            name,
+            category,
+            time.perf_counter(),
+            threading.get_ident(),
+            tuple(parent.name for parent in stack),
+            args=args,
+        )
+        stack.append(span)
+        try:
+            yield span
+        finally:
+            span.duration = time.perf_counter() - span.start
+            stack.pop()
+            if stack:
+                stack[-1].children += span.duration
+            with self._lock:
+                self._spans.append(span)
+
+    def annotate(self, category: Optional[str] = None, **args) -> None:
+        """Adds arguments to the innermost open span of the thread, or to the
+        innermost one of `category`."""
+        for span in reversed(self._stack()):
+            if category is None or span.category == category:
+                span.args.update(args)
+                return
+
+    def chrome_trace(self, spans: Optional[list[Span]] = None) -> dict:
+        """The spans as a Chrome trace-event document."""
+        spans = self.spans if spans is None else spans
+        pid = os.getpid()
+        return {
+            "traceEvents": [
+                {
+                    "name": span.name,
+                    "cat": span.category,
+                    "ph": "X",
+                    "ts": span.start * 1e6,
+                    "dur": span.duration * 1e6,
+                    "pid": pid,
+                    "tid": span.thread,
+                    "args": span.args,
+                }
+                for span in spans
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def folded(self, spans: Optional[list[Span]] = None) -> str:
+        """The spans as folded stacks ("command;http 1234" lines), the value
+        being the self time of the stack in microseconds."""
+        spans = self.spans if spans is None else spans
+        totals: dict[str, float] = {}
+        for span in spans:
+            key = ";".join((*span.stack, span.name))
+            totals[key] = totals.get(key, 0.0) + span.self_time
+        return "".join(f"{key} {round(seconds * 1e6)}\n" for key, seconds in sorted(totals.items()))
+
+    def export_chrome_trace(self, path: str, spans: Optional[list[Span]] = None) -> None:
+        """Writes the spans as a Chrome trace-event json file."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(spans), f, default=str)
+
+    def export_folded(self, path: str, spans: Optional[list[Span]] = None) -> None:
+        """Writes the spans as a folded stacks file."""
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.folded(spans))
+
+
+tracer = Tracer()
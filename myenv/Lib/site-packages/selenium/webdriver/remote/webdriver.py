@@ -62,16 +62,20 @@ from selenium.webdriver.common.virtual_authenticator import (
 from selenium.webdriver.remote.bidi_connection import BidiConnection
 from selenium.webdriver.remote.client_config import ClientConfig
 from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.element_data import extract_elements_data
 from selenium.webdriver.remote.errorhandler import ErrorHandler
 from selenium.webdriver.remote.fedcm import FedCM
 from selenium.webdriver.remote.file_detector import FileDetector, LocalFileDetector
+from selenium.webdriver.remote.frames import FrameInfo, FrameMatch, find_elements_in_frames, get_frames
 from selenium.webdriver.remote.locator_converter import LocatorConverter
 from selenium.webdriver.remote.mobile import Mobile
 from selenium.webdriver.remote.remote_connection import RemoteConnection
 from selenium.webdriver.remote.script_key import ScriptKey
 from selenium.webdriver.remote.shadowroot import ShadowRoot
 from selenium.webdriver.remote.switch_to import SwitchTo
+from selenium.webdriver.remote.tracing import tracer
 from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.remote.window_tracker import WindowTracker
 from selenium.webdriver.remote.websocket_connection import WebSocketConnection
 from selenium.webdriver.support.relative_locator import RelativeBy
 
@@ -269,6 +273,7 @@ class WebDriver(BaseWebDriver):
         self._browser = None
         self._bidi_session = None
         self._browsing_context = None
+        self._window_tracker = None
         self._storage = None
         self._webextension = None
         self._permissions = None
@@ -444,6 +449,9 @@ class WebDriver(BaseWebDriver):
         --------
           dict - The command's JSON response loaded into a dictionary object.
         """
+        if tracer.enabled:
+            return self._traced_execute(driver_command, params)
+
         params = self._wrap_value(params)
 
         if self.session_id:
@@ -462,6 +470,29 @@ class WebDriver(BaseWebDriver):
         # a success
         return {"success": 0, "value": None, "sessionId": self.session_id}
 
+    def _traced_execute(self, driver_command: str, params: Optional[dict[str, Any]] = None) -> dict[str, Any]:
+        # execute, recording a span per step, see selenium.webdriver.remote.tracing
+        with tracer.span(driver_command, "command") as span:
+            with tracer.span("wrap_value"):
+                params = self._wrap_value(params)
+
+            if self.session_id:
+                if not params:
+                    params = {"sessionId": self.session_id}
+                elif "sessionId" not in params:
+                    params["sessionId"] = self.session_id
+
+            response = cast(RemoteConnection, self.command_executor).execute(driver_command, params)
+
+            if response:
+                self.error_handler.check_response(response)
+                with tracer.span("unwrap_value"):
+                    response["value"] = self._unwrap_value(response.get("value", None))
+            else:
+                response = {"success": 0, "value": None, "sessionId": self.session_id}
+        span.args["client_ms"] = span.duration * 1000 - span.args.get("server_ms", 0.0)
+        return response
+
     def get(self, url: str) -> None:
         """Navigate the browser to the specified URL in the current window or
         tab.
@@ -966,6 +997,161 @@ class WebDriver(BaseWebDriver):
         # See https://github.com/SeleniumHQ/selenium/issues/4555
         return self.execute(Command.FIND_ELEMENTS, {"using": by, "value": value})["value"] or []
 
+    def get_elements_data(
+        self,
+        elements: list[WebElement],
+        text: bool = True,
+        attributes: Optional[list[str]] = None,
+        properties: Optional[list[str]] = None,
+        rect: bool = False,
+    ) -> list[dict]:
+        """Reads text, attributes, properties and rects of a list of elements
+        in a single round trip.
+
+        Parameters:
+        -----------
+        elements : list of WebElement
+            - The elements to read.
+        text : bool
+            - Read the rendered text of each element. Defaults to True.
+        attributes : list of str or None
+            - Names of the DOM attributes to read.
+        properties : list of str or None
+            - Names of the JavaScript properties to read.
+        rect : bool
+            - Read the position and size of each element. Defaults to False.
+
+        Example:
+        --------
+        >>> links = driver.find_elements(By.TAG_NAME, "a")
+        >>> data = driver.get_elements_data(links, attributes=["href"])
+
+        Returns:
+        -------
+        List[dict]
+            one dict per element with the key `element` and the requested
+            `text`, `attributes`, `properties` and `rect` keys.
+        """
+        return extract_elements_data(
+            self, elements=elements, text=text, attributes=attributes, properties=properties, rect=rect
+        )
+
+    def find_elements_data(
+        self,
+        by=By.ID,
+        value: Optional[str] = None,
+        text: bool = True,
+        attributes: Optional[list[str]] = None,
+        properties: Optional[list[str]] = None,
+        rect: bool = False,
+    ) -> list[dict]:
+        """Finds elements given a By strategy and locator and reads their
+        data in the same round trip.
+
+        Parameters:
+        -----------
+        by : selenium.webdriver.common.by.By
+            The locating strategy to use. Default is `By.ID`.
+        value : str
+            The locator value.
+        text, attributes, properties, rect
+            The data to read, see `get_elements_data`.
+
+        Example:
+        --------
+        >>> names = [item["text"] for item in driver.find_elements_data(By.CSS_SELECTOR, ".product .name")]
+
+        Returns:
+        -------
+        List[dict]
+            one dict per matching element, see `get_elements_data`.
+        """
+        return extract_elements_data(
+            self, by=by, value=value, text=text, attributes=attributes, properties=properties, rect=rect
+        )
+
+    def get_frames(self) -> list[FrameInfo]:
+        """Lists the frames of the current window, nested frames included,
+        with their BiDi browsing context ids. The current frame is not
+        changed. Requires the `web_socket_url` capability.
+
+        Example:
+        --------
+        >>> ads = [frame for frame in driver.get_frames() if frame.title == "3rd party ad content"]
+
+        Returns:
+        -------
+        List[FrameInfo]
+            the frames, parents before their children.
+        """
+        return get_frames(self)
+
+    def find_elements_in_frames(
+        self,
+        by=By.ID,
+        value: Optional[str] = None,
+        attributes: Optional[list[str]] = None,
+        text: bool = True,
+    ) -> list[FrameMatch]:
+        """Finds elements in the top-level document and in every frame of the
+        current window in one batch of BiDi calls, instead of switching to
+        each frame in turn. The current frame is not changed. Requires the
+        `web_socket_url` capability.
+
+        Parameters:
+        -----------
+        by : selenium.webdriver.common.by.By
+            The locating strategy to use. Default is `By.ID`.
+        value : str
+            The locator value.
+        attributes : list of str or None
+            Names of the DOM attributes to read.
+        text : bool
+            Read the rendered text of each element. Defaults to True.
+
+        Example:
+        --------
+        >>> for match in driver.find_elements_in_frames(By.TAG_NAME, "a", attributes=["href"]):
+        ...     print(match.frame and match.frame.title, match.attributes["href"])
+
+        Returns:
+        -------
+        List[FrameMatch]
+            one match per element, with its frame (None for the top-level
+            document) and the requested data. Use `frames.switch_to_frame`
+            before sending commands to the element.
+        """
+        return find_elements_in_frames(self, by, value, attributes=attributes, text=text)
+
+    def snapshot(self, frames: bool = False):
+        """Reads the DOM of the current frame once and returns a read-only
+        copy of it, whose elements are found and read locally with the CSS,
+        XPath and link text locators, without a round trip per lookup.
+        Requires the beautifulsoup4 package.
+
+        Parameters:
+        -----------
+        frames : bool
+            Include the frames of the current window, nested ones included.
+            The snapshot is then the top-level document. Without the
+            `web_socket_url` capability, the current frame is reset to the
+            top-level document.
+
+        Example:
+        --------
+        >>> page = driver.snapshot()
+        >>> assert page.title == "Products"
+        >>> prices = [price.text for price in page.find_elements(By.CSS_SELECTOR, ".price")]
+
+        Returns:
+        -------
+        DomSnapshot
+            the snapshot, with the snapshots of the frames in `frames`.
+        """
+        from selenium.webdriver.remote.dom_snapshot import snapshot
+
+        return snapshot(self, frames=frames)
+
     @property
     def capabilities(self) -> dict:
         """Returns the drivers current capabilities being used.
@@ -1339,6 +1525,27 @@ class WebDriver(BaseWebDriver):
 
         return self._browsing_context
 
+    @property
+    def window_tracker(self) -> WindowTracker:
+        """Returns the live list of open windows and tabs, kept up to date by
+        BiDi events. Tracking starts on first access.
+
+        Returns:
+        --------
+        WindowTracker: the tracked window handles.
+
+        Examples:
+        ---------
+        >>> with driver.window_tracker.expect_new_window() as new:
+        ...     driver.find_element(By.LINK_TEXT, "Open in a new tab").click()
+        >>> driver.switch_to.window(new.handle)
+        >>> print(driver.window_tracker.handles)
+        """
+        if self._window_tracker is None:
+            self._window_tracker = WindowTracker(self).start()
+
+        return self._window_tracker
+
     @property
     def storage(self):
         """Returns a storage module object for BiDi storage commands.
@@ -29,6 +29,7 @@ from selenium.common.exceptions import JavascriptException, WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.utils import keys_to_typing
 from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.element_data import extract_elements_data
 from selenium.webdriver.remote.shadowroot import ShadowRoot
 
 # TODO: When moving to supporting python 3.9 as the minimum version we can
@@ -36,6 +37,11 @@ from selenium.webdriver.remote.shadowroot import ShadowRoot
 getAttribute_js = None
 isDisplayed_js = None
 
+# The atoms are installed once per page under this key and then called
+# through a small stub, instead of sending the full atom source every time.
+_ATOMS_KEY = "Symbol.for('selenium.atoms')"
+_ATOM_MISSING = "selenium-atom-missing"
+
 
 def _load_js():
     global getAttribute_js
@@ -45,6 +51,52 @@ def _load_js():
     isDisplayed_js = pkgutil.get_data(_pkg, "isDisplayed.js").decode("utf8")
 
 
+def _atom_stub(name: str) -> str:
+    """Script calling an atom that was installed in the page, or reporting
+    that it is missing (new page or frame)."""
+    return (
+        f"/* {name} */var atoms = window[{_ATOMS_KEY}];"
+        f"if (!atoms || !atoms.{name}) return {{'{_ATOM_MISSING}': true}};"
+        f"return atoms.{name}.apply(null, arguments);"
+    )
+
+
+def _atom_installer(name: str, source: str) -> str:
+    """Script installing an atom in the page and calling it."""
+    return (
+        f"/* {name} */var key = {_ATOMS_KEY};"
+        "if (!window[key]) Object.defineProperty(window, key, {value: {}, configurable: true});"
+        f"window[key].{name} = ({source});"
+        f"return window[key].{name}.apply(null, arguments);"
+    )
+
+
+def atom_script(name: str, install: bool = False) -> str:
+    """Script calling one of the bundled atoms (`getAttribute`, `isDisplayed`)
+    with the script arguments.
+
+    The script calls the copy of the atom installed in the page and returns
+    a marker recognised by `atom_missing` when the page does not have it
+    yet. With `install`, the script installs the atom first.
+
+    Example:
+    --------
+    >>> result = driver.execute_script(atom_script("isDisplayed"), element)
+    >>> if atom_missing(result):
+    ...     result = driver.execute_script(atom_script("isDisplayed", install=True), element)
+    """
+    if not install:
+        return _atom_stub(name)
+    if getAttribute_js is None:
+        _load_js()
+    return _atom_installer(name, getAttribute_js if name == "getAttribute" else isDisplayed_js)
+
+
+def atom_missing(result) -> bool:
+    """Whether the result of an `atom_script` says that the atom must be installed."""
+    return isinstance(result, dict) and bool(result.get(_ATOM_MISSING))
+
+
 class BaseWebElement(metaclass=ABCMeta):
     """Abstract Base Class for WebElement.
 
@@ -226,12 +278,7 @@ class WebElement(BaseWebElement):
         >>> # Check if the "active" CSS class is applied to an element.
         >>> is_active = "active" in target_element.get_attribute("class")
         """
-        if getAttribute_js is None:
-            _load_js()
-        attribute_value = self.parent.execute_script(
-            f"/* getAttribute */return ({getAttribute_js}).apply(null, arguments);", self, name
-        )
-        return attribute_value
+        return self._execute_atom("getAttribute", self, name)
 
     def is_selected(self) -> bool:
         """Returns whether the element is selected.
@@ -334,10 +381,7 @@ class WebElement(BaseWebElement):
         --------
         >>> is_displayed = element.is_displayed()
         """
-        # Only go into this conditional for browsers that don't use the atom themselves
-        if isDisplayed_js is None:
-            _load_js()
-        return self.parent.execute_script(f"/* isDisplayed */return ({isDisplayed_js}).apply(null, arguments);", self)
+        return self._execute_atom("isDisplayed", self)
 
     @property
     def location_once_scrolled_into_view(self) -> dict:
@@ -571,6 +615,18 @@ class WebElement(BaseWebElement):
         params["id"] = self._id
         return self._parent.execute(command, params)
 
+    def _execute_atom(self, name, *args):
+        """Executes one of the bundled atoms (`getAttribute`, `isDisplayed`).
+
+        The atom is called through the copy installed in the page. Only when
+        the page does not have it yet (first call, after a navigation or in a
+        new frame) the full atom source is sent and installed.
+        """
+        result = self.parent.execute_script(atom_script(name), *args)
+        if atom_missing(result):
+            result = self.parent.execute_script(atom_script(name, install=True), *args)
+        return result
+
     def find_element(self, by=By.ID, value=None) -> WebElement:
         """Find an element given a By strategy and locator.
 
@@ -629,6 +685,50 @@ class WebElement(BaseWebElement):
         by, value = self._parent.locator_converter.convert(by, value)
         return self._execute(Command.FIND_CHILD_ELEMENTS, {"using": by, "value": value})["value"]
 
+    def find_elements_data(
+        self, by=By.ID, value=None, text=True, attributes=None, properties=None, rect=False
+    ) -> list[dict]:
+        """Finds elements inside this element given a By strategy and locator
+        and reads their data in the same round trip.
+
+        Parameters:
+        -----------
+        by : selenium.webdriver.common.by.By
+            The locating strategy to use. Default is `By.ID`.
+        value : str
+            The locator value.
+        text, attributes, properties, rect
+            The data to read, see `WebDriver.get_elements_data`.
+
+        Example:
+        --------
+        >>> rows = table.find_elements_data(By.TAG_NAME, "tr", attributes=["id"])
+
+        Returns:
+        -------
+        List[dict]
+            one dict per matching element, see `WebDriver.get_elements_data`.
+        """
+        if not isinstance(by, str):
+            return extract_elements_data(
+                self._parent,
+                elements=self.find_elements(by, value),
+                text=text,
+                attributes=attributes,
+                properties=properties,
+                rect=rect,
+            )
+        return extract_elements_data(
+            self._parent,
+            root=self,
+            by=by,
+            value=value,
+            text=text,
+            attributes=attributes,
+            properties=properties,
+            rect=rect,
+        )
+
     def __hash__(self) -> int:
         return int(md5_hash(self._id.encode("utf-8")).hexdigest(), 16)
 
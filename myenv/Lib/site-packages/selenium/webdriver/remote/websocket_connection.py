@@ -57,6 +57,37 @@ class WebSocketConnection:
         self._ws = None
 
     def execute(self, command):
+        return self._receive(command, self._send(command))
+
+    def execute_many(self, commands, return_exceptions=False):
+        """Sends all the commands before waiting for any response, so that
+        independent commands cost a single round trip.
+
+        Parameters:
+        -----------
+        commands : list
+            The commands to execute.
+        return_exceptions : bool
+            Return the WebDriverException of a failed command in its place
+            instead of raising it.
+
+        Returns:
+        --------
+        list : the results, in the order of the commands.
+        """
+        commands = list(commands)
+        ids = [self._send(command) for command in commands]
+        results = []
+        for command, command_id in zip(commands, ids):
+            try:
+                results.append(self._receive(command, command_id))
+            except WebDriverException as e:
+                if not return_exceptions:
+                    raise
+                results.append(e)
+        return results
+
+    def _send(self, command):
         self._id += 1
         payload = self._serialize_command(command)
         payload["id"] = self._id
@@ -64,12 +95,13 @@ class WebSocketConnection:
             payload["sessionId"] = self.session_id
 
         data = json.dumps(payload)
-        logger.debug(f"-> {data}"[: self._max_log_message_size])
+        logger.debug("-> %.*s", self._max_log_message_size, data)
         self._ws.send(data)
+        return self._id
 
-        current_id = self._id
-        self._wait_until(lambda: current_id in self._messages)
-        response = self._messages.pop(current_id)
+    def _receive(self, command, command_id):
+        self._wait_until(lambda: command_id in self._messages)
+        response = self._messages.pop(command_id)
 
         if "error" in response:
             error = response["error"]
@@ -121,7 +153,7 @@ class WebSocketConnection:
             self._process_message(message)
 
         def on_error(ws, error):
-            logger.debug(f"error: {error}")
+            logger.debug("error: %s", error)
             ws.close()
 
         def run_socket():
@@ -136,7 +168,7 @@ class WebSocketConnection:
 
     def _process_message(self, message):
         message = json.loads(message)
-        logger.debug(f"<- {message}"[: self._max_log_message_size])
+        logger.debug("<- %.*s", self._max_log_message_size, message)
 
         if "id" in message:
             self._messages[message["id"]] = message
@@ -0,0 +1,158 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Keeps the list of open windows and tabs up to date from the BiDi
+browsingContext events, instead of polling `window_handles`."""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterable, Optional
+
+from selenium.common.exceptions import TimeoutException
+
+
+class NewWindow:
+    """The window opened in an `expect_new_window` block, `handle` is set
+    when the block exits."""
+
+    def __init__(self):
+        self.handle: Optional[str] = None
+
+
+class WindowTracker:
+    """Live list of the window handles of a driver.
+
+    The handles are updated by the browsingContext.contextCreated and
+    contextDestroyed events as soon as a window or tab is opened or closed,
+    so reading them does not send any command to the browser. Requires the
+    `web_socket_url` capability.
+
+    Example:
+    --------
+    >>> with driver.window_tracker.expect_new_window() as new:
+    ...     driver.find_element(By.ID, "open").click()
+    >>> driver.switch_to.window(new.handle)
+    """
+
+    def __init__(self, driver):
+        self._driver = driver
+        self._handles: list[str] = []
+        # contexts closed while tracking, the events are delivered on
+        # separate threads and a destroyed event can overtake its created one
+        self._closed: set[str] = set()
+        self._condition = threading.Condition()
+        self._callbacks: list[tuple[str, int]] = []
+
+    @property
+    def started(self) -> bool:
+        return bool(self._callbacks)
+
+    def start(self) -> "WindowTracker":
+        """Subscribes to the events and reads the windows already open."""
+        if self.started:
+            return self
+        browsing_context = self._driver.browsing_context
+        self._callbacks = [
+            ("context_created", browsing_context.add_event_handler("context_created", self._created)),
+            ("context_destroyed", browsing_context.add_event_handler("context_destroyed", self._destroyed)),
+        ]
+        # after subscribing, so that no window opened in between is missed
+        open_handles = self._driver.window_handles
+        with self._condition:
+            for handle in open_handles:
+                if handle not in self._handles and handle not in self._closed:
+                    self._handles.append(handle)
+            self._condition.notify_all()
+        return self
+
+    def stop(self) -> None:
+        """Unsubscribes from the events, the handles are no longer updated."""
+        browsing_context = self._driver.browsing_context
+        for event, callback_id in self._callbacks:
+            browsing_context.remove_event_handler(event, callback_id)
+        self._callbacks = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def _created(self, info) -> None:
+        # frames are browsing contexts too, only top-level ones are windows
+        if info.parent is not None:
+            return
+        with self._condition:
+            if info.context not in self._handles and info.context not in self._closed:
+                self._handles.append(info.context)
+                self._condition.notify_all()
+
+    def _destroyed(self, info) -> None:
+        if info.parent is not None:
+            return
+        with self._condition:
+            self._closed.add(info.context)
+            if info.context in self._handles:
+                self._handles.remove(info.context)
+            self._condition.notify_all()
+
+    @property
+    def handles(self) -> list[str]:
+        """The handles of the open windows, in the order they were opened."""
+        with self._condition:
+            return list(self._handles)
+
+    def wait_for_new_window(self, known: Iterable[str], timeout: float = 10) -> str:
+        """Returns the handle of the first open window that is not in
+        `known`, as soon as it is opened.
+
+        Parameters:
+        -----------
+        known : iterable of str
+            The handles of the windows open before the action that opens the new one.
+        timeout : float
+            Seconds to wait for the window.
+
+        Returns:
+        --------
+        str : the handle of the new window.
+        """
+        known = set(known)
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                for handle in self._handles:
+                    if handle not in known:
+                        return handle
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutException(f"No new window was opened in {timeout} seconds")
+                self._condition.wait(remaining)
+
+    @contextmanager
+    def expect_new_window(self, timeout: float = 10):
+        """Waits, at the end of the block, for a window opened in the block.
+
+        Parameters:
+        -----------
+        timeout : float
+            Seconds to wait for the window after the block.
+        """
+        new_window = NewWindow()
+        known = self.handles
+        yield new_window
+        new_window.handle = self.wait_for_new_window(known, timeout)
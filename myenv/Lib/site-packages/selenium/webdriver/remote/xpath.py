@@ -0,0 +1,652 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""XPath 1.0 evaluation on a BeautifulSoup tree, used by DomSnapshot to run
+the xpath locators of the tests without the browser.
+
+All the axes except namespace are supported, and the core functions except
+id(), lang() and sum(). Element and attribute names are matched in lower
+case, as the browsers do in HTML documents.
+"""
+
+import math
+import operator
+import re
+from functools import lru_cache
+from itertools import chain
+from typing import Any
+from typing import Callable
+from typing import Optional
+
+from bs4 import BeautifulSoup
+from bs4.element import Comment
+from bs4.element import NavigableString
+from bs4.element import PreformattedString
+from bs4.element import Tag
+
+from selenium.common.exceptions import InvalidSelectorException
+
+_TOKENS = re.compile(
+    r"""\s*(?:
+    (?P<number>\d+(?:\.\d*)?|\.\d+)
+    |(?P<literal>"[^"]*"|'[^']*')
+    |(?P<op>//|::|\.\.|!=|<=|>=|[/\[\]().,@|=<>+*-])
+    |(?P<name>[A-Za-z_][\w.-]*)
+    )""",
+    re.VERBOSE,
+)
+
+_NODE_TYPES = ("node", "text", "comment", "processing-instruction")
+
+_AXES = (
+    "ancestor",
+    "ancestor-or-self",
+    "attribute",
+    "child",
+    "descendant",
+    "descendant-or-self",
+    "following",
+    "following-sibling",
+    "parent",
+    "preceding",
+    "preceding-sibling",
+    "self",
+)
+
+_REVERSE_AXES = ("ancestor", "ancestor-or-self", "preceding", "preceding-sibling")
+
+_RELATIONS = {"<": operator.lt, ">": operator.gt, "<=": operator.le, ">=": operator.ge}
+
+_SWAPPED = {"=": "=", "!=": "!=", "<": ">", ">": "<", "<=": ">=", ">=": "<="}
+
+
+class Attribute:
+    """An attribute node, the attributes are not nodes in BeautifulSoup."""
+
+    __slots__ = ("parent", "name", "value", "position")
+
+    def __init__(self, parent: Tag, name: str, value: str, position: int):
+        self.parent = parent
+        self.name = name
+        self.value = value
+        self.position = position
+
+
+def _is_text(node) -> bool:
+    return isinstance(node, NavigableString) and not isinstance(node, PreformattedString)
+
+
+def string_value(node) -> str:
+    """The XPath string-value of a node."""
+    if isinstance(node, Attribute):
+        return node.value
+    if isinstance(node, Tag):
+        return "".join(text for text in node.descendants if _is_text(text))
+    return str(node)
+
+
+def _format_number(number: float) -> str:
+    if math.isnan(number):
+        return "NaN"
+    if math.isinf(number):
+        return "Infinity" if number > 0 else "-Infinity"
+    if number == int(number):
+        return str(int(number))
+    return repr(number)
+
+
+def _string(value) -> str:
+    if isinstance(value, list):
+        return string_value(value[0]) if value else ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float):
+        return _format_number(value)
+    return value
+
+
+def _number(value) -> float:
+    if isinstance(value, (bool, float)):
+        return float(value)
+    try:
+        return float(_string(value).strip())
+    except ValueError:
+        return math.nan
+
+
+def _boolean(value) -> bool:
+    if isinstance(value, float):
+        return value != 0 and not math.isnan(value)
+    return bool(value)
+
+
+def _compare(op: str, left, right) -> bool:
+    if isinstance(left, list):
+        if isinstance(right, list):
+            right_values = [string_value(node) for node in right]
+            return any(_compare(op, string_value(node), value) for node in left for value in right_values)
+        if isinstance(right, bool):
+            return _compare(op, bool(left), right)
+        if isinstance(right, float):
+            return any(_compare(op, _number(string_value(node)), right) for node in left)
+        return any(_compare(op, string_value(node), right) for node in left)
+    if isinstance(right, list):
+        return _compare(_SWAPPED[op], right, left)
+    if op in ("=", "!="):
+        if isinstance(left, bool) or isinstance(right, bool):
+            left, right = _boolean(left), _boolean(right)
+        elif isinstance(left, float) or isinstance(right, float):
+            left, right = _number(left), _number(right)
+        return (left == right) == (op == "=")
+    return _RELATIONS[op](_number(left), _number(right))
+
+
+class _Context:
+    __slots__ = ("node", "position", "size", "document")
+
+    def __init__(self, node, position: int, size: int, document: "XPathDocument"):
+        self.node = node
+        self.position = position
+        self.size = size
+        self.document = document
+
+
+def _node_argument(context: _Context, args: list) -> Optional[Any]:
+    if not args:
+        return context.node
+    nodes = args[0]
+    if not isinstance(nodes, list):
+        raise InvalidSelectorException("XPath function argument is not a node-set")
+    return nodes[0] if nodes else None
+
+
+def _name(context, *args) -> str:
+    node = _node_argument(context, list(args))
+    if isinstance(node, (Tag, Attribute)) and node is not context.document.root:
+        return node.name
+    return ""
+
+
+def _integral(function: Callable[[float], int], number: float) -> float:
+    if math.isnan(number) or math.isinf(number):
+        return number
+    return float(function(number))
+
+
+def _round(number: float) -> float:
+    return _integral(math.floor, number + 0.5)
+
+
+def _substring(context, value, start, length=None) -> str:
+    value, start = _string(value), _round(_number(start))
+    end = math.inf if length is None else start + _round(_number(length))
+    if math.isnan(start) or math.isnan(end):
+        return ""
+    return "".join(char for position, char in enumerate(value, 1) if start <= position < end)
+
+
+def _substring_before(context, value, part) -> str:
+    value, part = _string(value), _string(part)
+    return value[: value.find(part)] if part in value else ""
+
+
+def _substring_after(context, value, part) -> str:
+    value, part = _string(value), _string(part)
+    return value[value.find(part) + len(part) :] if part in value else ""
+
+
+def _translate(context, value, source, target) -> str:
+    source, target = _string(source), _string(target)
+    table = {}
+    for position, char in enumerate(source):
+        table.setdefault(ord(char), target[position] if position < len(target) else None)
+    return _string(value).translate(table)
+
+
+# name -> (function(context, *args), minimum args, maximum args)
+_FUNCTIONS: dict[str, tuple[Callable, int, Optional[int]]] = {
+    "last": (lambda context: float(context.size), 0, 0),
+    "position": (lambda context: float(context.position), 0, 0),
+    "count": (lambda context, nodes: float(len(nodes)), 1, 1),
+    "name": (_name, 0, 1),
+    "local-name": (_name, 0, 1),
+    "string": (lambda context, value=None: _string([context.node] if value is None else value), 0, 1),
+    "concat": (lambda context, *values: "".join(_string(value) for value in values), 2, None),
+    "starts-with": (lambda context, value, part: _string(value).startswith(_string(part)), 2, 2),
+    "contains": (lambda context, value, part: _string(part) in _string(value), 2, 2),
+    "substring-before": (_substring_before, 2, 2),
+    "substring-after": (_substring_after, 2, 2),
+    "substring": (_substring, 2, 3),
+    "string-length": (lambda context, value=None: float(len(_string([context.node] if value is None else value))), 0, 1),
+    "normalize-space": (
+        lambda context, value=None: " ".join(_string([context.node] if value is None else value).split()),
+        0,
+        1,
+    ),
+    "translate": (_translate, 3, 3),
+    "boolean": (lambda context, value: _boolean(value), 1, 1),
+    "not": (lambda context, value: not _boolean(value), 1, 1),
+    "true": (lambda context: True, 0, 0),
+    "false": (lambda context: False, 0, 0),
+    "number": (lambda context, value=None: _number([context.node] if value is None else value), 0, 1),
+    "floor": (lambda context, value: _integral(math.floor, _number(value)), 1, 1),
+    "ceiling": (lambda context, value: _integral(math.ceil, _number(value)), 1, 1),
+    "round": (lambda context, value: _round(_number(value)), 1, 1),
+}
+
+
+class _Parser:
+    """Compiles an expression into a function of the evaluation context."""
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.tokens: list[tuple[str, str]] = []
+        position = 0
+        expression = expression.rstrip()
+        while position < len(expression):
+            match = _TOKENS.match(expression, position)
+            if match is None or match.end() == position:
+                raise self.error(f"unexpected character at {position}")
+            self.tokens.append((match.lastgroup, match.group(match.lastgroup)))
+            position = match.end()
+        self.index = 0
+
+    def error(self, message: str) -> InvalidSelectorException:
+        return InvalidSelectorException(f"Invalid xpath {self.expression!r}: {message}")
+
+    def peek(self, offset: int = 0) -> tuple[Optional[str], Optional[str]]:
+        if self.index + offset < len(self.tokens):
+            return self.tokens[self.index + offset]
+        return None, None
+
+    def next(self) -> tuple[str, str]:
+        token = self.peek()
+        if token[0] is None:
+            raise self.error("unexpected end")
+        self.index += 1
+        return token
+
+    def accept(self, kind: str, value: Optional[str] = None) -> bool:
+        token_kind, token_value = self.peek()
+        if token_kind == kind and (value is None or token_value == value):
+            self.index += 1
+            return True
+        return False
+
+    def expect(self, value: str) -> None:
+        if not self.accept("op", value):
+            raise self.error(f"expected {value!r}")
+
+    def parse(self) -> Callable[[_Context], Any]:
+        expression = self.or_expr()
+        if self.peek()[0] is not None:
+            raise self.error(f"unexpected {self.peek()[1]!r}")
+        return expression
+
+    def _binary(self, operand, operators, kind, combine):
+        left = operand()
+        while self.peek()[0] == kind and self.peek()[1] in operators:
+            op = self.next()[1]
+            left = combine(op, left, operand())
+        return left
+
+    def or_expr(self):
+        return self._binary(
+            self.and_expr, ("or",), "name", lambda op, a, b: lambda c: _boolean(a(c)) or _boolean(b(c))
+        )
+
+    def and_expr(self):
+        return self._binary(
+            self.equality_expr, ("and",), "name", lambda op, a, b: lambda c: _boolean(a(c)) and _boolean(b(c))
+        )
+
+    def equality_expr(self):
+        return self._binary(
+            self.relational_expr, ("=", "!="), "op", lambda op, a, b: lambda c: _compare(op, a(c), b(c))
+        )
+
+    def relational_expr(self):
+        return self._binary(
+            self.additive_expr, tuple(_RELATIONS), "op", lambda op, a, b: lambda c: _compare(op, a(c), b(c))
+        )
+
+    def additive_expr(self):
+        def combine(op, a, b):
+            if op == "+":
+                return lambda c: _number(a(c)) + _number(b(c))
+            return lambda c: _number(a(c)) - _number(b(c))
+
+        return self._binary(self.multiplicative_expr, ("+", "-"), "op", combine)
+
+    def multiplicative_expr(self):
+        left = self.unary_expr()
+        # after an operand, "*" is the multiply operator and not a name test
+        while self.peek() in (("op", "*"), ("name", "div"), ("name", "mod")):
+            op = self.next()[1]
+            left = self._multiply(op, left, self.unary_expr())
+        return left
+
+    @staticmethod
+    def _multiply(op, a, b):
+        if op == "*":
+            return lambda c: _number(a(c)) * _number(b(c))
+        if op == "div":
+            return lambda c: _divide(_number(a(c)), _number(b(c)))
+        return lambda c: math.fmod(_number(a(c)), _number(b(c))) if _number(b(c)) else math.nan
+
+    def unary_expr(self):
+        if self.accept("op", "-"):
+            operand = self.unary_expr()
+            return lambda c: -_number(operand(c))
+        return self.union_expr()
+
+    def union_expr(self):
+        def combine(op, a, b):
+            def union(c):
+                left, right = a(c), b(c)
+                if not isinstance(left, list) or not isinstance(right, list):
+                    raise InvalidSelectorException("The operands of | must be node-sets")
+                return c.document.sort(left + right)
+
+            return union
+
+        return self._binary(self.path_expr, ("|",), "op", combine)
+
+    def path_expr(self):
+        kind, value = self.peek()
+        if kind == "op" and value in ("/", "//"):
+            return self.location_path(absolute=True)
+        next_kind, next_value = self.peek(1)
+        is_function = kind == "name" and next_value == "(" and value not in _NODE_TYPES
+        if kind in ("literal", "number") or (kind == "op" and value == "(") or is_function:
+            primary = self.filter_expr()
+            kind, value = self.peek()
+            if kind == "op" and value in ("/", "//"):
+                steps = self.relative_path()
+                return lambda c: _walk(_node_set(primary(c)), steps, c.document)
+            return primary
+        return self.location_path(absolute=False)
+
+    def filter_expr(self):
+        primary = self.primary_expr()
+        predicates = self.predicates()
+        if not predicates:
+            return primary
+
+        def filtered(c):
+            nodes = _node_set(primary(c))
+            return _filter(nodes, predicates, c.document)
+
+        return filtered
+
+    def primary_expr(self):
+        kind, value = self.next()
+        if kind == "literal":
+            string = value[1:-1]
+            return lambda c: string
+        if kind == "number":
+            number = float(value)
+            return lambda c: number
+        if kind == "op" and value == "(":
+            expression = self.or_expr()
+            self.expect(")")
+            return expression
+        if value not in _FUNCTIONS:
+            raise self.error(f"unsupported function {value}()")
+        function, minimum, maximum = _FUNCTIONS[value]
+        self.expect("(")
+        args = []
+        if not self.accept("op", ")"):
+            args.append(self.or_expr())
+            while self.accept("op", ","):
+                args.append(self.or_expr())
+            self.expect(")")
+        if len(args) < minimum or (maximum is not None and len(args) > maximum):
+            raise self.error(f"wrong number of arguments for {value}()")
+        return lambda c: function(c, *(arg(c) for arg in args))
+
+    def location_path(self, absolute: bool):
+        if not absolute:
+            steps = self.relative_path()
+            return lambda c: _walk([c.node], steps, c.document)
+        if self.accept("op", "/"):
+            kind, value = self.peek()
+            # "/" alone is the document
+            if kind is None or (kind == "op" and value not in (".", "..", "@", "*")):
+                return lambda c: [c.document.root]
+            steps = self.relative_path()
+        else:
+            self.expect("//")
+            steps = [_descendant_or_self_step, *self.relative_path()]
+        return lambda c: _walk([c.document.root], steps, c.document)
+
+    def relative_path(self) -> list:
+        if self.accept("op", "/"):
+            pass
+        elif self.accept("op", "//"):
+            return [_descendant_or_self_step, *self.relative_path()]
+        steps = [self.step()]
+        while True:
+            if self.accept("op", "/"):
+                steps.append(self.step())
+            elif self.accept("op", "//"):
+                steps.extend((_descendant_or_self_step, self.step()))
+            else:
+                return steps
+
+    def step(self):
+        if self.accept("op", "."):
+            return _Step("self", _any_node, [])
+        if self.accept("op", ".."):
+            return _Step("parent", _any_node, [])
+        if self.accept("op", "@"):
+            axis = "attribute"
+        elif self.peek()[0] == "name" and self.peek(1) == ("op", "::"):
+            axis = self.next()[1]
+            self.next()
+            if axis not in _AXES:
+                raise self.error(f"unsupported axis {axis}")
+        else:
+            axis = "child"
+        return _Step(axis, self.node_test(axis), self.predicates())
+
+    def node_test(self, axis: str):
+        kind, value = self.next()
+        if kind == "op" and value == "*":
+            if axis == "attribute":
+                return lambda node, document: True
+            return lambda node, document: isinstance(node, Tag) and node is not document.root
+        if kind != "name":
+            raise self.error(f"unexpected {value!r}")
+        if self.peek() == ("op", "("):
+            if value not in _NODE_TYPES:
+                raise self.error(f"unexpected function {value}()")
+            self.next()
+            if value == "processing-instruction" and self.peek()[0] == "literal":
+                self.next()
+            self.expect(")")
+            if value == "text":
+                return lambda node, document: _is_text(node)
+            if value == "comment":
+                return lambda node, document: isinstance(node, Comment)
+            if value == "node":
+                return _any_node
+            return lambda node, document: False
+        name = value.lower()
+        if axis == "attribute":
+            return lambda node, document: node.name == name
+        return lambda node, document: isinstance(node, Tag) and node.name == name and node is not document.root
+
+    def predicates(self) -> list:
+        predicates = []
+        while self.accept("op", "["):
+            predicates.append(self.or_expr())
+            self.expect("]")
+        return predicates
+
+
+def _divide(left: float, right: float) -> float:
+    if right:
+        return left / right
+    if not left or math.isnan(left):
+        return math.nan
+    return math.copysign(math.inf, left) * math.copysign(1, right)
+
+
+def _any_node(node, document) -> bool:
+    return not isinstance(node, PreformattedString) or isinstance(node, Comment)
+
+
+def _node_set(value) -> list:
+    if not isinstance(value, list):
+        raise InvalidSelectorException("XPath expression is not a node-set")
+    return value
+
+
+class _Step:
+    __slots__ = ("axis", "test", "predicates")
+
+    def __init__(self, axis: str, test, predicates: list):
+        self.axis = axis
+        self.test = test
+        self.predicates = predicates
+
+
+_descendant_or_self_step = _Step("descendant-or-self", _any_node, [])
+
+
+def _axis(axis: str, node, document: "XPathDocument"):
+    """The nodes of the axis of `node`, in axis order (reverse document order
+    for the reverse axes)."""
+    is_attribute = isinstance(node, Attribute)
+    if axis == "child":
+        return () if is_attribute or not isinstance(node, Tag) else node.contents
+    if axis == "descendant":
+        return () if is_attribute or not isinstance(node, Tag) else node.descendants
+    if axis == "descendant-or-self":
+        return [node] if is_attribute or not isinstance(node, Tag) else chain((node,), node.descendants)
+    if axis == "self":
+        return (node,)
+    if axis == "parent":
+        return () if node.parent is None else (node.parent,)
+    if axis in ("ancestor", "ancestor-or-self"):
+        ancestors = [node] if axis == "ancestor-or-self" else []
+        parent = node.parent
+        while parent is not None:
+            ancestors.append(parent)
+            parent = parent.parent
+        return ancestors
+    if axis == "attribute":
+        if not isinstance(node, Tag) or node is document.root:
+            return ()
+        return [Attribute(node, name, value, position) for position, (name, value) in enumerate(node.attrs.items())]
+    if is_attribute:
+        # the siblings of an attribute are not defined, its following and
+        # preceding nodes are the ones of its element's content
+        if axis in ("following-sibling", "preceding-sibling"):
+            return ()
+        node = node.parent
+        if axis == "following":
+            return document.nodes[document.index[id(node)] + 1 :]
+    if axis == "following-sibling":
+        return node.next_siblings
+    if axis == "preceding-sibling":
+        return node.previous_siblings
+    if axis == "following":
+        return document.nodes[document.end(node) + 1 :]
+    # preceding: the nodes before, ancestors excepted
+    ancestors = {id(ancestor) for ancestor in _axis("ancestor", node, document)}
+    return [
+        preceding for preceding in reversed(document.nodes[: document.index[id(node)]]) if id(preceding) not in ancestors
+    ]
+
+
+def _filter(nodes: list, predicates: list, document: "XPathDocument") -> list:
+    for predicate in predicates:
+        size = len(nodes)
+        kept = []
+        for position, node in enumerate(nodes, 1):
+            value = predicate(_Context(node, position, size, document))
+            if isinstance(value, float) and not isinstance(value, bool):
+                if value == position:
+                    kept.append(node)
+            elif _boolean(value):
+                kept.append(node)
+        nodes = kept
+    return nodes
+
+
+def _walk(nodes: list, steps: list, document: "XPathDocument") -> list:
+    for step in steps:
+        found = []
+        seen = set()
+        for node in nodes:
+            candidates = [candidate for candidate in _axis(step.axis, node, document) if step.test(candidate, document)]
+            for candidate in _filter(candidates, step.predicates, document):
+                key = document.key(candidate)
+                if key not in seen:
+                    seen.add(key)
+                    found.append(candidate)
+        nodes = document.sort(found) if len(nodes) > 1 or step.axis in _REVERSE_AXES else found
+    return nodes
+
+
+@lru_cache(maxsize=512)
+def compile_xpath(expression: str) -> Callable[[_Context], Any]:
+    """Parses an expression, raising InvalidSelectorException when it is not
+    valid or uses an unsupported function or axis."""
+    return _Parser(expression).parse()
+
+
+class XPathDocument:
+    """A BeautifulSoup tree indexed in document order for XPath evaluation."""
+
+    def __init__(self, root: BeautifulSoup):
+        self.root = root
+        self.nodes = [root, *root.descendants]
+        self.index = {id(node): position for position, node in enumerate(self.nodes)}
+
+    def key(self, node) -> tuple[int, int]:
+        if isinstance(node, Attribute):
+            return self.index[id(node.parent)], node.position + 1
+        return self.index[id(node)], 0
+
+    def sort(self, nodes: list) -> list:
+        unique = {self.key(node): node for node in nodes}
+        return [unique[key] for key in sorted(unique)]
+
+    def end(self, node) -> int:
+        # the position of the last descendant of node
+        while isinstance(node, Tag) and node.contents:
+            node = node.contents[-1]
+        return self.index[id(node)]
+
+    def evaluate(self, expression: str, node=None) -> Any:
+        """Evaluates an expression with `node` (the document by default) as
+        context node. Node-sets are returned as lists in document order."""
+        context = _Context(self.root if node is None else node, 1, 1, self)
+        return compile_xpath(expression)(context)
+
+    def select(self, expression: str, node=None) -> list[Tag]:
+        """The elements selected by an expression, as find_elements returns them."""
+        result = self.evaluate(expression, node)
+        if not isinstance(result, list) or any(
+            not isinstance(found, Tag) or found is self.root for found in result
+        ):
+            raise InvalidSelectorException(
+                f"The result of the xpath expression {expression!r} is not a list of elements"
+            )
+        return result
@@ -0,0 +1,258 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Evaluation of expected conditions inside the browser.
+
+Some of the canned expected conditions describe themselves with a
+``browser_condition`` attribute. Such a description can be compiled for a
+driver and waited for with a single asynchronous script, which watches
+the document with a ``MutationObserver`` and returns as soon as the
+condition may hold.
+
+Composite conditions (``any_of``, ``all_of``, ``none_of``) made only of
+such conditions are described the same way, and their sub-conditions are
+checked together with one synchronous script per poll.
+
+The browser side is deliberately lenient: it may report a condition as
+met when the Python predicate would not agree yet, never the other way
+round. The Python predicate is always run afterwards and stays the source
+of truth for the returned value.
+"""
+
+from typing import Any, Callable, Optional, Sequence
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webelement import WebElement
+
+_CONDITION_JS = """
+var scope = root || document;
+var doc = scope.ownerDocument || scope;
+
+function locate(using, value) {
+  if (using === 'css selector' || using === 'tag name') {
+    return scope.querySelector(value);
+  }
+  if (using === 'xpath') {
+    var result = doc.evaluate(value, scope, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (var i = 0; i < result.snapshotLength; i++) {
+      if (result.snapshotItem(i).nodeType === 1) {
+        return result.snapshotItem(i);
+      }
+    }
+    return null;
+  }
+  if (using === 'link text' || using === 'partial link text') {
+    var links = scope.querySelectorAll('a');
+    for (var j = 0; j < links.length; j++) {
+      var text = (links[j].innerText || links[j].textContent || '').replace(/^\\s+|\\s+$/g, '');
+      if (using === 'link text' ? text === value : text.indexOf(value) !== -1) {
+        return links[j];
+      }
+    }
+    return null;
+  }
+  throw new Error('Unsupported locator strategy: ' + using);
+}
+
+// false only when Selenium's isDisplayed certainly says no: hidden by a
+// display: none ancestor, visibility or opacity. Elements without client
+// rects (options of a closed select, display: contents, empty ones with
+// overflowing children) are left to the Python predicate.
+function visible(element) {
+  var tag = element.tagName.toUpperCase();
+  if (!element.isConnected || tag === 'OPTION' || tag === 'OPTGROUP') {
+    return true;
+  }
+  var view = doc.defaultView;
+  for (var node = element; node; node = node.parentElement || node.getRootNode().host) {
+    if (view.getComputedStyle(node).display === 'none') {
+      return false;
+    }
+  }
+  var style = view.getComputedStyle(element);
+  return style.visibility !== 'hidden' && style.visibility !== 'collapse' && style.opacity !== '0';
+}
+
+// the rendered text may differ from the DOM text in white space and case
+// (text-transform), compare leniently
+function normalize(text) {
+  return (text || '').replace(/\s+/g, ' ').toLowerCase();
+}
+
+function holds(condition) {
+  switch (condition.kind) {
+    case 'any':
+      return condition.conditions.some(holds);
+    case 'all':
+      return condition.conditions.every(holds);
+    case 'none':
+      // the complement of a lenient check is not lenient
+      return true;
+  }
+  var element = locate(condition.using, condition.value);
+  switch (condition.kind) {
+    case 'presence':
+      return element !== null;
+    case 'visibility':
+      return element !== null && visible(element);
+    case 'clickable':
+      return element !== null && visible(element) && !element.matches(':disabled');
+    case 'text':
+      return element !== null && (normalize(element.innerText).indexOf(normalize(condition.text)) !== -1 ||
+          normalize(element.textContent).indexOf(normalize(condition.text)) !== -1);
+  }
+  throw new Error('Unsupported condition: ' + condition.kind);
+}
+"""
+
+_WAIT_JS = (
+    "var condition = arguments[0], root = arguments[1], timeoutMs = arguments[2];"
+    "var done = arguments[arguments.length - 1];"
+    + _CONDITION_JS
+    + """
+var finished = false, observer = null, interval = null, timer = null;
+function finish(result) {
+  if (finished) return;
+  finished = true;
+  if (observer) observer.disconnect();
+  clearInterval(interval);
+  clearTimeout(timer);
+  done(result);
+}
+function check() {
+  try {
+    if (holds(condition)) finish(true);
+  } catch (e) {
+    // let the Python predicate report the error
+    finish(true);
+  }
+}
+check();
+if (!finished) {
+  observer = new MutationObserver(check);
+  observer.observe(doc, {childList: true, subtree: true, attributes: true, characterData: true});
+  // changes that do not mutate the DOM (layout, animations)
+  interval = setInterval(check, 250);
+  timer = setTimeout(function () { finish(false); }, timeoutMs);
+}
+"""
+)
+
+
+_EVALUATE_JS = (
+    "var conditions = arguments[0], root = arguments[1];"
+    + _CONDITION_JS
+    + """
+return conditions.map(function (condition) {
+  try {
+    return holds(condition);
+  } catch (e) {
+    // let the Python predicate report the error
+    return true;
+  }
+});
+"""
+)
+
+
+def browser_condition(
+    kind: str, locator: Optional[tuple[str, str]] = None, **extra: Any
+) -> Callable[[Callable], Callable]:
+    """Marks an expected condition predicate as one that can be evaluated in
+    the browser."""
+
+    def decorate(predicate: Callable) -> Callable:
+        predicate.browser_condition = dict(kind=kind, locator=locator, **extra)
+        return predicate
+
+    return decorate
+
+
+def composite_condition(kind: str, methods: Sequence[Callable]) -> Callable[[Callable], Callable]:
+    """Marks a composite predicate as evaluable in the browser when all its
+    sub-conditions are."""
+    descriptions = [getattr(method, "browser_condition", None) for method in methods]
+
+    def decorate(predicate: Callable) -> Callable:
+        if descriptions and None not in descriptions:
+            predicate.browser_condition = dict(kind=kind, conditions=descriptions)
+        return predicate
+
+    return decorate
+
+
+def _parent(driver):
+    parent = driver.parent if isinstance(driver, WebElement) else driver
+    return parent if hasattr(parent, "locator_converter") else None
+
+
+def _compile(description: dict, parent) -> Optional[dict]:
+    condition = {key: item for key, item in description.items() if key not in ("locator", "conditions")}
+    if "conditions" in description:
+        conditions = [_compile(item, parent) for item in description["conditions"]]
+        if None in conditions:
+            return None
+        condition["conditions"] = conditions
+        return condition
+    by, value = parent.locator_converter.convert(*description["locator"])
+    if not isinstance(by, str):
+        return None
+    condition.update(using=by, value=value)
+    return condition
+
+
+def compile_condition(method: Callable, driver) -> Optional[dict]:
+    """Returns the browser representation of an expected condition for the
+    given driver, or None when it has to be evaluated in Python."""
+    description = getattr(method, "browser_condition", None)
+    parent = _parent(driver)
+    if description is None or parent is None:
+        return None
+    return _compile(description, parent)
+
+
+def evaluate_conditions(methods: Sequence[Callable], driver) -> list[bool]:
+    """Checks several expected conditions with one script execution.
+
+    Returns:
+    --------
+    list of bool : False for each condition that certainly does not hold.
+        All True when the conditions cannot be checked in the browser.
+    """
+    if len(methods) < 2:
+        return [True] * len(methods)
+    try:
+        # an invalid locator is reported by its own predicate
+        conditions = [compile_condition(method, driver) for method in methods]
+        if None in conditions:
+            return [True] * len(methods)
+        root = driver if isinstance(driver, WebElement) else None
+        return _parent(driver).execute_script(_EVALUATE_JS, conditions, root)
+    except WebDriverException:
+        return [True] * len(methods)
+
+
+def wait_in_browser(driver, condition: dict, timeout: float) -> bool:
+    """Waits inside the browser, for at most `timeout` seconds, until the
+    compiled condition may hold.
+
+    Returns:
+    --------
+    bool : True when the condition was seen in the browser, False on timeout.
+    """
+    if isinstance(driver, WebElement):
+        return driver.parent.execute_async_script(_WAIT_JS, condition, driver, int(timeout * 1000))
+    return driver.execute_async_script(_WAIT_JS, condition, None, int(timeout * 1000))
@@ -28,6 +28,7 @@ from selenium.common.exceptions import (
 )
 from selenium.webdriver.common.alert import Alert
 from selenium.webdriver.remote.webdriver import WebDriver, WebElement
+from selenium.webdriver.support.browser_conditions import browser_condition, composite_condition, evaluate_conditions
 
 """
  * Canned "Expected Conditions" which are generally useful within webdriver
@@ -100,6 +101,7 @@ def presence_of_element_located(locator: tuple[str, str]) -> Callable[[WebDriver
     >>> element = WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.NAME, "q")))
     """
 
+    @browser_condition("presence", locator)
     def _predicate(driver: WebDriverOrWebElement):
         return driver.find_element(*locator)
 
@@ -212,6 +214,7 @@ def visibility_of_element_located(
     >>> element = WebDriverWait(driver, 10).until(EC.visibility_of_element_located((By.NAME, "q")))
     """
 
+    @browser_condition("visibility", locator)
     def _predicate(driver: WebDriverOrWebElement):
         try:
             return _element_if_visible(driver.find_element(*locator))
@@ -388,6 +391,7 @@ def text_to_be_present_in_element(locator: tuple[str, str], text_: str) -> Calla
         )
     """
 
+    @browser_condition("text", locator, text=text_)
     def _predicate(driver: WebDriverOrWebElement):
         try:
             element_text = driver.find_element(*locator).text
@@ -627,6 +631,8 @@ def element_to_be_clickable(
             return element
         return False
 
+    if not isinstance(mark, WebElement):
+        browser_condition("clickable", mark)(_predicate)
     return _predicate
 
 
@@ -780,6 +786,14 @@ def element_located_selection_state_to_be(
     return _predicate
 
 
+def _window_handles(driver: WebDriver) -> list[str]:
+    # the handles tracked from BiDi events are read without a round trip
+    tracker = getattr(driver, "_window_tracker", None)
+    if tracker is not None and tracker.started:
+        return tracker.handles
+    return driver.window_handles
+
+
 def number_of_windows_to_be(num_windows: int) -> Callable[[WebDriver], bool]:
     """An expectation for the number of windows to be a certain value.
 
@@ -800,7 +814,7 @@ def number_of_windows_to_be(num_windows: int) -> Callable[[WebDriver], bool]:
     """
 
     def _predicate(driver: WebDriver):
-        return len(driver.window_handles) == num_windows
+        return len(_window_handles(driver)) == num_windows
 
     return _predicate
 
@@ -827,7 +841,7 @@ def new_window_is_opened(current_handles: list[str]) -> Callable[[WebDriver], bo
     """
 
     def _predicate(driver: WebDriver):
-        return len(driver.window_handles) > len(current_handles)
+        return len(_window_handles(driver)) > len(current_handles)
 
     return _predicate
 
@@ -920,10 +934,17 @@ def any_of(*expected_conditions: Callable[[D], T]) -> Callable[[D], Union[Litera
     ------
     Equivalent to a logical 'OR'. Returns results of the first matching
     condition, or False if none do.
+    When all the conditions are locator based canned conditions, they are
+    first checked together in the browser with a single script.
     """
 
+    @composite_condition("any", expected_conditions)
     def any_of_condition(driver: D):
-        for expected_condition in expected_conditions:
+        # conditions that certainly do not hold are skipped
+        flags = evaluate_conditions(expected_conditions, driver)
+        for expected_condition, flag in zip(expected_conditions, flags):
+            if not flag:
+                continue
             try:
                 result = expected_condition(driver)
                 if result:
@@ -963,9 +984,14 @@ def all_of(
     Equivalent to a logical 'AND'.
     Returns: When any ExpectedCondition is not met: False.
     When all ExpectedConditions are met: A List with each ExpectedCondition's return value.
+    When all the conditions are locator based canned conditions, they are
+    first checked together in the browser with a single script.
     """
 
+    @composite_condition("all", expected_conditions)
     def all_of_condition(driver: D):
+        if not all(evaluate_conditions(expected_conditions, driver)):
+            return False
         results: list[T] = []
         for expected_condition in expected_conditions:
             try:
@@ -1004,10 +1030,16 @@ def none_of(*expected_conditions: Callable[[D], Any]) -> Callable[[D], bool]:
     Notes:
     ------
     Equivalent to a logical 'NOT-OR'. Returns a Boolean
+    When all the conditions are locator based canned conditions, they are
+    first checked together in the browser with a single script.
     """
 
+    @composite_condition("none", expected_conditions)
     def none_of_condition(driver: D):
-        for expected_condition in expected_conditions:
+        flags = evaluate_conditions(expected_conditions, driver)
+        for expected_condition, flag in zip(expected_conditions, flags):
+            if not flag:
+                continue
             try:
                 result = expected_condition(driver)
                 if result:
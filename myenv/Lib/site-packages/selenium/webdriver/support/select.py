@@ -16,10 +16,71 @@
 # under the License.
 
 
-from selenium.common.exceptions import NoSuchElementException, UnexpectedTagNameException
+import warnings
+from dataclasses import dataclass
+from dataclasses import replace
+from typing import Callable, Optional
+
+from selenium.common.exceptions import NoSuchElementException, UnexpectedTagNameException, WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
 
+_OPTIONS_JS = """
+function state(select, option) {
+  var style = window.getComputedStyle(option);
+  var hidden = ['hidden', 'none', '0', '0.0'];
+  var group = option.parentElement && option.parentElement.tagName === 'OPTGROUP' ? option.parentElement : null;
+  return {
+    element: option,
+    index: option.index,
+    value: option.getAttribute('value'),
+    text: option.text,
+    selected: option.selected,
+    disabled: option.disabled || select.disabled || (group !== null && group.disabled),
+    visible: hidden.indexOf(style.visibility) === -1 && hidden.indexOf(style.display) === -1 &&
+        hidden.indexOf(style.opacity) === -1
+  };
+}
+"""
+
+_SNAPSHOT_JS = (
+    "var select = arguments[0];"
+    + _OPTIONS_JS
+    + "return Array.prototype.map.call(select.querySelectorAll('option'), function (option) {"
+    + "  return state(select, option);"
+    + "});"
+)
+
+# current state of the target options of a snapshot, or null when the options
+# changed since the snapshot was taken
+_TARGETS_JS = (
+    "var select = arguments[0], targets = arguments[1], count = arguments[2];"
+    + _OPTIONS_JS
+    + """
+var options = select.querySelectorAll('option');
+if (options.length !== count) return null;
+for (var i = 0; i < targets.length; i++) {
+  var option = options[targets[i][0]];
+  if (option.getAttribute('value') !== targets[i][1] || option.text !== targets[i][2]) return null;
+}
+return targets.map(function (target) { return state(select, options[target[0]]); });
+"""
+)
+
+
+@dataclass
+class OptionData:
+    """State of an option of a SELECT, as read by `Select.option_data`."""
+
+    element: WebElement
+    position: int
+    index: int
+    value: Optional[str]
+    text: str
+    selected: bool
+    disabled: bool
+    visible: bool
+
 
 class Select:
     def __init__(self, webelement: WebElement) -> None:
@@ -38,25 +99,51 @@ class Select:
         self._el = webelement
         multi = self._el.get_dom_attribute("multiple")
         self.is_multiple = multi and multi != "false"
+        self._snapshot: Optional[list[OptionData]] = None
 
     @property
     def options(self) -> list[WebElement]:
         """Returns a list of all options belonging to this select tag."""
         return self._el.find_elements(By.TAG_NAME, "option")
 
+    @property
+    def option_data(self) -> list[OptionData]:
+        """Returns the value, text, index, selected, disabled and visible
+        state of all options, read with a single script call.
+
+        The data is kept as a local snapshot: later reads and selections use
+        it to find the options without asking the browser again. Before a
+        selection, one script checks the options against the page and reads
+        their current disabled and visible state; the options are then
+        clicked through WebDriver, like a user would. A snapshot that no
+        longer matches the page is read again. Call `refresh` to read the
+        options again after the page changed them.
+
+        Example:
+            years = [option.text for option in Select(element).option_data]
+        """
+        if self._snapshot is None:
+            self.refresh()
+        return self._snapshot
+
+    def refresh(self) -> list[OptionData]:
+        """Reads the options again and replaces the local snapshot."""
+        self._snapshot = self._parse(self._el.parent.execute_script(_SNAPSHOT_JS, self._el))
+        return self._snapshot
+
     @property
     def all_selected_options(self) -> list[WebElement]:
         """Returns a list of all selected options belonging to this select
         tag."""
-        return [opt for opt in self.options if opt.is_selected()]
+        return [opt.element for opt in self.refresh() if opt.selected]
 
     @property
     def first_selected_option(self) -> WebElement:
         """The first selected option in this select tag (or the currently
         selected option in a normal select)"""
-        for opt in self.options:
-            if opt.is_selected():
-                return opt
+        for opt in self.refresh():
+            if opt.selected:
+                return opt.element
         raise NoSuchElementException("No options are selected")
 
     def select_by_value(self, value: str) -> None:
@@ -71,16 +158,11 @@ class Select:
         Raises:
             NoSuchElementException: If there is no option with specified value in SELECT
         """
-        css = f"option[value ={self._escape_string(value)}]"
-        opts = self._el.find_elements(By.CSS_SELECTOR, css)
-        matched = False
-        for opt in opts:
-            self._set_selected(opt)
-            if not self.is_multiple:
-                return
-            matched = True
-        if not matched:
-            raise NoSuchElementException(f"Cannot locate option with value: {value}")
+        self._change(
+            lambda opt: opt.value == value,
+            True,
+            f"Cannot locate option with value: {value}",
+        )
 
     def select_by_index(self, index: int) -> None:
         """Select the option at the given index. This is done by examining the
@@ -92,12 +174,12 @@ class Select:
         Raises:
             NoSuchElementException: If there is no option with specified index in SELECT
         """
-        match = str(index)
-        for opt in self.options:
-            if opt.get_attribute("index") == match:
-                self._set_selected(opt)
-                return
-        raise NoSuchElementException(f"Could not locate element with index {index}")
+        self._change(
+            lambda opt: opt.index == index,
+            True,
+            f"Could not locate element with index {index}",
+            first_only=True,
+        )
 
     def select_by_visible_text(self, text: str) -> None:
         """Select all options that display text matching the argument. That is,
@@ -111,35 +193,12 @@ class Select:
         Raises:
             NoSuchElementException: If there is no option with specified text in SELECT
         """
-        xpath = f".//option[normalize-space(.) = {self._escape_string(text)}]"
-        opts = self._el.find_elements(By.XPATH, xpath)
-        matched = False
-        for opt in opts:
-            if not self._has_css_property_and_visible(opt):
-                raise NoSuchElementException(f"Invisible option with text: {text}")
-            self._set_selected(opt)
-            if not self.is_multiple:
-                return
-            matched = True
-
-        if len(opts) == 0 and " " in text:
-            sub_string_without_space = self._get_longest_token(text)
-            if sub_string_without_space == "":
-                candidates = self.options
-            else:
-                xpath = f".//option[contains(.,{self._escape_string(sub_string_without_space)})]"
-                candidates = self._el.find_elements(By.XPATH, xpath)
-            for candidate in candidates:
-                if text == candidate.text:
-                    if not self._has_css_property_and_visible(candidate):
-                        raise NoSuchElementException(f"Invisible option with text: {text}")
-                    self._set_selected(candidate)
-                    if not self.is_multiple:
-                        return
-                    matched = True
-
-        if not matched:
-            raise NoSuchElementException(f"Could not locate element with visible text: {text}")
+        self._change(
+            lambda opt: opt.text == text,
+            True,
+            f"Could not locate element with visible text: {text}",
+            invisible_error=f"Invisible option with text: {text}",
+        )
 
     def deselect_all(self) -> None:
         """Clear all selected entries.
@@ -150,8 +209,7 @@ class Select:
         """
         if not self.is_multiple:
             raise NotImplementedError("You may only deselect all options of a multi-select")
-        for opt in self.options:
-            self._unset_selected(opt)
+        self._change(lambda opt: True, False, None)
 
     def deselect_by_value(self, value: str) -> None:
         """Deselect all options that have a value matching the argument. That
@@ -167,14 +225,11 @@ class Select:
         """
         if not self.is_multiple:
             raise NotImplementedError("You may only deselect options of a multi-select")
-        matched = False
-        css = f"option[value = {self._escape_string(value)}]"
-        opts = self._el.find_elements(By.CSS_SELECTOR, css)
-        for opt in opts:
-            self._unset_selected(opt)
-            matched = True
-        if not matched:
-            raise NoSuchElementException(f"Could not locate element with value: {value}")
+        self._change(
+            lambda opt: opt.value == value,
+            False,
+            f"Could not locate element with value: {value}",
+        )
 
     def deselect_by_index(self, index: int) -> None:
         """Deselect the option at the given index. This is done by examining
@@ -188,11 +243,12 @@ class Select:
         """
         if not self.is_multiple:
             raise NotImplementedError("You may only deselect options of a multi-select")
-        for opt in self.options:
-            if opt.get_attribute("index") == str(index):
-                self._unset_selected(opt)
-                return
-        raise NoSuchElementException(f"Could not locate element with index {index}")
+        self._change(
+            lambda opt: opt.index == index,
+            False,
+            f"Could not locate element with index {index}",
+            first_only=True,
+        )
 
     def deselect_by_visible_text(self, text: str) -> None:
         """Deselect all options that display text matching the argument. That
@@ -205,28 +261,92 @@ class Select:
         """
         if not self.is_multiple:
             raise NotImplementedError("You may only deselect options of a multi-select")
-        matched = False
-        xpath = f".//option[normalize-space(.) = {self._escape_string(text)}]"
-        opts = self._el.find_elements(By.XPATH, xpath)
-        for opt in opts:
-            if not self._has_css_property_and_visible(opt):
-                raise NoSuchElementException(f"Invisible option with text: {text}")
-            self._unset_selected(opt)
-            matched = True
-        if not matched:
-            raise NoSuchElementException(f"Could not locate element with visible text: {text}")
-
-    def _set_selected(self, option) -> None:
-        if not option.is_selected():
-            if not option.is_enabled():
+        self._change(
+            lambda opt: opt.text == text,
+            False,
+            f"Could not locate element with visible text: {text}",
+            invisible_error=f"Invisible option with text: {text}",
+        )
+
+    def _parse(self, options: list[dict], positions: Optional[list[int]] = None) -> list[OptionData]:
+        if positions is None:
+            positions = list(range(len(options)))
+        return [
+            OptionData(
+                element=opt["element"],
+                position=position,
+                index=opt["index"],
+                value=opt["value"],
+                text=opt["text"],
+                selected=opt["selected"],
+                disabled=opt["disabled"],
+                visible=opt["visible"],
+            )
+            for position, opt in zip(positions, options)
+        ]
+
+    def _change(
+        self,
+        matches: Callable[[OptionData], bool],
+        selected: bool,
+        not_found_error: Optional[str],
+        first_only: bool = False,
+        invisible_error: Optional[str] = None,
+    ) -> None:
+        # resolves the options against the snapshot and applies the change with
+        # one script call; when the snapshot is missing an option or is out of
+        # date, the options are read again once
+        fresh = self._snapshot is None
+        snapshot = self.option_data
+        while True:
+            targets = [opt for opt in snapshot if matches(opt)]
+            if targets or fresh:
+                if first_only or (selected and not self.is_multiple):
+                    targets = targets[:1]
+                result = self._apply(targets, selected, len(snapshot), not_found_error, invisible_error)
+                if result is not None:
+                    self._snapshot = result
+                    return
+                if fresh:
+                    raise WebDriverException("The options of the select changed while selecting")
+            snapshot = self.refresh()
+            fresh = True
+
+    def _apply(
+        self,
+        targets: list[OptionData],
+        selected: bool,
+        count: int,
+        not_found_error: Optional[str],
+        invisible_error: Optional[str],
+    ) -> Optional[list[OptionData]]:
+        if not targets and not_found_error is not None:
+            raise NoSuchElementException(not_found_error)
+        if not targets:
+            return self._snapshot
+        # the snapshot only finds the options, their state is read again
+        changes = [[opt.position, opt.value, opt.text] for opt in targets]
+        states = self._el.parent.execute_script(_TARGETS_JS, self._el, changes, count)
+        if states is None:
+            return None
+        current = self._parse(states, [opt.position for opt in targets])
+        for opt in current:
+            if invisible_error is not None and not opt.visible:
+                raise NoSuchElementException(invisible_error)
+            if selected and not opt.selected and opt.disabled:
                 raise NotImplementedError("You may not select a disabled option")
-            option.click()
 
-    def _unset_selected(self, option) -> None:
-        if option.is_selected():
-            option.click()
+        snapshot = list(self._snapshot)
+        for opt in current:
+            if opt.selected != selected:
+                opt.element.click()
+            if selected and not self.is_multiple:
+                snapshot = [replace(other, selected=False) for other in snapshot]
+            snapshot[opt.position] = replace(opt, selected=selected)
+        return snapshot
 
     def _escape_string(self, value: str) -> str:
+        warnings.warn("Select._escape_string is deprecated and will be removed", DeprecationWarning, stacklevel=2)
         if '"' in value and "'" in value:
             substrings = value.split('"')
             result = ["concat("]
@@ -244,6 +364,7 @@ class Select:
         return f'"{value}"'
 
     def _get_longest_token(self, value: str) -> str:
+        warnings.warn("Select._get_longest_token is deprecated and will be removed", DeprecationWarning, stacklevel=2)
         items = value.split(" ")
         longest = ""
         for item in items:
@@ -252,6 +373,11 @@ class Select:
         return longest
 
     def _has_css_property_and_visible(self, option) -> bool:
+        warnings.warn(
+            "Select._has_css_property_and_visible is deprecated, use the visible flag of Select.option_data",
+            DeprecationWarning,
+            stacklevel=2,
+        )
         css_value_candidates = ["hidden", "none", "0", "0.0"]
         css_property_candidates = ["visibility", "display", "opacity"]
 
@@ -16,6 +16,6 @@
 # under the License.
 
 from selenium.webdriver.support.select import Select
-from selenium.webdriver.support.wait import WebDriverWait
+from selenium.webdriver.support.wait import AsyncWebDriverWait, WebDriverWait
 
-__all__ = ["Select", "WebDriverWait"]
+__all__ = ["AsyncWebDriverWait", "Select", "WebDriverWait"]
@@ -15,13 +15,16 @@
 # specific language governing permissions and limitations
 # under the License.
 
+import asyncio
+import inspect
 import time
-from typing import Callable, Generic, Literal, Optional, TypeVar, Union
+from typing import Any, Callable, Generic, Literal, Optional, TypeVar, Union
 
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
 from selenium.types import WaitExcTypes
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support.browser_conditions import compile_condition, wait_in_browser
 
 POLL_FREQUENCY: float = 0.5  # How long to sleep in between calls to the method
 IGNORED_EXCEPTIONS: tuple[type[Exception]] = (NoSuchElementException,)  # default to be ignored.
@@ -37,6 +40,7 @@ class WebDriverWait(Generic[D]):
         timeout: float,
         poll_frequency: float = POLL_FREQUENCY,
         ignored_exceptions: Optional[WaitExcTypes] = None,
+        in_browser: bool = False,
     ):
         """Constructor, takes a WebDriver instance and timeout in seconds.
 
@@ -57,6 +61,15 @@ class WebDriverWait(Generic[D]):
             - Iterable structure of exception classes ignored during calls.
             - By default, it contains NoSuchElementException only.
 
+        in_browser
+            - Wait for supported expected conditions (presence_of_element_located,
+            visibility_of_element_located, element_to_be_clickable with a locator,
+            text_to_be_present_in_element) inside the browser with a single
+            asynchronous script that returns as soon as the DOM changes make the
+            condition true, instead of polling every poll_frequency.
+            Other conditions are polled as usual.
+            - By default, it is False.
+
         Example:
         --------
         >>> from selenium.webdriver.common.by import By
@@ -80,6 +93,10 @@ class WebDriverWait(Generic[D]):
             except TypeError:  # ignored_exceptions is not iterable
                 exceptions.append(ignored_exceptions)
         self._ignored_exceptions = tuple(exceptions)
+        self._in_browser = in_browser
+        # read from the session on the first in browser wait, it is a GET /timeouts
+        self._script_timeout_read = False
+        self._session_script_timeout: Optional[float] = None
 
     def __repr__(self) -> str:
         return f'<{type(self).__module__}.{type(self).__name__} (session="{self._driver.session_id}")>'
@@ -124,7 +141,17 @@ class WebDriverWait(Generic[D]):
         stacktrace = None
 
         end_time = time.monotonic() + self._timeout
+        condition = compile_condition(method, self._driver) if self._in_browser else None
+        if condition and condition["kind"] == "none":
+            # the complement of the lenient browser check, nothing to wait for
+            condition = None
+        script_timeout = self._script_timeout() if condition else None
+        if script_timeout == 0:
+            # scripts cannot wait in this session, poll as usual
+            condition = None
         while True:
+            if condition:
+                self._wait_in_browser(condition, end_time, script_timeout)
             try:
                 value = method(self._driver)
                 if value:
@@ -137,6 +164,31 @@ class WebDriverWait(Generic[D]):
             time.sleep(self._poll)
         raise TimeoutException(message, screen, stacktrace)
 
+    def _script_timeout(self) -> Optional[float]:
+        if not self._script_timeout_read:
+            driver = self._driver.parent if isinstance(self._driver, WebElement) else self._driver
+            try:
+                self._session_script_timeout = driver.timeouts.script
+            except TypeError:
+                # the session has no script timeout
+                self._session_script_timeout = None
+            self._script_timeout_read = True
+        return self._session_script_timeout
+
+    def _wait_in_browser(self, condition: dict, end_time: float, script_timeout: Optional[float]) -> None:
+        """Blocks until the browser reports the condition may hold, the
+        timeout is reached or the script fails (e.g. on navigation)."""
+        timeout = end_time - time.monotonic()
+        if timeout <= 0:
+            return
+        if script_timeout is not None:
+            # return before the driver raises a script timeout
+            timeout = min(timeout, script_timeout * 0.9)
+        try:
+            wait_in_browser(self._driver, condition, timeout)
+        except WebDriverException:
+            pass
+
     def until_not(self, method: Callable[[D], T], message: str = "") -> Union[T, Literal[True]]:
         """Wait until the method returns a value that is not False.
 
@@ -184,3 +236,116 @@ class WebDriverWait(Generic[D]):
                 break
             time.sleep(self._poll)
         raise TimeoutException(message)
+
+
+class AsyncWebDriverWait:
+    def __init__(
+        self,
+        driver: Any,
+        timeout: float,
+        poll_frequency: float = POLL_FREQUENCY,
+        ignored_exceptions: Optional[WaitExcTypes] = None,
+    ):
+        """Constructor, takes an AsyncWebDriver (or AsyncWebElement) and a
+        timeout in seconds. Waiting sleeps with asyncio, the other sessions
+        of the event loop keep running.
+
+        Attributes:
+        -----------
+        driver
+            - Instance of AsyncWebDriver or an AsyncWebElement
+
+        timeout
+            - Number of seconds before timing out
+
+        poll_frequency
+            - Sleep interval between calls
+            - By default, it is 0.5 second.
+
+        ignored_exceptions
+            - Iterable structure of exception classes ignored during calls.
+            - By default, it contains NoSuchElementException only.
+
+        Example:
+        --------
+        >>> from selenium.webdriver.common.by import By
+        >>> from selenium.webdriver.support.wait import AsyncWebDriverWait
+        >>>
+        >>> element = await AsyncWebDriverWait(driver, 10).until(lambda d: d.find_element(By.ID, "someId"))
+        """
+        self._driver = driver
+        self._timeout = float(timeout)
+        self._poll = poll_frequency
+        # avoid the divide by zero
+        if self._poll == 0:
+            self._poll = POLL_FREQUENCY
+        exceptions: list = list(IGNORED_EXCEPTIONS)
+        if ignored_exceptions:
+            try:
+                exceptions.extend(iter(ignored_exceptions))
+            except TypeError:  # ignored_exceptions is not iterable
+                exceptions.append(ignored_exceptions)
+        self._ignored_exceptions = tuple(exceptions)
+
+    def __repr__(self) -> str:
+        return f'<{type(self).__module__}.{type(self).__name__} (session="{self._driver.session_id}")>'
+
+    async def _call(self, method: Callable) -> Any:
+        value = method(self._driver)
+        if inspect.isawaitable(value):
+            value = await value
+        return value
+
+    async def until(self, method: Callable, message: str = "") -> Any:
+        """Wait until the method returns a value that is not False.
+
+        Parameters:
+        -----------
+        method: callable(AsyncWebDriver)
+            - A coroutine function, or a function returning an awaitable or a
+            value, that takes the driver as an argument.
+
+        message: str
+            - Optional message for :exc:`TimeoutException`
+
+        Return:
+        -------
+        object
+            - The result of the last call to `method`
+
+        Raises:
+        -------
+        TimeoutException
+            - If 'method' does not return a truthy value within the timeout
+        """
+        screen = None
+        stacktrace = None
+
+        end_time = time.monotonic() + self._timeout
+        while True:
+            try:
+                value = await self._call(method)
+                if value:
+                    return value
+            except self._ignored_exceptions as exc:
+                screen = getattr(exc, "screen", None)
+                stacktrace = getattr(exc, "stacktrace", None)
+            if time.monotonic() > end_time:
+                break
+            await asyncio.sleep(self._poll)
+        raise TimeoutException(message, screen, stacktrace)
+
+    async def until_not(self, method: Callable, message: str = "") -> Any:
+        """Wait until the method returns a value that is False, see `until`."""
+        end_time = time.monotonic() + self._timeout
+        while True:
+            try:
+                value = await self._call(method)
+                if not value:
+                    return value
+            except self._ignored_exceptions:
+                return True
+            if time.monotonic() > end_time:
+                break
+            await asyncio.sleep(self._poll)
+        raise TimeoutException(message)
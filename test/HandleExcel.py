@@ -1,17 +1,412 @@
-import pandas as pd
+'''
+Excel test data
+---------------
+the test data is kept in Data.xlsx, first row of a sheet is the header.
+
+the workbook is read with openpyxl in read_only mode: the rows are parsed
+one by one from the sheet xml, the whole workbook is never in memory.
+
+the parsed rows are cached in .data_cache (pickle, one record per row),
+next runs read the cache instead of parsing the workbook again.
+the cache is used when the mtime and size of the workbook did not change,
+or when they changed but the sha256 of the file is the same (git checkout),
+the new mtime is then stored in the cache.
+
+use it to run a test once per row:
+
+    from .HandleExcel import excel_parametrize
+
+    @excel_parametrize("Username, email")
+    def test_user(Username, email):
+        ...
+
+writing back
+------------
+WorkbookPatch changes cells without loading / saving the workbook with
+openpyxl: only the xml of the changed sheets is edited, all the other
+parts of the xlsx (zip) are copied as they are. many changes are saved
+with one rewrite of the file:
+
+    with WorkbookPatch() as patch:
+        patch.set("Sheet1", "A6", "Thavamani")
+        patch.set_by_header("Sheet1", 4, "email", "new@gmail.com")
+
+strings are written as inline strings (sharedStrings.xml is not touched),
+None removes the value of the cell. dates and times are written as date
+serials, with the style of the cell or else a date style of the workbook
+(added to styles.xml when it has none). nan and inf cannot be written.
+replacing a formula also removes the calculation chain (calcChain.xml),
+excel rebuilds it when the workbook is opened.
+'''
+import datetime
+import hashlib
+import math
+import os
+import pickle
+import posixpath
+import re
+import shutil
+import zipfile
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+import pytest
+from openpyxl import load_workbook
+from openpyxl.utils.cell import column_index_from_string, coordinate_from_string, get_column_letter, range_boundaries
+from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900, to_excel
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), "Data.xlsx")
+CACHE_DIR = os.path.join(os.path.dirname(__file__), ".data_cache")
+
+
+def file_hash(path):
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def cache_file(path, sheet):
+    name = hashlib.sha256(f"{os.path.abspath(path)}|{sheet}".encode()).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, name + ".pickle")
+
+
+def parse_rows(path, sheet=None):
+    # yields the rows as tuples, the first one is the header
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.worksheets[0]
+        for row in worksheet.iter_rows(values_only=True):
+            # read_only sheets can report empty rows at the end
+            if any(value is not None for value in row):
+                yield row
+    finally:
+        workbook.close()
+
+
+def open_cache(path, sheet, stat):
+    # the cache file positioned on its first row, None when it is missing or stale
+    target = cache_file(path, sheet)
+    try:
+        f = open(target, "rb")
+    except FileNotFoundError:
+        return None
+    meta = pickle.load(f)
+    if (meta["mtime_ns"], meta["size"]) == (stat.st_mtime_ns, stat.st_size):
+        return f
+    if meta["size"] != stat.st_size or meta["sha256"] != file_hash(path):
+        f.close()
+        return None
+
+    # same content with a new mtime (git checkout): store the new mtime so
+    # that the next runs do not hash the workbook again, the rows are copied as they are
+    temp = f"{target}.{os.getpid()}.tmp"
+    try:
+        with f, open(temp, "wb") as out:
+            pickle.dump(dict(meta, mtime_ns=stat.st_mtime_ns), out)
+            shutil.copyfileobj(f, out)
+        os.replace(temp, target)
+    finally:
+        if os.path.exists(temp):
+            os.remove(temp)
+    f = open(target, "rb")
+    pickle.load(f)
+    return f
+
+
+def read_rows(sheet=None, path=DATA_FILE):
+    """rows of a sheet as tuples, the first one is the header"""
+    stat = os.stat(path)
+    cache = open_cache(path, sheet, stat)
+    if cache is not None:
+        # a sheet without rows is cached too
+        with cache:
+            while True:
+                try:
+                    yield pickle.load(cache)
+                except EOFError:
+                    return
+
+    # parse the workbook and write the cache while the rows are used
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    target = cache_file(path, sheet)
+    temp = f"{target}.{os.getpid()}.tmp"
+    complete = False
+    try:
+        with open(temp, "wb") as f:
+            pickle.dump({"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": file_hash(path)}, f)
+            for row in parse_rows(path, sheet):
+                pickle.dump(row, f)
+                yield row
+        complete = True
+        os.replace(temp, target)
+    finally:
+        if not complete and os.path.exists(temp):
+            os.remove(temp)
+
+
+def sheet_rows(sheet=None, path=DATA_FILE):
+    """rows of a sheet as dicts, header name -> value"""
+    rows = read_rows(sheet, path)
+    header = next(rows, None)
+    if header is None:
+        return
+    for row in rows:
+        yield {name: value for name, value in zip(header, row) if name is not None}
+
+
+def excel_parametrize(columns, sheet=None, path=DATA_FILE):
+    """pytest.mark.parametrize with one test case per row of the sheet"""
+    names = [name.strip() for name in columns.split(",")]
+    values = [tuple(row.get(name) for name in names) for row in sheet_rows(sheet, path)]
+    return pytest.mark.parametrize(names, values)
+
+
+NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+NS_PACKAGE_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+
+def sheet_parts(archive):
+    # sheet name -> path of its xml part inside the xlsx
+    workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+    rels = ElementTree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    targets = {rel.get("Id"): rel.get("Target") for rel in rels.iter(f"{NS_PACKAGE_REL}Relationship")}
+    parts = {}
+    for sheet in workbook.iter(f"{NS_MAIN}sheet"):
+        target = targets[sheet.get(f"{NS_REL}id")]
+        parts[sheet.get("name")] = target.lstrip("/") if target.startswith("/") else posixpath.join("xl", target)
+    return parts
+
+
+# builtin number formats of the date values written without a cell style
+DATE_FORMATS = [(datetime.datetime, 22), (datetime.date, 14), (datetime.time, 21), (datetime.timedelta, 46)]
+
+
+class DateSerial(float):
+    """date serial of a date value, written with `style` when the cell has none"""
+
+    def __new__(cls, serial, style):
+        value = super().__new__(cls, serial)
+        value.style = style
+        return value
+
+
+def workbook_epoch(archive):
+    workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+    properties = workbook.find(f"{NS_MAIN}workbookPr")
+    if properties is not None and properties.get("date1904") in ("1", "true"):
+        return CALENDAR_MAC_1904
+    return CALENDAR_WINDOWS_1900
+
+
+def date_style(styles, number_format):
+    # index of a cell style with the number format, added at the end of cellXfs when there is none
+    cell_xfs = re.search(r"<(\w+:)?cellXfs\b[^>]*>(.*?)</\1?cellXfs>", styles, re.S)
+    prefix = cell_xfs.group(1) or ""
+    xfs = re.findall(rf"<{prefix}xf\b[^>]*", cell_xfs.group(2))
+    for index, xf in enumerate(xfs):
+        if re.search(rf'\bnumFmtId="{number_format}"', xf):
+            return index, styles
+    xf = f'<{prefix}xf numFmtId="{number_format}" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    head = re.sub(r'\bcount="\d+"', f'count="{len(xfs) + 1}"', styles[cell_xfs.start():cell_xfs.start(2)])
+    styles = styles[:cell_xfs.start()] + head + cell_xfs.group(2) + xf + styles[cell_xfs.end(2):]
+    return len(xfs), styles
+
+
+def date_serials(updates, styles, epoch):
+    # the updates with the date values as DateSerial, and the styles with the date styles they use
+    values = {}
+    for row, columns in updates.items():
+        values[row] = {}
+        for column, value in columns.items():
+            if isinstance(value, (datetime.date, datetime.time, datetime.timedelta)):
+                style = None
+                if styles is not None:
+                    number_format = next(number for kind, number in DATE_FORMATS if isinstance(value, kind))
+                    style, styles = date_style(styles, number_format)
+                value = DateSerial(to_excel(value, epoch), style)
+            values[row][column] = value
+    return values, styles
+
+
+def without_calc_chain(name, data):
+    # the calcChain.xml entries of [Content_Types].xml and of the workbook relationships
+    if name == "[Content_Types].xml":
+        return re.sub(rb'<(\w+:)?Override\b[^>]*PartName="/xl/calcChain\.xml"[^>]*/>', b"", data)
+    if name == "xl/_rels/workbook.xml.rels":
+        return re.sub(rb'<(\w+:)?Relationship\b[^>]*Target="(/xl/)?calcChain\.xml"[^>]*/>', b"", data)
+    return data
+
+
+def cell_xml(prefix, ref, value, style):
+    if isinstance(value, DateSerial):
+        style = style or value.style
+    style = f' s="{style}"' if style else ""
+    if value is None:
+        # keep the formatting of the cell
+        return f'<{prefix}c r="{ref}"{style}/>' if style else ""
+    if isinstance(value, bool):
+        return f'<{prefix}c r="{ref}"{style} t="b"><{prefix}v>{int(value)}</{prefix}v></{prefix}c>'
+    if isinstance(value, (int, float)):
+        return f'<{prefix}c r="{ref}"{style} t="n"><{prefix}v>{value!r}</{prefix}v></{prefix}c>'
+    text = escape(str(value))
+    space = ' xml:space="preserve"' if text != text.strip() else ""
+    return f'<{prefix}c r="{ref}"{style} t="inlineStr"><{prefix}is><{prefix}t{space}>{text}</{prefix}t></{prefix}is></{prefix}c>'
+
+
+def patch_row(prefix, row_xml, row, values, formulas):
+    # values: column index -> value, replaces / adds the cells of the row in column order,
+    # the references of the replaced formulas are added to formulas
+    match = re.match(rf"<{prefix}row\b([^>]*?)(/>|>(.*)</{prefix}row>)$", row_xml, re.S)
+    # spans is only a hint for excel, drop it instead of recomputing it
+    attributes = re.sub(r'\sspans="[^"]*"', "", match.group(1))
+    cells = []
+    for cell in re.finditer(rf"<{prefix}c\b([^>]*?)(?:/>|>.*?</{prefix}c>)", match.group(3) or "", re.S):
+        ref = re.search(r'\br="([A-Z]+)\d+"', cell.group(1))
+        if ref is None:
+            raise ValueError(f"Cell without reference in row {row}, cannot patch it")
+        cells.append([column_index_from_string(ref.group(1)), cell.group(0)])
+
+    existing = {column: index for index, (column, _) in enumerate(cells)}
+    for column, value in values.items():
+        ref = f"{get_column_letter(column)}{row}"
+        if column in existing:
+            old = cells[existing[column]][1]
+            formula = re.search(rf"<{prefix}f\b[^>]*", old)
+            if formula:
+                if re.search(r'\bt="shared"', formula.group(0)) and re.search(r'\bref="', formula.group(0)):
+                    raise ValueError(f"{ref} holds a shared formula used by other cells, cannot patch it")
+                formulas.append(ref)
+            style = re.search(r'\bs="(\d+)"', old[:old.index(">")])
+            cells[existing[column]][1] = cell_xml(prefix, ref, value, style and style.group(1))
+        else:
+            cells.append([column, cell_xml(prefix, ref, value, None)])
+    cells.sort(key=lambda cell: cell[0])
+    return f"<{prefix}row{attributes}>{''.join(xml for _, xml in cells)}</{prefix}row>"
+
+
+def patch_sheet(xml, updates, formulas):
+    # updates: row number -> {column index: value}
+    sheet_data = re.search(r"<(\w+:)?sheetData\b[^>]*?(/>|>)", xml)
+    prefix = sheet_data.group(1) or ""
+    start = sheet_data.end()
+    if sheet_data.group(2) == "/>":
+        xml = f"{xml[:sheet_data.start()]}<{prefix}sheetData>{xml[start:]}"
+        start = sheet_data.start() + len(f"<{prefix}sheetData>")
+        xml = f"{xml[:start]}</{prefix}sheetData>{xml[start:]}"
+    end = xml.index(f"</{prefix}sheetData>", start)
+
+    pending = sorted(updates)
+    parts = []
+    for row_match in re.finditer(rf"<{prefix}row\b[^>]*?(?:/>|>.*?</{prefix}row>)", xml[start:end], re.S):
+        number = re.search(r'\br="(\d+)"', row_match.group(0)[:row_match.group(0).index(">")])
+        if number is None:
+            raise ValueError("Row without number in the sheet, cannot patch it")
+        number = int(number.group(1))
+        while pending and pending[0] < number:
+            row = pending.pop(0)
+            parts.append(patch_row(prefix, f'<{prefix}row r="{row}"/>', row, updates[row], formulas))
+        if pending and pending[0] == number:
+            pending.pop(0)
+            parts.append(patch_row(prefix, row_match.group(0), number, updates[number], formulas))
+        else:
+            parts.append(row_match.group(0))
+    for row in pending:
+        parts.append(patch_row(prefix, f'<{prefix}row r="{row}"/>', row, updates[row], formulas))
+
+    xml = xml[:start] + "".join(parts) + xml[end:]
+    return update_dimension(xml, prefix, updates)
+
+
+def update_dimension(xml, prefix, updates):
+    # grow the used range of the sheet to the new cells
+    dimension = re.search(rf'<{prefix}dimension\b[^>]*\bref="([^"]*)"', xml)
+    if dimension is None:
+        return xml
+    min_col, min_row, max_col, max_row = range_boundaries(dimension.group(1))
+    columns = [column for values in updates.values() for column in values]
+    min_col, max_col = min([min_col or 1, *columns]), max([max_col or 1, *columns])
+    min_row, max_row = min([min_row or 1, *updates]), max([max_row or 1, *updates])
+    ref = f"{get_column_letter(min_col)}{min_row}:{get_column_letter(max_col)}{max_row}"
+    return xml[:dimension.start(1)] + ref + xml[dimension.end(1):]
+
+
+class WorkbookPatch:
+
+    def __init__(self, path=DATA_FILE):
+        self.path = path
+        self.updates = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.save()
+
+    def set(self, sheet, cell, value):
+        if isinstance(value, float) and not math.isfinite(value):
+            raise ValueError(f"{value} cannot be written in a cell ({sheet}!{cell})")
+        column, row = coordinate_from_string(cell)
+        self.updates.setdefault(sheet, {}).setdefault(row, {})[column_index_from_string(column)] = value
+
+    def set_by_header(self, sheet, index, column, value):
+        # like df.loc[index, column]: index 0 is the first row after the header
+        header = next(read_rows(sheet, self.path))
+        self.set(sheet, f"{get_column_letter(header.index(column) + 1)}{index + 2}", value)
+
+    def save(self):
+        if not self.updates:
+            return
+        temp = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with zipfile.ZipFile(self.path) as source, zipfile.ZipFile(temp, "w") as target:
+                parts = sheet_parts(source)
+                missing = set(self.updates) - set(parts)
+                if missing:
+                    raise KeyError(f"No sheet named {', '.join(sorted(missing))} in {self.path}")
+                styles = source.read("xl/styles.xml").decode("utf-8") if "xl/styles.xml" in source.namelist() else None
+                original_styles = styles
+                epoch = workbook_epoch(source)
+                formulas = []
+                patched = {}
+                for sheet, updates in self.updates.items():
+                    values, styles = date_serials(updates, styles, epoch)
+                    xml = source.read(parts[sheet]).decode("utf-8")
+                    patched[parts[sheet]] = patch_sheet(xml, values, formulas).encode("utf-8")
+                if styles != original_styles:
+                    patched["xl/styles.xml"] = styles.encode("utf-8")
+
+                for info in source.infolist():
+                    if formulas and info.filename == "xl/calcChain.xml":
+                        continue
+                    data = patched[info.filename] if info.filename in patched else source.read(info)
+                    if formulas:
+                        data = without_calc_chain(info.filename, data)
+                    target.writestr(info, data)
+            os.replace(temp, self.path)
+        finally:
+            if os.path.exists(temp):
+                os.remove(temp)
+        self.updates = {}
+
+
 def read_datafrom_excel():
-    df = pd.read_excel("Data.xlsx")
-    print(df)
+    for row in sheet_rows():
+        print(row)
 
-read_datafrom_excel()
 
 def read_sheet_data():
-    df = pd.read_excel("Data.xlsx", sheet_name="Sheet2")
-    print(df)
-    print(df[["Username", "email"]])
-    print(df.iloc[0, 1])
-    print(df.iloc[1, 0])
-    df.loc[4, "Username"] = "Thavamani"
-    df.to_excel("Data.xlsx", index=False)
-
-read_sheet_data()
\ No newline at end of file
+    rows = list(sheet_rows("Sheet1"))
+    print([(row["Username"], row["email"]) for row in rows])
+    print(rows[0]["password"])
+    print(rows[1]["Username"])
+    with WorkbookPatch() as patch:
+        patch.set_by_header("Sheet1", 4, "Username", "Thavamani")
+
+
+if __name__ == "__main__":
+    read_datafrom_excel()
+    read_sheet_data()
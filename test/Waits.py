@@ -26,10 +26,15 @@ it is applied for the specific element with specific conditions
 
 fluent wait
 
+in browser wait
+---------------
+WebDriverWait(driver, 30, in_browser=True)
+the condition is checked inside the browser and the wait ends as soon
+as the element comes, it is not waiting for the next poll
+
 '''
 import time
 
-from selenium import webdriver
 from selenium.common import NoSuchElementException, ElementClickInterceptedException
 from selenium.webdriver import ActionChains
 from selenium.webdriver.common.by import By
@@ -71,7 +76,7 @@ def test_window_handling(start_browser):
 
 def test_fluent_wait(start_browser):
     driver = start_browser
-    wait = WebDriverWait(driver, 30, poll_frequency=4, ignored_exceptions=[ElementClickInterceptedException])
+    wait = WebDriverWait(driver, 30, poll_frequency=4, ignored_exceptions=[ElementClickInterceptedException], in_browser=True)
     driver.find_element(By.XPATH, "//a[text()='Create new account']").click()
     #time.sleep(10)
     element = wait.until(EC.visibility_of_element_located((By.XPATH,"//input[@aria-label='First name']")))
@@ -86,9 +91,9 @@ def test_navigation(start_browser):
     print(driver.title)
     driver.refresh()
 
-def test_drag_and_drop_operations():
+def test_drag_and_drop_operations(chrome_driver):
 
-    driver = webdriver.Chrome()
+    driver = chrome_driver
     driver.get("https://beej.us/blog/data/drag-n-drop/")
     driver.switch_to.frame(0)
     goat1 = driver.find_element(By.XPATH, "//img[@id='goat2']")
@@ -106,8 +111,8 @@ def test_drag_and_drop_operations():
 
     time.sleep(10)
 
-def test_Actions_Chains():
-    driver = webdriver.Chrome()
+def test_Actions_Chains(chrome_driver):
+    driver = chrome_driver
     driver.get("http://www.facebook.com")
     username = driver.find_element(By.XPATH, "//input[@id='email']")
     ac = ActionChains(driver)
@@ -1,7 +1,6 @@
 import time
 
 import pytest
-from selenium import webdriver
 from selenium.webdriver import Keys
 from selenium.webdriver.common import keys
 from selenium.webdriver.common.by import By
@@ -11,8 +10,8 @@ from selenium.webdriver.common.by import By
     ("Apple iPhone 17 Pro Max (Cosmic Orange, 256 GB)"),  # Test case 2
     ("Apple iPhone 17 Pro Max (Silver, 256 GB)")  # Test case 3
 ])
-def test_product_list(product_name):
-    driver = webdriver.Chrome()
+def test_product_list(chrome_driver, product_name):
+    driver = chrome_driver
     driver.get("https://www.flipkart.com/")
     print(driver.title)
     driver.find_element(By.XPATH, "//input[@name='q']").send_keys("iphone")
@@ -22,8 +21,8 @@ def test_product_list(product_name):
     price = driver.find_element(By.XPATH, "//div[text()='"+product_name+"']/parent::div/following-sibling::div/div[1]").text
     print(price)
 
-def test_product_price():
-    driver = webdriver.Chrome()
+def test_product_price(chrome_driver):
+    driver = chrome_driver
     driver.get("https://www.flipkart.com/")
     time.sleep(5)
     driver.find_element(By.XPATH, "//input[@name='q']").send_keys("iphone")
@@ -31,9 +30,11 @@ def test_product_price():
     driver.find_element(By.XPATH, "(//div[contains(text(),'17')]/span[contains(text(),'iphone')])[1]").click()
     time.sleep(5)
 
-    product_name = driver.find_elements(By.XPATH, "//a[@class='k7wcnx']//div[@class='RG5Slk']")
+    # one snapshot of the page, the names and prices are then read without asking the browser
+    page = driver.snapshot()
+    product_name = page.find_elements(By.XPATH, "//a[@class='k7wcnx']//div[@class='RG5Slk']")
 
-    product_price = driver.find_elements(By.XPATH, "//a[@class='k7wcnx']//div[@class='col col-5-12 mao5dl']/div[1]")
+    product_price = page.find_elements(By.XPATH, "//a[@class='k7wcnx']//div[@class='col col-5-12 mao5dl']/div[1]")
 
     product_details = {}
     for i in range(len(product_name)):
@@ -71,9 +72,8 @@ def test_product_price():
     
     '''
 
-def test_table():
-    driver = webdriver.Chrome()
-    driver.maximize_window()
+def test_table(chrome_driver):
+    driver = chrome_driver
     driver.get("https://www.booking.com/index.en-gb.html")
     time.sleep(5)
     driver.find_element(By.XPATH, "//button[@data-testid='searchbox-dates-container']").click()
@@ -88,7 +88,7 @@ def test_table():
     date.click()
     time.sleep(10)
 
-def test_demo():
-    driver = webdriver.Firefox()
+def test_demo(firefox_driver):
+    driver = firefox_driver
     driver.get("https://admin-demo.nopcommerce.com/")
     time.sleep(10)
\ No newline at end of file
@@ -0,0 +1,106 @@
+'''
+Browser pool
+------------
+starting chrome / firefox is the slowest part of every test,
+so we start the drivers once per worker (session) and lease
+one driver to each test.
+
+after the test the driver is reset instead of quit. the reset
+must clear the cookies and the storage of every site the test
+visited, not only the one of the last page, so it uses BiDi
+user contexts (a user context is like a private window: its own
+cookies, storage and cache):
+    open a new tab in a new user context and switch to it
+    remove the user contexts of the previous tests (closes their tabs)
+    close the tabs left in the default user context
+
+the drivers need BiDi (options.web_socket_url = True), a driver
+without it cannot be reset and is quit after the test.
+
+if the reset fails the driver is thrown away and a new one
+is started the next time it is needed.
+'''
+import queue
+import threading
+
+from selenium.common import WebDriverException
+
+
+def reset_driver(driver):
+    if not driver.caps.get("webSocketUrl"):
+        raise WebDriverException("The browser pool needs BiDi (web_socket_url) to reset a driver")
+
+    # the new user context must accept the self signed certificate of the site archive too
+    user_context = driver.browser.create_user_context(
+        accept_insecure_certs=driver.caps.get("acceptInsecureCerts") or None)
+    tab = driver.browsing_context.create("tab", user_context=user_context)
+    driver.switch_to.window(tab)
+    # chrome opens the tab of a new user context in a new window
+    driver.maximize_window()
+
+    for previous in driver.browser.get_user_contexts():
+        if previous not in ("default", user_context):
+            driver.browser.remove_user_context(previous)
+    for handle in driver.window_handles:
+        if handle != tab:
+            driver.browsing_context.close(handle)
+
+
+class BrowserPool:
+
+    def __init__(self, factory, size=1):
+        self.factory = factory
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._drivers = []
+        self._lock = threading.Lock()
+
+    def start(self):
+        # pre spawn the drivers, the cost is paid once per worker
+        for _ in range(self.size - len(self._drivers)):
+            self._idle.put(self._spawn())
+        return self
+
+    def _spawn(self):
+        driver = self.factory()
+        with self._lock:
+            self._drivers.append(driver)
+        return driver
+
+    def _discard(self, driver):
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._spawn()
+
+    def release(self, driver):
+        try:
+            reset_driver(driver)
+        except WebDriverException:
+            # browser crashed or hung, do not give it to the next test
+            self._discard(driver)
+            return
+        if self._idle.qsize() >= self.size:
+            self._discard(driver)
+        else:
+            self._idle.put(driver)
+
+    def close(self):
+        while not self._idle.empty():
+            self._idle.get_nowait()
+        with self._lock:
+            drivers, self._drivers = self._drivers, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except WebDriverException:
+                pass
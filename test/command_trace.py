@@ -0,0 +1,49 @@
+'''
+Command trace
+-------------
+where does the time of a test go: the browser, the network, or selenium
+itself (json encoding / decoding, wrapping the elements ...)?
+
+--trace-commands=dir
+    record a span for every webdriver command of every test, with child
+    spans for the json encoding, the http round trip, the json decoding
+    and the element unwrapping, and write them per test in dir:
+        <test>.json     chrome trace events, open in chrome://tracing
+                        or https://ui.perfetto.dev
+        <test>.folded   folded stacks (microseconds), for flamegraph.pl
+                        or https://www.speedscope.app
+    the command spans have the request / response sizes and the time
+    spent waiting for the server (server_ms) vs in the client (client_ms).
+
+the commands sent while no test runs (starting the browsers of the pool)
+are not written.
+'''
+import os
+import re
+
+from selenium.webdriver.remote.tracing import tracer
+
+
+class CommandTracer:
+
+    def __init__(self, config):
+        self.directory = config.getoption("--trace-commands")
+
+    def pytest_sessionstart(self, session):
+        os.makedirs(self.directory, exist_ok=True)
+        tracer.start()
+
+    def pytest_sessionfinish(self, session):
+        tracer.stop()
+        tracer.clear()
+
+    def pytest_runtest_protocol(self, item, nextitem):
+        tracer.clear()
+
+    def pytest_runtest_logfinish(self, nodeid, location):
+        spans = tracer.clear()
+        if not spans:
+            return
+        name = os.path.join(self.directory, re.sub(r"[^\w.-]+", "_", nodeid))
+        tracer.export_chrome_trace(name + ".json", spans)
+        tracer.export_folded(name + ".folded", spans)
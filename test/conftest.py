@@ -1,30 +1,172 @@
+import argparse
+import os
+
 import pytest
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.firefox.options import Options as firefox_options
 
-@pytest.fixture
-def start_browser():
+from .browser_pool import BrowserPool
+from .command_trace import CommandTracer
+from .locator_optimizer import LocatorOptimizer
+from .locator_profile import LocatorProfiler
+from .parallel import ShardScheduler
+from .site_archive import ArchiveProxy
+from .sleep_audit import SleepAuditor
+
+
+def pytest_addoption(parser):
+    parser.addoption("--browser-pool-size", action="store", type=int, default=1,
+                     help="Number of browsers started up front for each worker")
+    parser.addoption("--workers", action="store", type=int, default=1,
+                     help="Run the tests in this many parallel pytest processes")
+    parser.addoption("--num-shards", action="store", type=int, default=1,
+                     help="Split the suite in this many shards (one per CI node)")
+    parser.addoption("--shard-id", action="store", type=int, default=0,
+                     help="Shard to run on this node, from 0 to --num-shards - 1")
+    parser.addoption("--durations-file", action="store", default=None,
+                     help="Json file of the test durations shared by all the CI nodes (committed or downloaded), "
+                          "updated after the run")
+    parser.addoption("--worker", action="store", default=None,
+                     help=argparse.SUPPRESS)
+    parser.addoption("--worker-results", action="store", default=None,
+                     help=argparse.SUPPRESS)
+    parser.addoption("--replace-sleeps", action="store_true", default=False,
+                     help="Replace time.sleep in tests with a wait until the page is settled")
+    parser.addoption("--settle-quiet-ms", action="store", type=int, default=500,
+                     help="No DOM changes for this many milliseconds means the page is settled")
+    parser.addoption("--sleep-audit-top", action="store", type=int, default=10,
+                     help="Number of tests shown in the time.sleep audit")
+    parser.addoption("--site-mode", action="store", default="live", choices=("live", "record", "replay"),
+                     help="live: use the real sites, record: save the responses, replay: use only the saved responses")
+    parser.addoption("--site-archive", action="store", default=os.path.join(os.path.dirname(__file__), "archive"),
+                     help="Directory of the recorded site archive")
+    parser.addoption("--profile-locators", action="store_true", default=False,
+                     help="Measure every find_element / find_elements call and report the slowest locators")
+    parser.addoption("--locator-report", action="store", default=None,
+                     help="Write the full locator profile to this json file")
+    parser.addoption("--locator-report-top", action="store", type=int, default=10,
+                     help="Number of locators shown in the locator profile")
+    parser.addoption("--learn-locators", action="store_true", default=False,
+                     help="Find faster css / id equivalents of the xpaths used by the tests and save them")
+    parser.addoption("--rewrite-locators", action="store_true", default=False,
+                     help="Use the saved faster equivalents of the xpaths")
+    parser.addoption("--locator-cache", action="store",
+                     default=os.path.join(os.path.dirname(__file__), "locator_rewrites.json"),
+                     help="File of the xpath rewrites")
+    parser.addoption("--trace-commands", action="store", default=None,
+                     help="Write a trace of the webdriver commands of every test to this directory")
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(ShardScheduler(config), "shard_scheduler")
+    config.pluginmanager.register(SleepAuditor(config), "sleep_auditor")
+    if config.getoption("--profile-locators") or config.getoption("--locator-report"):
+        config.pluginmanager.register(LocatorProfiler(config), "locator_profiler")
+    if config.getoption("--learn-locators") or config.getoption("--rewrite-locators"):
+        config.pluginmanager.register(LocatorOptimizer(config), "locator_optimizer")
+    if config.getoption("--trace-commands"):
+        config.pluginmanager.register(CommandTracer(config), "command_tracer")
+
+
+def new_chrome(site_proxy=None):
     options = Options()
     #options.add_argument("--headless=new")
-
+    # BiDi, for the window events of driver.window_tracker
+    options.web_socket_url = True
+    if site_proxy:
+        site_proxy.apply(options)
     driver = webdriver.Chrome(options=options)
-    driver.get("https://www.facebook.com")
     driver.maximize_window()
     return driver
 
-@pytest.fixture
-def start_ohrms():
-    driver = webdriver.Chrome()
-    driver.get("https://opensource-demo.orangehrmlive.com/web/index.php/auth/login")
+
+def new_firefox(site_proxy=None):
+    options = firefox_options()
+    # BiDi, the browser pool resets the driver with a new user context
+    options.web_socket_url = True
+    if site_proxy:
+        site_proxy.apply(options)
+    driver = webdriver.Firefox(options)
     driver.maximize_window()
     return driver
 
-@pytest.fixture
-def launch_thandhi():
+
+def new_headless_firefox(site_proxy=None):
     options = firefox_options()
     options.add_argument("--headless")
+    # BiDi, used to search all the frames of a page at once
+    options.web_socket_url = True
+    if site_proxy:
+        site_proxy.apply(options)
     driver = webdriver.Firefox(options)
-    driver.get("https://www.dailythanthi.com/")
     driver.maximize_window()
-    return driver
\ No newline at end of file
+    return driver
+
+
+# local record / replay proxy, None when the tests use the live sites
+@pytest.fixture(scope="session")
+def site_proxy(request):
+    mode = request.config.getoption("--site-mode")
+    if mode == "live":
+        yield None
+        return
+    proxy = ArchiveProxy(request.config.getoption("--site-archive"), mode).start()
+    yield proxy
+    proxy.stop()
+
+
+# one pool per browser type, started once per session (per worker)
+@pytest.fixture(scope="session")
+def chrome_pool(request, site_proxy):
+    pool = BrowserPool(lambda: new_chrome(site_proxy), request.config.getoption("--browser-pool-size")).start()
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope="session")
+def firefox_pool(request, site_proxy):
+    pool = BrowserPool(lambda: new_firefox(site_proxy), request.config.getoption("--browser-pool-size")).start()
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope="session")
+def headless_firefox_pool(request, site_proxy):
+    pool = BrowserPool(lambda: new_headless_firefox(site_proxy), request.config.getoption("--browser-pool-size")).start()
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def chrome_driver(chrome_pool):
+    driver = chrome_pool.acquire()
+    yield driver
+    chrome_pool.release(driver)
+
+
+@pytest.fixture
+def firefox_driver(firefox_pool):
+    driver = firefox_pool.acquire()
+    yield driver
+    firefox_pool.release(driver)
+
+
+@pytest.fixture
+def start_browser(chrome_driver):
+    driver = chrome_driver
+    driver.get("https://www.facebook.com")
+    return driver
+
+@pytest.fixture
+def start_ohrms(chrome_driver):
+    driver = chrome_driver
+    driver.get("https://opensource-demo.orangehrmlive.com/web/index.php/auth/login")
+    return driver
+
+@pytest.fixture
+def launch_thandhi(headless_firefox_pool):
+    driver = headless_firefox_pool.acquire()
+    driver.get("https://www.dailythanthi.com/")
+    yield driver
+    headless_firefox_pool.release(driver)
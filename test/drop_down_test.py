@@ -19,7 +19,9 @@ def test_drop_down(start_browser):
     year = driver.find_element(By.XPATH, "//select[@name='birthday_year']")
     s3 = Select(year)
     s3.select_by_visible_text("1995")
-    years = s3.options
+    # value, text, index, selected state of all the options in one call
+    # (s3.options + ye.text is one call per option)
+    years = s3.option_data
     for ye in years:
         print(ye.text)
 
@@ -30,4 +32,4 @@ def test_drop_down(start_browser):
     print(years[len(years)-1].text)
 
     #print selected option
-    print(s3.first_selected_option.text)
+    print([ye.text for ye in years if ye.selected][0])
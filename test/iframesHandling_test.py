@@ -1,26 +1,30 @@
 import time
 
-from selenium.common import NoSuchElementException, ElementNotInteractableException
+from selenium.common import ElementNotInteractableException
 from selenium.webdriver import Keys
 from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.frames import switch_to_frame
 
 
 def test_iframe(launch_thandhi):
     driver=launch_thandhi
     time.sleep(20)
-    all_frames = driver.find_elements(By.XPATH, "//iframe[@title='3rd party ad content']")
-    for frame in all_frames:
-        driver.switch_to.frame(frame)
+    # the links of every frame (nested ones too) in one go, no switch_to.frame per frame
+    links = driver.find_elements_in_frames(By.TAG_NAME, "a", attributes=["href"])
+    ad_frames = [frame for frame in driver.get_frames() if frame.title == '3rd party ad content']
+    for frame in ad_frames:
+        frame_links = [link for link in links if link.frame and link.frame.context == frame.context]
+        if not frame_links:
+            print("There is no link in the frame")
+            continue
+        # only switch to click
+        switch_to_frame(driver, frame)
         try:
-            try:
-                driver.find_element(By.TAG_NAME, "a").click()
-            except ElementNotInteractableException as e:
-                # keys enumeration
-                driver.find_element(By.TAG_NAME, "html").send_keys(Keys.PAGE_DOWN)
-            driver.switch_to.default_content()
-        except NoSuchElementException as e:
-            print("There is link in the frame")
-            driver.switch_to.default_content()
+            frame_links[0].element.click()
+        except ElementNotInteractableException as e:
+            # keys enumeration
+            driver.find_element(By.TAG_NAME, "html").send_keys(Keys.PAGE_DOWN)
+        driver.switch_to.default_content()
 
 
 '''
@@ -31,4 +35,3 @@ you can switch to the tab
 get title of the tab
 and close the tab
 '''
-
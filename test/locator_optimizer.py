@@ -0,0 +1,382 @@
+'''
+Locator optimizer
+-----------------
+a lot of our locators are xpaths ("//input[@name='q']", "/html/body/div/...")
+that have a cheaper css / id equivalent.
+
+for a locator and a page (the live page of the driver, or a saved html
+snapshot) the optimizer:
+    finds the element(s) of the locator
+    builds candidate selectors for them: id, name / data-test attributes,
+        tag + classes, path from the nearest ancestor with an id
+    keeps the candidates that match the same element(s)
+        (find_element: the same first element, find_elements: the same list)
+    times every candidate and the original locator in the browser
+    proposes the fastest stable candidate (id, attributes, classes, not the
+    paths, they break when the page layout changes)
+
+everything runs in one execute_script per locator.
+
+--learn-locators
+    propose a rewrite for every xpath used by driver.find_element(s) during
+    the run and save them in the rewrite cache (--locator-cache).
+--rewrite-locators
+    use the rewrites of the cache: driver.find_element(s) with a cached xpath
+    uses the faster selector, checked in the browser in the same call:
+        the page (url without query / fragment of the document the locator
+        runs in, the frame's own one inside a frame) must be one the rewrite
+        was learnt on
+        find_element: the selector must match exactly one element
+        find_elements: the selector must match something
+    on the other pages the xpath is evaluated by the same call.
+    when the selector matches nothing and the xpath nothing either, the
+    element is not rendered yet: the original find_element(s) runs (and
+    waits) as usual. a rewrite matching several elements, or nothing where
+    the xpath matches something, no longer fits its page and is dropped
+    from the cache.
+
+only candidates matching the same element(s) as the xpath, and (for
+find_element) nothing else, are learnt. the rewrites are kept per locator
+and per page: a locator learnt with different rewrites on the same page is
+not rewritten on that page.
+'''
+import json
+import os
+from urllib.parse import urlsplit
+
+import pytest
+from selenium.common import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+OPTIMIZE_SCRIPT = """
+var using = arguments[0], value = arguments[1], many = arguments[2], runs = arguments[3], seen = arguments[4];
+
+// the page of this document, the frame's own one inside a frame
+var page = location.protocol + '//' + location.host + location.pathname;
+if (seen.indexOf(page) !== -1) return {page: page, seen: true};
+
+function findAll(using, value) {
+    if (using === 'xpath') {
+        var result = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        var found = [];
+        for (var i = 0; i < result.snapshotLength; i++) {
+            if (result.snapshotItem(i).nodeType === 1) found.push(result.snapshotItem(i));
+        }
+        return found;
+    }
+    if (using === 'id') return Array.from(document.querySelectorAll('#' + CSS.escape(value)));
+    if (using === 'name') return Array.from(document.getElementsByName(value));
+    return Array.from(document.querySelectorAll(value));
+}
+
+function findFirst(using, value) {
+    if (using === 'xpath') {
+        return document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    if (using === 'id') return document.getElementById(value);
+    return document.querySelector(value);
+}
+
+var original = findAll(using, value);
+if (!original.length) return {page: page, candidates: null};
+
+// ids and classes that look generated (long numbers, hashes) change between builds
+function stable(token) {
+    return token.length < 40 && !/\\d{4,}/.test(token) && !/[0-9a-f]{8,}/i.test(token) && !/^(css|sc|jsx)-/.test(token);
+}
+
+function attributes(element) {
+    var tag = element.tagName.toLowerCase(), selectors = [];
+    ['data-testid', 'data-test', 'data-qa', 'name', 'aria-label', 'placeholder', 'title', 'type'].forEach(function (name) {
+        var attribute = element.getAttribute(name);
+        if (attribute && attribute.length < 80) selectors.push(tag + '[' + name + '="' + CSS.escape(attribute) + '"]');
+    });
+    return selectors;
+}
+
+function classes(element) {
+    var tag = element.tagName.toLowerCase();
+    var names = Array.from(element.classList).filter(stable).map(function (name) { return '.' + CSS.escape(name); });
+    var selectors = names.map(function (name) { return tag + name; });
+    if (names.length > 1) selectors.push(tag + names.join(''));
+    return selectors;
+}
+
+function path(element) {
+    var steps = [];
+    while (element && element.nodeType === 1 && element !== document.documentElement) {
+        if (element.id && stable(element.id) && document.querySelectorAll('#' + CSS.escape(element.id)).length === 1) {
+            steps.unshift('#' + CSS.escape(element.id));
+            return steps.join(' > ');
+        }
+        var index = 1, sibling = element;
+        while ((sibling = sibling.previousElementSibling)) {
+            if (sibling.tagName === element.tagName) index++;
+        }
+        steps.unshift(element.tagName.toLowerCase() + ':nth-of-type(' + index + ')');
+        element = element.parentElement;
+    }
+    return null;
+}
+
+function common(lists) {
+    return lists[0].filter(function (selector) {
+        return lists.every(function (list) { return list.indexOf(selector) !== -1; });
+    });
+}
+
+var candidates = [];
+function add(by, selector, stability) {
+    if (selector && !candidates.some(function (c) { return c.value === selector; })) {
+        candidates.push({by: by, value: selector, stability: stability});
+    }
+}
+
+if (many) {
+    common(original.map(attributes)).forEach(function (s) { add('css selector', s, 1); });
+    common(original.map(classes)).forEach(function (s) { add('css selector', s, 2); });
+} else {
+    var target = original[0];
+    if (target.id && stable(target.id)) add('id', target.id, 0);
+    attributes(target).forEach(function (s) { add('css selector', s, 1); });
+    classes(target).forEach(function (s) { add('css selector', s, 2); });
+    add('css selector', path(target), 3);
+}
+
+function equivalent(candidate) {
+    var found;
+    try {
+        found = findAll(candidate.by, candidate.value);
+    } catch (e) {
+        return false;
+    }
+    candidate.unique = found.length === 1;
+    if (!many) return found[0] === original[0];
+    return found.length === original.length && found.every(function (element, i) { return element === original[i]; });
+}
+
+function time(using, value) {
+    var start = performance.now();
+    for (var i = 0; i < runs; i++) {
+        if (many) findAll(using, value); else findFirst(using, value);
+    }
+    return (performance.now() - start) * 1000 / runs;
+}
+
+var matching = candidates.filter(equivalent);
+matching.forEach(function (candidate) { candidate.micros = time(candidate.by, candidate.value); });
+return {page: page, micros: time(using, value), candidates: matching};
+"""
+
+# uses a rewrite when the page of the document is one it was learnt on and it
+# matches like the original, the status tells what was found:
+#   rewrite     the elements of the rewrite
+#   xpath       no rewrite for the page, the elements of the xpath
+#   missing     neither the rewrite nor the xpath match anything (yet)
+#   mismatch    the rewrite matches several elements, or nothing where the xpath matches
+REWRITE_SCRIPT = """
+var rewrites = arguments[0], xpath = arguments[1], many = arguments[2];
+var page = location.protocol + '//' + location.host + location.pathname;
+
+// the elements of the xpath, null when it selects other nodes (left to the driver)
+function byXpath() {
+    var result = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    var found = [];
+    for (var i = 0; i < result.snapshotLength; i++) {
+        if (result.snapshotItem(i).nodeType !== 1) return null;
+        found.push(result.snapshotItem(i));
+    }
+    return found;
+}
+
+var rewrite = rewrites[page], elements;
+if (!rewrite) {
+    elements = byXpath();
+    return elements && elements.length ? {page: page, status: 'xpath', elements: elements} : {page: page, status: 'missing'};
+}
+var found;
+if (rewrite.by === 'id') {
+    found = Array.from(document.querySelectorAll('#' + CSS.escape(rewrite.value)));
+} else {
+    found = Array.from(document.querySelectorAll(rewrite.value));
+}
+if (!found.length) {
+    elements = byXpath();
+    return {page: page, status: elements === null || elements.length ? 'mismatch' : 'missing'};
+}
+if (!many && found.length > 1) return {page: page, status: 'mismatch'};
+return {page: page, status: 'rewrite', elements: found};
+"""
+
+# candidates ranked by stability: 0 id, 1 attributes, 2 classes, 3 nth-of-type path
+STABLE = 2
+
+
+def page_key(url):
+    """the page of a url, without query and fragment, as the scripts compute it"""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}{parts.path}"
+
+
+def best_candidate(result, many):
+    """best rewrite of an OPTIMIZE_SCRIPT result, None when there is no faster stable one"""
+    # find_element: a selector matching other elements too could return one of
+    # them when the page changes, keep the unique ones only
+    stable = [candidate for candidate in result["candidates"]
+              if candidate["stability"] <= STABLE and (many or candidate["unique"])]
+    if not stable:
+        return None
+    # fastest, more stable ones first when the times are close
+    best = min(stable, key=lambda c: (round(c["micros"], 1), c["stability"]))
+    if best["micros"] >= result["micros"]:
+        return None
+    return {"by": best["by"], "value": best["value"], "micros": best["micros"],
+            "original_micros": result["micros"], "candidates": result["candidates"]}
+
+
+def propose(driver, by, value, many=False, runs=50):
+    """best rewrite of a locator on the current page, None when there is no faster stable one"""
+    result = driver.execute_script(OPTIMIZE_SCRIPT, by, value, many, runs, [])
+    if result["candidates"] is None:
+        return None
+    return best_candidate(result, many)
+
+
+def propose_for_snapshot(driver, html, locators, runs=50):
+    """proposals for (by, value, many) locators on a saved html page, the page is loaded in the driver"""
+    driver.get("about:blank")
+    driver.execute_script("document.open(); document.write(arguments[0]); document.close();", html)
+    return {(by, value): propose(driver, by, value, many, runs) for by, value, many in locators}
+
+
+class LocatorRewriteCache:
+
+    def __init__(self, path):
+        self.path = path
+        # "one|by|value" (find_element) / "many|by|value" -> page -> {"by", "value"},
+        # or None when the locator must not be rewritten on that page
+        self.rewrites = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                saved = json.load(f)
+            # entries of the older format (one rewrite for all the pages) are learnt again
+            self.rewrites = {key: pages for key, pages in saved.items()
+                             if isinstance(pages, dict) and "by" not in pages}
+        self.changed = False
+
+    @staticmethod
+    def key(by, value, many):
+        return f"{'many' if many else 'one'}|{by}|{value}"
+
+    def get(self, by, value, many):
+        """page -> rewrite of a locator, only the pages it can be rewritten on"""
+        pages = self.rewrites.get(self.key(by, value, many)) or {}
+        return {page: rewrite for page, rewrite in pages.items() if rewrite}
+
+    def learn(self, by, value, many, page, proposal):
+        pages = self.rewrites.setdefault(self.key(by, value, many), {})
+        rewrite = None if proposal is None else {"by": proposal["by"], "value": proposal["value"]}
+        if page in pages:
+            known = pages[page]
+            if known is None:
+                return
+            if rewrite and (known["by"], known["value"]) == (rewrite["by"], rewrite["value"]):
+                return
+            # the same page needs different selectors (different states of the page)
+            rewrite = None
+        pages[page] = rewrite
+        self.changed = True
+
+    def drop(self, by, value, many, page):
+        self.rewrites.setdefault(self.key(by, value, many), {})[page] = None
+        self.changed = True
+
+    def save(self):
+        if self.changed:
+            with open(self.path + ".tmp", "w") as f:
+                json.dump(self.rewrites, f, indent=2, sort_keys=True)
+            os.replace(self.path + ".tmp", self.path)
+
+
+class LocatorOptimizer:
+
+    def __init__(self, config):
+        self.config = config
+        self.learn = config.getoption("--learn-locators")
+        self.cache = LocatorRewriteCache(config.getoption("--locator-cache"))
+        self.originals = {}
+        # (by, value, many) -> pages learnt in this run
+        self.seen = {}
+        self.rewritten = 0
+
+    def find(self, original, driver, by, value, many):
+        if by != "xpath":
+            return original(driver, by, value)
+
+        if self.learn:
+            try:
+                self.learn_rewrite(driver, by, value, many)
+            except WebDriverException:
+                pass
+            return original(driver, by, value)
+
+        pages = self.cache.get(by, value, many)
+        if not pages:
+            return original(driver, by, value)
+        try:
+            result = driver.execute_script(REWRITE_SCRIPT, pages, value, many)
+        except WebDriverException:
+            result = None
+        if result is None or result["status"] == "missing":
+            # left to the driver: errors, implicit waits, elements not rendered yet
+            return original(driver, by, value)
+        if result["status"] == "mismatch":
+            # the rewrite no longer matches like the xpath on its page
+            self.cache.drop(by, value, many, result["page"])
+            return original(driver, by, value)
+        if result["status"] == "rewrite":
+            self.rewritten += 1
+        return result["elements"] if many else result["elements"][0]
+
+    def learn_rewrite(self, driver, by, value, many):
+        # the pages already learnt are skipped in the browser, without timing the candidates again
+        seen = self.seen.setdefault((by, value, many), set())
+        result = driver.execute_script(OPTIMIZE_SCRIPT, by, value, many, 50, sorted(seen))
+        if result.get("seen") or result["candidates"] is None:
+            # nothing to learn when the xpath does not match (yet)
+            return
+        seen.add(result["page"])
+        self.cache.learn(by, value, many, result["page"], best_candidate(result, many))
+
+    def wrap(self, name, many):
+        original = self.originals[name] = getattr(WebDriver, name)
+        optimizer = self
+
+        def find(driver, by="id", value=None):
+            return optimizer.find(original, driver, by, value, many)
+
+        setattr(WebDriver, name, find)
+
+    def pytest_sessionstart(self, session):
+        self.wrap("find_element", many=False)
+        self.wrap("find_elements", many=True)
+
+    # after the other plugins wrapping find_element, so each one restores what it wrapped
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session):
+        for name, original in self.originals.items():
+            setattr(WebDriver, name, original)
+        self.originals = {}
+        self.cache.save()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.learn:
+            rewrites = [(key, page, rewrite) for key, pages in self.cache.rewrites.items()
+                        for page, rewrite in pages.items() if rewrite]
+            terminalreporter.write_sep("=", "locator rewrites")
+            for key, page, rewrite in sorted(rewrites, key=lambda entry: entry[:2]):
+                terminalreporter.write_line(
+                    f"{key.split('|', 2)[2]}  ->  {rewrite['by']}: {rewrite['value']}  ({page})")
+            terminalreporter.write_line(f"{len(rewrites)} rewrites saved in {self.cache.path}")
+        elif self.rewritten:
+            terminalreporter.write_line(f"{self.rewritten} find_element(s) calls used a rewritten locator")
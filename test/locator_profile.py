@@ -0,0 +1,166 @@
+'''
+Locator profile
+---------------
+every find_element / find_elements call is a round trip to the browser,
+and some locators are much slower than others (long absolute xpaths,
+contains() on the whole page ...).
+
+--profile-locators
+    measure every find_element / find_elements (driver and element) call:
+    strategy (id, css selector, xpath ...), locator, time, number of
+    matching elements, per test.
+    at the end of the run the slowest locators (total time) and the most
+    used ones are printed, with the place in the test code where they are
+    used.
+
+--locator-report=path
+    also write the full profile (every locator, every test) as json.
+
+a find_element that finds nothing counts as 0 matches, waits that poll a
+missing element show up as a lot of calls.
+'''
+import json
+import sys
+import time
+
+from selenium.common import NoSuchElementException
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+
+
+class LocatorStats:
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.slowest = 0.0
+        self.matches = 0
+        self.misses = 0
+
+    def add(self, seconds, matches):
+        self.calls += 1
+        self.total += seconds
+        self.slowest = max(self.slowest, seconds)
+        self.matches += matches
+        if not matches:
+            self.misses += 1
+
+    def merge(self, other):
+        self.calls += other.calls
+        self.total += other.total
+        self.slowest = max(self.slowest, other.slowest)
+        self.matches += other.matches
+        self.misses += other.misses
+
+    def as_dict(self):
+        return {"calls": self.calls, "total": self.total, "mean": self.total / self.calls,
+                "slowest": self.slowest, "matches": self.matches, "misses": self.misses}
+
+
+class LocatorProfiler:
+
+    def __init__(self, config):
+        self.config = config
+        self.root = str(config.rootpath)
+        # nodeid -> (strategy, locator) -> LocatorStats
+        self.tests = {}
+        # (strategy, locator) -> "file:line" of the first call from the test code
+        self.places = {}
+        self.nodeid = None
+        self.originals = {}
+        # find_element with a relative locator calls find_elements, count it once
+        self.active = False
+
+    def is_suite_code(self, filename):
+        return filename.startswith(self.root) and "site-packages" not in filename and filename != __file__
+
+    def place(self):
+        frame = sys._getframe(2)
+        while frame is not None:
+            if self.is_suite_code(frame.f_code.co_filename):
+                return f"{frame.f_code.co_filename[len(self.root) + 1:]}:{frame.f_lineno}"
+            frame = frame.f_back
+        return "-"
+
+    def record(self, by, value, seconds, matches):
+        # relative locators are not (strategy, value) pairs
+        key = (by, value) if isinstance(by, str) else ("relative", repr(by))
+        if key not in self.places:
+            self.places[key] = self.place()
+        test = self.tests.setdefault(self.nodeid or "(outside tests)", {})
+        test.setdefault(key, LocatorStats()).add(seconds, matches)
+
+    def wrap(self, cls, name, many):
+        original = self.originals[(cls, name)] = getattr(cls, name)
+        profiler = self
+
+        def find(element, by="id", value=None):
+            if profiler.active:
+                return original(element, by, value)
+            profiler.active = True
+            start = time.perf_counter()
+            try:
+                result = original(element, by, value)
+            except NoSuchElementException:
+                profiler.record(by, value, time.perf_counter() - start, 0)
+                raise
+            finally:
+                profiler.active = False
+            profiler.record(by, value, time.perf_counter() - start, len(result) if many else 1)
+            return result
+
+        setattr(cls, name, find)
+
+    def pytest_sessionstart(self, session):
+        for cls in (WebDriver, WebElement):
+            self.wrap(cls, "find_element", many=False)
+            self.wrap(cls, "find_elements", many=True)
+
+    def pytest_sessionfinish(self, session):
+        for (cls, name), original in self.originals.items():
+            setattr(cls, name, original)
+        self.originals = {}
+
+        report = self.config.getoption("--locator-report")
+        if report:
+            with open(report, "w") as f:
+                json.dump(self.as_dict(), f, indent=2)
+
+    def pytest_runtest_protocol(self, item, nextitem):
+        self.nodeid = item.nodeid
+
+    def pytest_runtest_logfinish(self, nodeid, location):
+        self.nodeid = None
+
+    def totals(self):
+        totals = {}
+        for locators in self.tests.values():
+            for key, stats in locators.items():
+                totals.setdefault(key, LocatorStats()).merge(stats)
+        return totals
+
+    def as_dict(self):
+        return {
+            "locators": [{"strategy": by, "locator": value, "place": self.places[(by, value)], **stats.as_dict()}
+                         for (by, value), stats in sorted(self.totals().items(), key=lambda entry: -entry[1].total)],
+            "tests": {nodeid: [{"strategy": by, "locator": value, **stats.as_dict()}
+                               for (by, value), stats in locators.items()]
+                      for nodeid, locators in self.tests.items()},
+        }
+
+    def pytest_terminal_summary(self, terminalreporter):
+        totals = self.totals()
+        if not totals:
+            return
+        top = self.config.getoption("--locator-report-top")
+
+        def write(title, key):
+            terminalreporter.write_sep("-", title)
+            for (by, value), stats in sorted(totals.items(), key=key)[:top]:
+                terminalreporter.write_line(
+                    f"{stats.total:8.3f}s total {stats.total / stats.calls * 1000:8.1f}ms mean {stats.calls:5d} calls "
+                    f"{stats.misses:4d} misses  {by}: {value}  ({self.places[(by, value)]})")
+
+        terminalreporter.write_sep("=", "locator profile")
+        write("slowest locators (total time)", lambda entry: -entry[1].total)
+        write("most used locators", lambda entry: (-entry[1].calls, -entry[1].total))
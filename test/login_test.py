@@ -1,11 +1,10 @@
 import time
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 
 
-def test_login():
-    driver = webdriver.Firefox()
+def test_login(firefox_driver):
+    driver = firefox_driver
 
     driver.get("https://opensource-demo.orangehrmlive.com/web/index.php/auth/login")
     time.sleep(10)
@@ -34,8 +33,8 @@ def test_login():
         raise Exception("We are not in dashboard")
 
 
-def test_login_with_invalid_cred():
-    driver = webdriver.Firefox()
+def test_login_with_invalid_cred(firefox_driver):
+    driver = firefox_driver
 
     driver.get("https://opensource-demo.orangehrmlive.com/web/index.php/auth/login")
     time.sleep(10)
@@ -49,8 +48,8 @@ def test_login_with_invalid_cred():
     assert True != driver.find_element(By.XPATH, "//p[text()='Invalid credentials']").is_displayed(), "Didn't get the Error message"
 
 
-def test_extract_test():
-    driver = webdriver.Firefox()
+def test_extract_test(firefox_driver):
+    driver = firefox_driver
     driver.get("https://facebook.com")
     text =driver.find_element(By.TAG_NAME, "html").text
     print(text)
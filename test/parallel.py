@@ -0,0 +1,175 @@
+'''
+Parallel / sharded test run
+---------------------------
+every test is mostly waiting for the browser, so the suite can be
+split and run at the same time.
+
+--num-shards=N --shard-id=I
+    split the suite in N shards and run only shard I (0 based),
+    used to spread the suite over several CI nodes.
+
+--workers=N
+    run the (shard of the) suite in N pytest processes on this machine,
+    every worker has its own browser pool (see browser_pool.py).
+    the workers write their results in their own checkpoint segment of
+    the html report, the main process merges them into one report.
+
+--durations-file=path
+    json file of the test durations ({nodeid: seconds}) that every node
+    reads, committed in the repo or downloaded by the CI job. it is
+    updated with the durations of the run at the end.
+
+the split uses the durations of the previous runs: longest test first,
+each test goes to the shard / worker with the smallest total so far.
+the split only depends on the test ids and the durations, so the nodes
+must read the same durations to compute the same shards:
+    shards      only the --durations-file, without it the tests are
+                dealt by test id (every node has the same ids)
+    workers     the --durations-file, else the pytest cache of the
+                machine (all the workers of a node share it)
+'''
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+DURATIONS_KEY = "parallel/durations"
+DEFAULT_DURATION = 1.0
+
+
+def expected_durations(nodeids, durations):
+    # unknown tests get the median of the known ones
+    known = sorted(durations[nodeid] for nodeid in nodeids if nodeid in durations)
+    default = known[len(known) // 2] if known else DEFAULT_DURATION
+    return {nodeid: durations.get(nodeid, default) for nodeid in nodeids}
+
+
+def partition(nodeids, durations, count):
+    costs = expected_durations(nodeids, durations)
+    buckets = [[] for _ in range(count)]
+    loads = [0.0] * count
+    for nodeid in sorted(nodeids, key=lambda nodeid: (-costs[nodeid], nodeid)):
+        index = min(range(count), key=lambda i: (loads[i], i))
+        buckets[index].append(nodeid)
+        loads[index] += costs[nodeid]
+    return buckets
+
+
+class ShardScheduler:
+
+    def __init__(self, config):
+        self.config = config
+        self.num_shards = config.getoption("--num-shards")
+        self.shard_id = config.getoption("--shard-id")
+        self.workers = config.getoption("--workers")
+        self.worker = config.getoption("--worker")
+        self.worker_results = config.getoption("--worker-results")
+        self.durations_file = config.getoption("--durations-file")
+        self.durations = {}
+        self.outcomes = {}
+        if not 0 <= self.shard_id < self.num_shards:
+            raise ValueError(f"--shard-id must be between 0 and {self.num_shards - 1}")
+
+    @property
+    def is_controller(self):
+        return self.workers > 1 and self.worker is None
+
+    def stored_durations(self):
+        cache = getattr(self.config, "cache", None)
+        if cache is None:
+            return {}
+        return cache.get(DURATIONS_KEY, {})
+
+    def shared_durations(self):
+        # durations every CI node reads, None when there are none
+        if self.durations_file is None or not os.path.exists(self.durations_file):
+            return None
+        with open(self.durations_file) as f:
+            return json.load(f)
+
+    def pytest_collection_modifyitems(self, config, items):
+        shared = self.shared_durations()
+        durations = self.stored_durations() if shared is None else shared
+        nodeids = [item.nodeid for item in items]
+
+        selected = set(nodeids)
+        if self.num_shards > 1:
+            # the pytest cache differs from node to node, never use it for the shards
+            selected = set(partition(nodeids, shared or {}, self.num_shards)[self.shard_id])
+        if self.worker is not None:
+            index, count = (int(part) for part in self.worker.split("/"))
+            selected = set(partition(sorted(selected), durations, count)[index])
+
+        deselected = [item for item in items if item.nodeid not in selected]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+
+        # longest first
+        costs = expected_durations(nodeids, durations)
+        items[:] = sorted((item for item in items if item.nodeid in selected),
+                          key=lambda item: -costs[item.nodeid])
+
+    def pytest_runtestloop(self, session):
+        if not self.is_controller or session.config.option.collectonly:
+            return None
+
+        invocation = self.config.invocation_params
+        results_dir = tempfile.mkdtemp(prefix="pytest-workers-")
+        processes = []
+        for index in range(self.workers):
+            results_file = os.path.join(results_dir, f"worker_{index}.json")
+            log_file = open(os.path.join(results_dir, f"worker_{index}.log"), "w+")
+            args = [sys.executable, "-m", "pytest", *invocation.args,
+                    f"--worker={index}/{self.workers}",
+                    f"--worker-results={results_file}"]
+            # the html report plugin writes the results of each worker in its own checkpoint segment
+            env = dict(os.environ, PYTEST_HTML_REPORT_WORKER=str(index))
+            run_id = getattr(session.config, "_checkpoint_run", None)
+            if run_id is not None:
+                env["PYTEST_HTML_REPORT_RUN"] = run_id
+            process = subprocess.Popen(args, cwd=str(invocation.dir), env=env,
+                                       stdout=log_file, stderr=subprocess.STDOUT)
+            processes.append((index, process, log_file, results_file))
+
+        for index, process, log_file, results_file in processes:
+            process.wait()
+            log_file.seek(0)
+            print(f"\n---------------- worker {index} ----------------")
+            print(log_file.read())
+            log_file.close()
+            if not os.path.exists(results_file):
+                # worker crashed before writing its results
+                session.testsfailed += 1
+                continue
+            with open(results_file) as f:
+                results = json.load(f)
+            self.durations.update(results["durations"])
+            session.testsfailed += sum(1 for outcome in results["outcomes"].values() if outcome == "failed")
+        return True
+
+    def pytest_runtest_logreport(self, report):
+        self.durations[report.nodeid] = self.durations.get(report.nodeid, 0.0) + report.duration
+        if report.failed:
+            self.outcomes[report.nodeid] = "failed"
+        else:
+            self.outcomes.setdefault(report.nodeid, report.outcome)
+
+    def pytest_sessionfinish(self, session):
+        if self.worker_results:
+            with open(self.worker_results, "w") as f:
+                json.dump({"durations": self.durations, "outcomes": self.outcomes}, f)
+            return
+
+        if not self.durations:
+            return
+        cache = getattr(self.config, "cache", None)
+        if cache is not None:
+            durations = self.stored_durations()
+            durations.update(self.durations)
+            cache.set(DURATIONS_KEY, durations)
+        if self.durations_file is not None:
+            durations = self.shared_durations() or {}
+            durations.update(self.durations)
+            with open(self.durations_file, "w") as f:
+                json.dump(durations, f, indent=2, sort_keys=True)
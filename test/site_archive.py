@@ -0,0 +1,247 @@
+'''
+Site archive (record / replay)
+------------------------------
+the tests use live sites (facebook, orangehrm demo, flipkart, booking,
+dailythanthi), so the speed of the suite depends on those sites and
+their ads.
+
+record
+    the browser goes through a local proxy, every response is sent to
+    the browser and saved in the archive.
+replay
+    the same proxy answers from the archive only, nothing goes to the
+    internet (requests that were not recorded get a 404).
+
+archive layout:
+    index.jsonl             one line per response: key, status, headers, body hash
+    blobs/ab/abcdef...      response bodies, stored by sha256 (same body is stored once)
+    cert.pem / key.pem      self signed certificate used for https
+
+https works by ending the tunnel (CONNECT) in the proxy with the self
+signed certificate, so the browser must run with acceptInsecureCerts.
+'''
+import hashlib
+import http.server
+import json
+import os
+import ssl
+import subprocess
+import tempfile
+import threading
+
+import urllib3
+from selenium.webdriver.common.proxy import Proxy
+
+HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization", "proxy-connection",
+    "te", "trailers", "transfer-encoding", "upgrade", "content-length",
+}
+
+
+def read_chunked(rfile):
+    """body of a request sent with Transfer-Encoding: chunked"""
+    chunks = []
+    while True:
+        line = rfile.readline()
+        if not line:
+            raise ValueError("Chunked request body ended early")
+        size = int(line.split(b";", 1)[0].strip(), 16)
+        if size == 0:
+            break
+        chunk = rfile.read(size)
+        if len(chunk) != size or rfile.readline() not in (b"\r\n", b"\n"):
+            raise ValueError("Invalid chunk in request body")
+        chunks.append(chunk)
+    # trailers, up to the empty line
+    while rfile.readline() not in (b"\r\n", b"\n", b""):
+        pass
+    return b"".join(chunks)
+
+
+def ensure_certificate(directory):
+    cert = os.path.join(directory, "cert.pem")
+    key = os.path.join(directory, "key.pem")
+    if not (os.path.exists(cert) and os.path.exists(key)):
+        try:
+            subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+                            "-keyout", key, "-out", cert, "-days", "3650", "-subj", "/CN=site-archive"],
+                           check=True, capture_output=True)
+        except (OSError, subprocess.CalledProcessError) as e:
+            raise RuntimeError(f"Could not create the https certificate for the site archive: {e}")
+    return cert, key
+
+
+class SiteArchive:
+
+    def __init__(self, path):
+        self.path = path
+        self.blobs = os.path.join(path, "blobs")
+        self.index_file = os.path.join(path, "index.jsonl")
+        os.makedirs(self.blobs, exist_ok=True)
+        self.entries = {}
+        self._lock = threading.Lock()
+        if os.path.exists(self.index_file):
+            with open(self.index_file, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        # later recordings win
+                        self.entries[entry["key"]] = entry
+
+    @staticmethod
+    def key(method, url, body=b""):
+        if not body:
+            return f"{method} {url}"
+        return f"{method} {url} {hashlib.sha256(body).hexdigest()}"
+
+    def blob_path(self, digest):
+        return os.path.join(self.blobs, digest[:2], digest)
+
+    def store(self, key, status, headers, body):
+        digest = hashlib.sha256(body).hexdigest()
+        blob = self.blob_path(digest)
+        if not os.path.exists(blob):
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            # one temporary file per writer: handler threads store the same body
+            # at the same time (empty 204 / 304 responses ...)
+            with tempfile.NamedTemporaryFile(dir=os.path.dirname(blob), delete=False) as f:
+                f.write(body)
+            try:
+                os.replace(f.name, blob)
+            except OSError:
+                # windows: another thread stored the same body and it is being read
+                os.remove(f.name)
+                if not os.path.exists(blob):
+                    raise
+
+        entry = {"key": key, "status": status, "headers": headers, "body": digest}
+        with self._lock:
+            self.entries[key] = entry
+            with open(self.index_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+
+    def lookup(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        with open(self.blob_path(entry["body"]), "rb") as f:
+            return entry["status"], entry["headers"], f.read()
+
+
+class ArchiveRequestHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    tunnel = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_CONNECT(self):
+        host, _, port = self.path.partition(":")
+        self.send_response(200, "Connection Established")
+        self.end_headers()
+
+        connection = self.server.ssl_context.wrap_socket(self.connection, server_side=True)
+        self.connection = connection
+        self.rfile = connection.makefile("rb", self.rbufsize)
+        self.wfile = connection.makefile("wb")
+        self.tunnel = f"https://{host}" if port in ("", "443") else f"https://{self.path}"
+        self.close_connection = False
+
+    def read_body(self):
+        if "chunked" in self.headers.get("Transfer-Encoding", "").lower():
+            return read_chunked(self.rfile)
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def handle_request(self):
+        try:
+            body = self.read_body()
+        except ValueError as e:
+            self.send_error(400, str(e))
+            self.close_connection = True
+            return
+        url = self.path if self.tunnel is None else self.tunnel + self.path
+        key = SiteArchive.key(self.command, url, body)
+
+        if self.server.mode == "record":
+            try:
+                status, headers, content = self.fetch(url, body)
+            except (urllib3.exceptions.HTTPError, OSError) as e:
+                # dns failure, refused connection, timeout: nothing is recorded
+                self.send_error(502, f"{type(e).__name__}: {e}")
+                return
+            self.server.archive.store(key, status, headers, content)
+        else:
+            response = self.server.archive.lookup(key)
+            if response is None:
+                self.server.misses.append(key)
+                response = 404, [], b""
+            status, headers, content = response
+
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(content)
+
+    def fetch(self, url, body):
+        headers = {name: value for name, value in self.headers.items()
+                   if name.lower() not in HOP_BY_HOP_HEADERS}
+        response = self.server.http.request(self.command, url, body=body or None, headers=headers,
+                                            redirect=False, retries=False,
+                                            preload_content=False, decode_content=False)
+        try:
+            content = response.read(decode_content=False)
+        finally:
+            response.release_conn()
+        headers = [[name, value] for name, value in response.headers.items()
+                   if name.lower() not in HOP_BY_HOP_HEADERS]
+        return response.status, headers, content
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = do_OPTIONS = handle_request
+
+
+class ArchiveProxy:
+
+    def __init__(self, path, mode="replay", port=0):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown site archive mode: {mode}")
+        self.archive = SiteArchive(path)
+        cert, key = ensure_certificate(path)
+
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", port), ArchiveRequestHandler)
+        server.daemon_threads = True
+        server.mode = mode
+        server.archive = self.archive
+        server.misses = []
+        server.http = urllib3.PoolManager()
+        server.ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        server.ssl_context.load_cert_chain(cert, key)
+        self.server = server
+        self._thread = None
+
+    @property
+    def address(self):
+        host, port = self.server.server_address[:2]
+        return f"{host}:{port}"
+
+    @property
+    def misses(self):
+        return self.server.misses
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def apply(self, options):
+        # send all browser traffic through the proxy
+        options.proxy = Proxy({"proxyType": "manual", "httpProxy": self.address, "sslProxy": self.address})
+        options.accept_insecure_certs = True
+        return options
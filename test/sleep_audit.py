@@ -0,0 +1,141 @@
+'''
+Sleep audit
+-----------
+time.sleep() is a static wait, the test waits the full time even when
+the page is ready much earlier.
+
+this plugin measures how long every test spends in time.sleep()
+(only the calls made from our own test code, not the ones inside
+selenium / pytest) and prints the worst tests at the end of the run.
+
+--replace-sleeps
+    instead of sleeping, wait until the page is settled:
+        document.readyState is complete
+        no fetch / XMLHttpRequest is pending
+        no DOM mutation for --settle-quiet-ms milliseconds
+    the sleep time is still the maximum time we wait.
+    tests without a driver fixture keep the normal sleep.
+'''
+import sys
+import time
+
+from selenium.common import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+# the real time.sleep, time.sleep itself is replaced during the session
+real_sleep = time.sleep
+
+SETTLE_SCRIPT = """
+var quietMs = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+if (!window.__sleepAudit) {
+    var state = window.__sleepAudit = {pending: 0, lastChange: Date.now()};
+    var touch = function () { state.lastChange = Date.now(); };
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () {
+            state.pending++; touch();
+            return originalFetch.apply(this, arguments).finally(function () { state.pending--; touch(); });
+        };
+    }
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        state.pending++; touch();
+        this.addEventListener('loadend', function () { state.pending--; touch(); });
+        return originalSend.apply(this, arguments);
+    };
+    new MutationObserver(touch).observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+var state = window.__sleepAudit, start = Date.now();
+(function check() {
+    var now = Date.now();
+    if (document.readyState === 'complete' && state.pending <= 0 && now - state.lastChange >= quietMs) {
+        return done(true);
+    }
+    if (now - start >= timeoutMs) {
+        return done(false);
+    }
+    setTimeout(check, 50);
+})();
+"""
+
+
+def wait_until_settled(driver, timeout, quiet_ms=500):
+    # returns True when the page settled before the timeout
+    deadline = time.monotonic() + timeout
+    script_timeout = driver.timeouts.script
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            driver.set_script_timeout(remaining + 5)
+            try:
+                return driver.execute_async_script(SETTLE_SCRIPT, quiet_ms, int(remaining * 1000))
+            except WebDriverException:
+                # the page navigated while waiting, check the new page
+                real_sleep(0.1)
+    finally:
+        driver.set_script_timeout(script_timeout)
+
+
+class SleepAuditor:
+
+    def __init__(self, config):
+        self.config = config
+        self.replace = config.getoption("--replace-sleeps")
+        self.quiet_ms = config.getoption("--settle-quiet-ms")
+        self.root = str(config.rootpath)
+        self.totals = {}
+        self.item = None
+
+    def is_suite_code(self, filename):
+        return filename.startswith(self.root) and "site-packages" not in filename and filename != __file__
+
+    def current_driver(self):
+        for value in getattr(self.item, "funcargs", {}).values():
+            if isinstance(value, WebDriver):
+                return value
+        return None
+
+    def sleep(self, seconds):
+        caller = sys._getframe(1).f_code.co_filename
+        if self.item is None or not self.is_suite_code(caller):
+            return real_sleep(seconds)
+
+        start = time.perf_counter()
+        try:
+            driver = self.current_driver() if self.replace else None
+            if driver is None:
+                real_sleep(seconds)
+            else:
+                wait_until_settled(driver, seconds, self.quiet_ms)
+        finally:
+            nodeid = self.item.nodeid
+            count, requested, spent = self.totals.get(nodeid, (0, 0.0, 0.0))
+            self.totals[nodeid] = (count + 1, requested + seconds, spent + time.perf_counter() - start)
+
+    def pytest_sessionstart(self, session):
+        time.sleep = self.sleep
+
+    def pytest_sessionfinish(self, session):
+        time.sleep = real_sleep
+
+    def pytest_runtest_protocol(self, item, nextitem):
+        self.item = item
+
+    def pytest_runtest_logfinish(self, nodeid, location):
+        self.item = None
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.totals:
+            return
+        top = self.config.getoption("--sleep-audit-top")
+        worst = sorted(self.totals.items(), key=lambda entry: -entry[1][1])[:top]
+        terminalreporter.write_sep("=", "time.sleep audit")
+        for nodeid, (count, requested, spent) in worst:
+            terminalreporter.write_line(
+                f"{requested:8.2f}s requested  {spent:8.2f}s spent  {count:3d} calls  {nodeid}")
+        total_requested = sum(entry[1] for entry in self.totals.values())
+        total_spent = sum(entry[2] for entry in self.totals.values())
+        terminalreporter.write_line(
+            f"total: {total_requested:.2f}s requested, {total_spent:.2f}s spent in time.sleep")
@@ -2,6 +2,8 @@ import time
 
 import pytest
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.wait import WebDriverWait
 
 
 def test_window_handling(start_ohrms):
@@ -11,21 +13,29 @@ def test_window_handling(start_ohrms):
     driver.find_element(By.XPATH, "/html/body/div/div/div/div/div/div[2]/div[2]/form/div[2]/div/div[2]/input").send_keys("admin123")
     driver.find_element(By.XPATH, "/html/body/div/div/div/div/div/div[2]/div[2]/form/div[3]/button").click()
     time.sleep(5)
-    driver.find_element(By.XPATH, "//button[@class='oxd-glass-button orangehrm-upgrade-button']").click()
-    time.sleep(10)
     # get the current window reference
     parent_window = driver.current_window_handle
+    # window_tracker
+    '''
+    keeps the list of the opened windows from the browser events,
+    expect_new_window gives the new window as soon as it is opened
+    (no sleep, no polling of window_handles)
+    
+    '''
+    with driver.window_tracker.expect_new_window(timeout=10) as new_window:
+        driver.find_element(By.XPATH, "//button[@class='oxd-glass-button orangehrm-upgrade-button']").click()
 
-    all_windows = driver.window_handles
+    all_windows = driver.window_tracker.handles
     # window_handles
     '''
     is a webdriver method, is used to get all the windows which is opened
     and it will return the windows references in list format
+    (window_tracker.handles is the same list, without asking the browser)
     
     '''
     print(all_windows)
     print(len(all_windows))
-    driver.switch_to.window(all_windows[1])
+    driver.switch_to.window(new_window.handle)
 
     '''
     switch_to.window()
@@ -33,7 +43,9 @@ def test_window_handling(start_ohrms):
     
     '''
 
-    driver.find_element(By.XPATH, "//input[@name='FullName']").send_keys("Sivanesh")
+    # the new window is still loading
+    WebDriverWait(driver, 10).until(
+        EC.presence_of_element_located((By.XPATH, "//input[@name='FullName']"))).send_keys("Sivanesh")
     # close method will close the current window
     #driver.close()
 
@@ -0,0 +1,142 @@
+'''
+unit tests of the asyncio remote connection against a local asyncio server
+that answers, drops or cuts the requests on purpose.
+'''
+import asyncio
+import json
+
+import h11
+import pytest
+from selenium.common import InvalidSelectorException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote import webelement
+from selenium.webdriver.remote.async_remote_connection import AsyncRemoteConnection
+from selenium.webdriver.remote.async_webdriver import AsyncWebDriver, AsyncWebElement
+from selenium.webdriver.remote.client_config import ClientConfig
+from selenium.webdriver.support.relative_locator import locate_with
+
+BODY = json.dumps({"value": "ok"}).encode()
+
+
+class Server:
+    """Answers the requests of each connection with `behaviour(number of the
+    request on the connection)`: "answer", "drop" (close without answering)
+    or "cut" (close in the middle of the body)."""
+
+    def __init__(self, behaviour):
+        self.behaviour = behaviour
+        self.requests = []
+        self.connections = 0
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        count = 0
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except asyncio.IncompleteReadError:
+                # the client closed the connection
+                break
+            lines = head.decode().split("\r\n")
+            length = next((int(line.split(":")[1]) for line in lines if line.lower().startswith("content-length")), 0)
+            if length:
+                await reader.readexactly(length)
+            self.requests.append(lines[0].split(" ")[0])
+            action = self.behaviour(count)
+            count += 1
+            if action == "drop":
+                break
+            body = BODY[:5] if action == "cut" else BODY
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                         + f"Content-Length: {len(BODY)}\r\n\r\n".encode() + body)
+            await writer.drain()
+            if action == "cut":
+                break
+        writer.close()
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+        self.connection = AsyncRemoteConnection(client_config=ClientConfig(self.url, timeout=5))
+        return self
+
+    async def __aexit__(self, *args):
+        await self.connection.close()
+        self.server.close()
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_keep_alive_connection_is_reused():
+    async def scenario():
+        async with Server(lambda count: "answer") as server:
+            for _ in range(3):
+                assert (await server.connection._request("GET", server.url + "/status"))["value"] == "ok"
+            return server.connections
+
+    assert run(scenario()) == 1
+
+
+def test_get_is_sent_again_when_the_pooled_connection_drops_it():
+    async def scenario():
+        # the second request of every connection is dropped
+        async with Server(lambda count: "answer" if count == 0 else "drop") as server:
+            await server.connection._request("GET", server.url + "/status")
+            response = await server.connection._request("GET", server.url + "/status")
+            return response, server.requests
+
+    response, requests = run(scenario())
+    assert response["value"] == "ok"
+    assert requests == ["GET", "GET", "GET"]
+
+
+def test_post_is_not_sent_twice():
+    async def scenario():
+        async with Server(lambda count: "answer" if count == 0 else "drop") as server:
+            await server.connection._request("GET", server.url + "/status")
+            with pytest.raises((ConnectionError, h11.RemoteProtocolError)):
+                await server.connection._request("POST", server.url + "/session/1/element/2/click", "{}")
+            return server.requests
+
+    assert run(scenario()) == ["GET", "POST"]
+
+
+def test_truncated_body_raises():
+    async def scenario():
+        async with Server(lambda count: "cut") as server:
+            with pytest.raises((ConnectionError, h11.RemoteProtocolError)):
+                await server.connection._request("GET", server.url + "/status")
+
+    run(scenario())
+
+
+class FakeConnection:
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.scripts = []
+
+    async def execute(self, command, params):
+        self.scripts.append(params["script"])
+        return {"value": self.results.pop(0)}
+
+
+def test_is_displayed_installs_the_atom_once():
+    connection = FakeConnection([{webelement._ATOM_MISSING: True}, True, False])
+    driver = AsyncWebDriver(connection)
+    element = AsyncWebElement(driver, "1")
+
+    assert run(element.is_displayed()) is True
+    assert run(element.is_displayed()) is False
+    assert connection.scripts == [webelement.atom_script("isDisplayed"),
+                                  webelement.atom_script("isDisplayed", install=True),
+                                  webelement.atom_script("isDisplayed")]
+
+
+def test_relative_locators_are_invalid_selectors():
+    driver = AsyncWebDriver(FakeConnection([]))
+    with pytest.raises(InvalidSelectorException):
+        run(driver.find_element(locate_with(By.TAG_NAME, "input").near({"x": 1, "y": 1})))
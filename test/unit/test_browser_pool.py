@@ -0,0 +1,123 @@
+'''
+unit tests of the browser pool, no browser: the driver is a fake that keeps
+the user contexts and the tabs the way the BiDi commands would.
+'''
+import pytest
+from selenium.common import WebDriverException
+
+from ..browser_pool import BrowserPool, reset_driver
+
+
+class FakeBrowser:
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def create_user_context(self, accept_insecure_certs=None):
+        self.driver.accept_insecure_certs.append(accept_insecure_certs)
+        user_context = f"context-{len(self.driver.user_contexts)}"
+        self.driver.user_contexts.append(user_context)
+        return user_context
+
+    def get_user_contexts(self):
+        return list(self.driver.user_contexts)
+
+    def remove_user_context(self, user_context):
+        self.driver.user_contexts.remove(user_context)
+        # removing a user context closes its tabs
+        self.driver.tabs = {tab: owner for tab, owner in self.driver.tabs.items() if owner != user_context}
+
+
+class FakeBrowsingContext:
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def create(self, type, user_context=None):
+        tab = f"tab-{len(self.driver.tabs)}-{user_context}"
+        self.driver.tabs[tab] = user_context or "default"
+        return tab
+
+    def close(self, context):
+        del self.driver.tabs[context]
+
+
+class FakeSwitchTo:
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.current = handle
+
+
+class FakeDriver:
+
+    def __init__(self, bidi=True):
+        self.caps = {"webSocketUrl": "ws://localhost/session" if bidi else None, "acceptInsecureCerts": True}
+        self.user_contexts = ["default"]
+        self.tabs = {"first": "default"}
+        self.current = "first"
+        self.accept_insecure_certs = []
+        self.browser = FakeBrowser(self)
+        self.browsing_context = FakeBrowsingContext(self)
+        self.switch_to = FakeSwitchTo(self)
+        self.quit_called = False
+
+    @property
+    def window_handles(self):
+        return list(self.tabs)
+
+    def maximize_window(self):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_reset_opens_a_tab_in_a_new_user_context():
+    driver = FakeDriver()
+    driver.tabs["popup"] = "default"
+
+    reset_driver(driver)
+
+    assert driver.user_contexts == ["default", "context-1"]
+    assert list(driver.tabs.values()) == ["context-1"]
+    assert driver.current in driver.tabs
+    assert driver.accept_insecure_certs == [True]
+
+
+def test_reset_removes_the_user_context_of_the_previous_test():
+    driver = FakeDriver()
+    reset_driver(driver)
+    # the test opens a second tab in its user context
+    driver.tabs["popup"] = "context-1"
+
+    reset_driver(driver)
+
+    assert driver.user_contexts == ["default", "context-2"]
+    assert list(driver.tabs) == [driver.current]
+    assert driver.tabs[driver.current] == "context-2"
+
+
+def test_reset_without_bidi_fails():
+    with pytest.raises(WebDriverException):
+        reset_driver(FakeDriver(bidi=False))
+
+
+def test_release_keeps_the_reset_driver():
+    pool = BrowserPool(FakeDriver, size=1).start()
+    driver = pool.acquire()
+    pool.release(driver)
+
+    assert pool.acquire() is driver
+    assert not driver.quit_called
+
+
+def test_release_quits_the_driver_that_cannot_be_reset():
+    pool = BrowserPool(lambda: FakeDriver(bidi=False), size=1).start()
+    driver = pool.acquire()
+    pool.release(driver)
+
+    assert driver.quit_called
+    assert pool.acquire() is not driver
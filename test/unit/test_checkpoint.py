@@ -0,0 +1,82 @@
+'''
+unit tests of the html report checkpoint: the aggregates kept one test at a
+time, the JSONL store and the merge of the worker segments.
+'''
+import json
+
+from pytest_html_report.checkpoint import (CheckpointAggregates, CheckpointStore, checkpoint_path, find_last_run,
+                                           iter_checkpoint, load_checkpoint_files, read_checkpoint, run_segments)
+
+HEADER = {"test_environment": "Development", "timestamp": "18 Oct 2026, 10:00", "img_url": "", "report_title": "t"}
+
+
+def case(name, status="Passed", specs=("SPEC-1",), categories=("smoke",)):
+    return {"name": name, "classname": "tests.module", "status": status, "developer": "", "test_description": "",
+            "details": "", "logs": "", "functional_specifications": list(specs), "categories": list(categories)}
+
+
+def test_aggregates_count_specs_and_categories():
+    aggregates = CheckpointAggregates()
+    aggregates.add(case("a"))
+    aggregates.add(case("b", "Failed", categories=("smoke", "regression")))
+    aggregates.add(case("c", "Skipped", specs=("SPEC-2",), categories=()))
+
+    data = aggregates.to_report_data(HEADER)
+
+    assert data["functional_spec_count"]["SPEC-1"] == {"pass": 1, "fail": 1, "skip": 0, "total": 2,
+                                                       "smoke": 2, "regression": 1}
+    assert data["functional_spec_count"]["SPEC-2"] == {"pass": 0, "fail": 0, "skip": 1, "total": 1,
+                                                       "smoke": 0, "regression": 0}
+    assert data["category_count"] == {"smoke": 2, "regression": 1}
+    assert data["specs"]["SPEC-1"] == {"cases": [0, 1], "status": "Failing"}
+    assert data["specs"]["SPEC-2"] == {"cases": [2], "status": "Partially Passing"}
+
+
+def test_aggregates_replace_an_earlier_result():
+    aggregates = CheckpointAggregates()
+    aggregates.add(case("a", "Failed", categories=("regression",)))
+    aggregates.add(case("b"))
+    aggregates.add(case("a", "Passed", categories=("smoke",)))
+
+    data = aggregates.to_report_data(HEADER)
+
+    counts = data["functional_spec_count"]["SPEC-1"]
+    assert (counts["pass"], counts["fail"], counts["total"], counts["smoke"]) == (2, 0, 2, 2)
+    assert not counts.get("regression")
+    assert data["category_count"] == {"smoke": 2}
+    # the rerun test comes last
+    assert [c["name"] for c in data["testsuites"][0]["cases"]] == ["b", "a"]
+    assert data["specs"]["SPEC-1"]["status"] == "Passing"
+
+
+def test_store_merges_the_worker_segments(tmp_path):
+    store = CheckpointStore(checkpoint_path(tmp_path, "Development", "run1"), HEADER, [case("a", "Failed")])
+    store.append(case("b"))
+    segment = CheckpointStore(checkpoint_path(tmp_path, "Development", "run1", "gw0"), HEADER)
+    segment.append(case("a"))
+    segment.append(case("c"))
+
+    segments = run_segments(tmp_path, "Development", "run1")
+    assert segments == [segment.path]
+    merged = load_checkpoint_files([store.path, *segments])
+    json_path = store.compact(segments=segments)
+
+    with open(json_path) as f:
+        data = json.load(f)
+    assert data["test_status"] == "complete"
+    assert data["functional_spec_count"] == merged["functional_spec_count"]
+    assert data["functional_spec_count"]["SPEC-1"]["pass"] == 3
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["Development_checkpoint_run1.json"]
+    assert find_last_run(tmp_path, "Development") == "run1"
+    assert read_checkpoint(json_path) == (HEADER, data["testsuites"][0]["cases"])
+
+
+def test_interrupted_jsonl_line_is_skipped(tmp_path):
+    store = CheckpointStore(tmp_path / "Development_checkpoint_run1.jsonl", HEADER)
+    store.append(case("a"))
+    with open(store.path, "a") as f:
+        f.write('{"case": {"name": "b", "sta')
+
+    records = list(iter_checkpoint(store.path))
+
+    assert records == [{"header": HEADER}, {"case": case("a")}]
@@ -0,0 +1,109 @@
+'''
+unit tests of the shared connection pools and of their usage counts,
+against a local keep-alive http server.
+'''
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import urllib3
+from selenium.webdriver.remote.connection_pools import ConnectionPoolRegistry
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path == "/slow":
+            self.server.entered.set()
+            self.server.release.wait(5)
+        keep_alive = self.path != "/close"
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        if not keep_alive:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(b"ok")
+        self.close_connection = not keep_alive
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.entered = threading.Event()
+    httpd.release = threading.Event()
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield httpd
+    httpd.release.set()
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def pools():
+    registry = ConnectionPoolRegistry()
+    registry.enable(maxsize=1, block=True)
+    yield registry
+    registry.disable()
+
+
+def test_managers_are_shared_per_host_and_settings(pools):
+    manager = pools.get("http://grid:4444", (), urllib3.PoolManager)
+
+    assert pools.get("http://grid:4444", (), urllib3.PoolManager) is manager
+    assert pools.get("http://grid:4444", ("proxy",), urllib3.PoolManager) is not manager
+    assert pools.get("http://other:4444", (), urllib3.PoolManager) is not manager
+    assert pools.is_shared(manager)
+    assert not pools.is_shared(urllib3.PoolManager())
+
+
+def test_keep_alive_connection_is_reused(pools, server):
+    manager = pools.get(server.url, (), urllib3.PoolManager)
+    for _ in range(3):
+        assert manager.request("GET", server.url + "/").data == b"ok"
+
+    stats = pools.stats()[server.url]
+    assert (stats.requests, stats.hits, stats.new_connections, stats.waits) == (3, 2, 1, 0)
+
+
+def test_closed_connection_counts_as_a_new_one(pools, server):
+    manager = pools.get(server.url, (), urllib3.PoolManager)
+    manager.request("GET", server.url + "/close")
+    manager.request("GET", server.url + "/")
+
+    stats = pools.stats()[server.url]
+    assert (stats.requests, stats.hits, stats.new_connections) == (2, 0, 2)
+
+
+def test_requests_wait_for_a_free_connection(pools, server):
+    manager = pools.get(server.url, (), urllib3.PoolManager)
+    # the thread holds the only connection of the pool
+    slow = threading.Thread(target=manager.request, args=("GET", server.url + "/slow"))
+    slow.start()
+    assert server.entered.wait(5)
+
+    waiting = threading.Thread(target=manager.request, args=("GET", server.url + "/"))
+    waiting.start()
+    threading.Timer(0.2, server.release.set).start()
+    slow.join(5)
+    waiting.join(5)
+
+    stats = pools.stats()[server.url]
+    assert (stats.requests, stats.waits) == (2, 1)
+    assert stats.wait_seconds > 0.1
+
+
+def test_stats_are_copies(pools, server):
+    manager = pools.get(server.url, (), urllib3.PoolManager)
+    manager.request("GET", server.url + "/")
+    stats = pools.stats()[server.url]
+    stats.requests = 100
+
+    assert pools.stats()[server.url].requests == 1
+    pools.disable()
+    assert pools.stats() == {}
@@ -0,0 +1,84 @@
+'''
+unit tests of DomSnapshot, built from html strings instead of a browser.
+'''
+import pytest
+from selenium.common import InvalidSelectorException, NoSuchElementException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.dom_snapshot import DomSnapshot
+from selenium.webdriver.support.relative_locator import locate_with
+
+PAGE = """<html><head><title>Shop</title><style>.x { color: red }</style></head>
+<body>
+  <form><input id='search"box' name="q[]" type="text"><input id="a b" name="x y"></form>
+  <ul class="menu">
+    <li><a href="/deals">Today's   deals</a></li>
+    <li><a href="/help">Help <b>centre</b></a></li>
+  </ul>
+  <p class="note">Price <script>var hidden = 1;</script>82,900</p>
+  <iframe src="/ads"></iframe>
+</body></html>"""
+
+
+@pytest.fixture
+def page():
+    return DomSnapshot(PAGE, "https://shop.test/", "Shop")
+
+
+def test_find_by_id_and_name_with_special_characters(page):
+    assert page.find_element(By.ID, 'search"box').get_dom_attribute("name") == "q[]"
+    assert page.find_element(By.NAME, "q[]").get_dom_attribute("id") == 'search"box'
+    assert page.find_element(By.ID, "a b").get_dom_attribute("name") == "x y"
+    assert page.find_element(By.NAME, "x y").get_dom_attribute("id") == "a b"
+
+
+def test_find_by_class_tag_and_css(page):
+    assert page.find_element(By.CLASS_NAME, "note").tag_name == "p"
+    assert len(page.find_elements(By.TAG_NAME, "LI")) == 2
+    assert [link.get_dom_attribute("href") for link in page.find_elements(By.CSS_SELECTOR, "ul.menu a")] \
+        == ["/deals", "/help"]
+
+
+def test_find_by_link_text(page):
+    # the white space of the link text is collapsed
+    assert page.find_element(By.LINK_TEXT, "Today's deals").get_dom_attribute("href") == "/deals"
+    assert page.find_element(By.PARTIAL_LINK_TEXT, "Help cen").get_dom_attribute("href") == "/help"
+    assert page.find_elements(By.LINK_TEXT, "Help") == []
+
+
+def test_find_by_xpath(page):
+    assert page.find_element(By.XPATH, "//a[contains(., 'centre')]").text == "Help centre"
+    assert page.find_element(By.XPATH, "//li[2]").find_element(By.XPATH, "./a/b").text == "centre"
+
+
+def test_text_leaves_out_scripts(page):
+    assert page.find_element(By.CLASS_NAME, "note").text == "Price 82,900"
+
+
+def test_find_in_an_element(page):
+    menu = page.find_element(By.CLASS_NAME, "menu")
+    assert [link.text for link in menu.find_elements(By.TAG_NAME, "a")] == ["Today's deals", "Help centre"]
+    assert menu.find_elements(By.TAG_NAME, "input") == []
+    assert menu.parent.tag_name == "body"
+    assert page.root.tag_name == "html"
+    assert page.root.parent is None
+
+
+def test_errors(page):
+    with pytest.raises(NoSuchElementException):
+        page.find_element(By.ID, "missing")
+    with pytest.raises(InvalidSelectorException):
+        page.find_elements(By.CSS_SELECTOR, "ul[")
+    with pytest.raises(InvalidSelectorException):
+        page.find_elements(By.XPATH, "//a[")
+    with pytest.raises(InvalidSelectorException):
+        page.find_elements(locate_with(By.TAG_NAME, "a").below({"id": "x"}))
+
+
+def test_frame_snapshot_knows_its_frame_element(page):
+    frame = DomSnapshot("<html><body><p>ad</p></body></html>", "https://shop.test/ads", "", parent=page,
+                        frame_index=0)
+    page._frames.append(frame)
+
+    assert frame.frame_element.get_dom_attribute("src") == "/ads"
+    assert frame.frame_element.frame is frame
+    assert [document.url for document in page.iter_documents()] == ["https://shop.test/", "https://shop.test/ads"]
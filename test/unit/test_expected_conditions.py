@@ -0,0 +1,79 @@
+'''
+unit tests of the composite expected conditions (any_of, all_of, none_of)
+checked together in the browser, with a stub driver whose execute_script
+plays the part of the browser script.
+'''
+from selenium.common import NoSuchElementException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.locator_converter import LocatorConverter
+from selenium.webdriver.support import expected_conditions as EC
+
+
+class StubDriver:
+    """`elements`: css selector -> element, `flags`: the answer of the browser script"""
+
+    def __init__(self, elements, flags=None):
+        self.locator_converter = LocatorConverter()
+        self.elements = elements
+        self.flags = flags
+        self.scripts = []
+        self.found = []
+
+    def execute_script(self, script, conditions, root):
+        self.scripts.append(conditions)
+        return self.flags if self.flags is not None else [True] * len(conditions)
+
+    def find_element(self, by, value):
+        by, value = self.locator_converter.convert(by, value)
+        self.found.append(value)
+        if value not in self.elements:
+            raise NoSuchElementException()
+        return self.elements[value]
+
+
+def presence(element_id):
+    return EC.presence_of_element_located((By.ID, element_id))
+
+
+def test_conditions_are_checked_in_one_script():
+    driver = StubDriver({'[id="b"]': "b"}, flags=[False, True])
+
+    assert EC.any_of(presence("a"), presence("b"))(driver) == "b"
+    assert driver.scripts == [[{"kind": "presence", "using": "css selector", "value": '[id="a"]'},
+                               {"kind": "presence", "using": "css selector", "value": '[id="b"]'}]]
+    # the condition reported false by the browser is not looked up again
+    assert driver.found == ['[id="b"]']
+
+
+def test_invalid_locator_is_left_to_its_predicate():
+    driver = StubDriver({'[id="x"]': "x"})
+
+    assert EC.any_of(EC.presence_of_element_located((By.CLASS_NAME, "a b")), presence("x"))(driver) == "x"
+    assert driver.scripts == []
+    assert EC.all_of(EC.presence_of_element_located((By.CLASS_NAME, "a b")), presence("x"))(driver) is False
+    assert EC.none_of(EC.presence_of_element_located((By.CLASS_NAME, "a b")), presence("y"))(driver) is True
+
+
+def test_all_of_stops_when_the_browser_says_no():
+    driver = StubDriver({'[id="a"]': "a", '[id="b"]': "b"}, flags=[True, False])
+    assert EC.all_of(presence("a"), presence("b"))(driver) is False
+    assert driver.found == []
+
+    driver.flags = [True, True]
+    assert EC.all_of(presence("a"), presence("b"))(driver) == ["a", "b"]
+
+
+def test_none_of_checks_the_conditions_the_browser_may_accept():
+    driver = StubDriver({'[id="a"]': "a"}, flags=[False, True])
+    assert EC.none_of(presence("a"), presence("b"))(driver) is True
+    assert driver.found == ['[id="b"]']
+
+    driver.flags = [True, True]
+    assert EC.none_of(presence("a"), presence("b"))(driver) is False
+
+
+def test_conditions_without_a_browser_form_are_checked_in_python():
+    driver = StubDriver({'[id="a"]': "a"})
+
+    assert EC.any_of(lambda d: False, presence("a"))(driver) == "a"
+    assert driver.scripts == []
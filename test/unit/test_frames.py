@@ -0,0 +1,123 @@
+'''
+unit tests of the frame inventory and of the cross-frame search: the BiDi
+context tree and the frameSearch.js answers of each context are canned.
+'''
+import json
+
+import pytest
+from selenium.common import WebDriverException
+from selenium.webdriver.common.bidi.browsing_context import BrowsingContextInfo
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote import frames
+from selenium.webdriver.remote.locator_converter import LocatorConverter
+from selenium.webdriver.support.relative_locator import locate_with
+
+def context(name, url, parent=None, children=()):
+    return {"context": name, "url": url, "parent": parent, "userContext": "default", "clientWindow": "w1",
+            "children": list(children)}
+
+
+# the window "top" has the ad frame "ad", which has its own frame "inner"
+TREE = context("top", "https://shop.test/", children=[
+    context("ad", "https://ads.test/", "top", [context("inner", "https://ads.test/inner", "ad")])])
+OTHER_WINDOW = context("other", "https://help.test/")
+
+
+def node(shared_id):
+    return {"type": "node", "sharedId": shared_id}
+
+
+def search_result(owners, elements, data):
+    value = [
+        {"type": "array", "value": [{"type": "array", "value": [node(element), {"type": "window", "value": {
+            "context": window}}]} for element, window in owners]},
+        {"type": "array", "value": [node(element) for element in elements]},
+        {"type": "string", "value": json.dumps(data)},
+    ]
+    return {"type": "success", "realm": "r", "result": {"type": "array", "value": value}}
+
+
+class FakeBrowsingContext:
+
+    def __init__(self, tree):
+        self.tree = tree
+
+    def get_tree(self, max_depth=None, root=None):
+        return [BrowsingContextInfo.from_json(info) for info in self.tree]
+
+
+class FakeWebSocket:
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.batches = []
+
+    def execute_many(self, commands, return_exceptions=False):
+        commands = [next(command) for command in commands]
+        self.batches.append(commands)
+        return [self.answers[command["params"]["target"]["context"]] for command in commands]
+
+
+class FakeDriver:
+
+    def __init__(self, tree, answers, current="top"):
+        self.browsing_context = FakeBrowsingContext(tree)
+        self._websocket_connection = FakeWebSocket(answers)
+        self.locator_converter = LocatorConverter()
+        self.current = current
+        self.handle_requests = 0
+
+    @property
+    def current_window_handle(self):
+        self.handle_requests += 1
+        return self.current
+
+
+ANSWERS = {
+    "top": search_result([("f1", "ad")], ["a1"], {"owners": [{"id": "ad-frame", "name": "ads", "title": "Ad"}],
+                                                  "elements": [{"text": "Home"}]}),
+    "ad": search_result([("f2", "inner")], ["a2", "a3"], {"owners": [{"id": "", "name": "", "title": None}],
+                                                          "elements": [{"text": "Buy"}, {"text": "Sell"}]}),
+    "inner": search_result([], [], {"owners": [], "elements": []}),
+    "other": search_result([], ["a4"], {"owners": [], "elements": [{"text": "Help"}]}),
+}
+
+
+def test_get_frames_of_a_single_window():
+    driver = FakeDriver([TREE], ANSWERS)
+
+    found = frames.get_frames(driver)
+
+    assert [(frame.context, frame.parent, frame.depth) for frame in found] == [("ad", "top", 1), ("inner", "ad", 2)]
+    assert (found[0].id, found[0].name, found[0].title) == ("ad-frame", "ads", "Ad")
+    assert found[1].id is None
+    assert [element.id for element in found[1].path] == ["f1", "f2"]
+    # the window comes from the context tree, with one batch of calls
+    assert driver.handle_requests == 0
+    assert len(driver._websocket_connection.batches) == 1
+
+
+def test_only_the_current_window_is_searched():
+    driver = FakeDriver([OTHER_WINDOW, TREE], ANSWERS)
+
+    matches = frames.find_elements_in_frames(driver, By.TAG_NAME, "a")
+
+    assert driver.handle_requests == 1
+    assert [(match.frame and match.frame.context, match.element.id, match.text) for match in matches] == [
+        (None, "a1", "Home"), ("ad", "a2", "Buy"), ("ad", "a3", "Sell")]
+    query = json.loads(driver._websocket_connection.batches[0][0]["params"]["arguments"][0]["value"])
+    assert (query["using"], query["value"]) == ("tag name", "a")
+
+
+def test_contexts_that_went_away_are_left_out():
+    driver = FakeDriver([TREE], dict(ANSWERS, inner=WebDriverException("no such frame")))
+
+    matches = frames.find_elements_in_frames(driver, By.TAG_NAME, "a")
+
+    assert [match.element.id for match in matches] == ["a1", "a2", "a3"]
+
+
+def test_relative_locators_are_refused():
+    driver = FakeDriver([TREE], ANSWERS)
+    with pytest.raises(ValueError):
+        frames.find_elements_in_frames(driver, locate_with(By.TAG_NAME, "a").below({"id": "x"}))
@@ -0,0 +1,195 @@
+'''
+unit tests of the excel test data: the cache of the parsed rows and the
+cell changes of WorkbookPatch, on small workbooks written in a temporary
+directory.
+'''
+import datetime
+import os
+import zipfile
+
+import pytest
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Font
+
+from .. import HandleExcel
+from ..HandleExcel import WorkbookPatch, file_hash, read_rows, sheet_rows
+
+
+def write_workbook(path, rows, title="Sheet1"):
+    workbook = Workbook()
+    worksheet = workbook.active
+    worksheet.title = title
+    for row in rows:
+        worksheet.append(row)
+    workbook.save(path)
+
+
+@pytest.fixture
+def workbook(tmp_path, monkeypatch):
+    monkeypatch.setattr(HandleExcel, "CACHE_DIR", str(tmp_path / "cache"))
+    path = tmp_path / "Data.xlsx"
+    write_workbook(path, [("Username", "email"), ("mani", "mani@test"), ("ravi", "ravi@test")])
+    return str(path)
+
+
+def no_parsing(path, sheet=None):
+    raise AssertionError("the workbook was parsed again")
+
+
+def test_rows_are_read_from_the_cache(workbook, monkeypatch):
+    assert list(sheet_rows("Sheet1", workbook)) == [{"Username": "mani", "email": "mani@test"},
+                                                     {"Username": "ravi", "email": "ravi@test"}]
+    monkeypatch.setattr(HandleExcel, "parse_rows", no_parsing)
+
+    assert [row["Username"] for row in sheet_rows("Sheet1", workbook)] == ["mani", "ravi"]
+
+
+def test_unchanged_content_with_a_new_mtime_is_hashed_once(workbook, monkeypatch):
+    list(read_rows("Sheet1", workbook))
+    stat = os.stat(workbook)
+    os.utime(workbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    monkeypatch.setattr(HandleExcel, "parse_rows", no_parsing)
+    hashes = []
+    monkeypatch.setattr(HandleExcel, "file_hash", lambda path: hashes.append(path) or file_hash(path))
+
+    assert len(list(read_rows("Sheet1", workbook))) == 3
+    assert len(list(read_rows("Sheet1", workbook))) == 3
+    assert hashes == [workbook]
+
+
+def test_changed_workbook_is_parsed_again(workbook):
+    list(read_rows("Sheet1", workbook))
+    write_workbook(workbook, [("Username", "email"), ("kumar", "kumar@test")])
+
+    assert list(sheet_rows("Sheet1", workbook)) == [{"Username": "kumar", "email": "kumar@test"}]
+
+
+def test_empty_sheet_is_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr(HandleExcel, "CACHE_DIR", str(tmp_path / "cache"))
+    path = str(tmp_path / "Empty.xlsx")
+    write_workbook(path, [])
+
+    assert list(read_rows("Sheet1", path)) == []
+    monkeypatch.setattr(HandleExcel, "parse_rows", no_parsing)
+    assert list(read_rows("Sheet1", path)) == []
+
+
+def test_workbook_patch_changes_only_the_cells(workbook):
+    with zipfile.ZipFile(workbook) as archive:
+        before = {info.filename: archive.read(info) for info in archive.infolist()}
+
+    with WorkbookPatch(workbook) as patch:
+        patch.set("Sheet1", "A3", "Thavamani")
+        patch.set_by_header("Sheet1", 0, "email", None)
+        patch.set("Sheet1", "C5", 42)
+        patch.set("Sheet1", "B5", " <new> & co ")
+
+    worksheet = load_workbook(workbook).active
+    assert [list(row) for row in worksheet.iter_rows(values_only=True)] == [
+        ["Username", "email", None], ["mani", None, None], ["Thavamani", "ravi@test", None],
+        [None, None, None], [None, " <new> & co ", 42]]
+    assert worksheet.dimensions == "A1:C5"
+    with zipfile.ZipFile(workbook) as archive:
+        after = {info.filename: archive.read(info) for info in archive.infolist()}
+    changed = [name for name in before if before[name] != after[name]]
+    assert changed == ["xl/worksheets/sheet1.xml"]
+    # the cache of the rows sees the new file, the empty row 4 is left out
+    assert [row["Username"] for row in sheet_rows("Sheet1", workbook)] == ["mani", "Thavamani", None]
+
+
+def test_workbook_patch_keeps_the_cell_style(workbook):
+    styled = load_workbook(workbook)
+    styled.active["B2"].font = Font(bold=True)
+    styled.save(workbook)
+
+    with WorkbookPatch(workbook) as patch:
+        patch.set("Sheet1", "B2", "bold@test")
+
+    cell = load_workbook(workbook).active["B2"]
+    assert (cell.value, cell.font.bold) == ("bold@test", True)
+
+
+def test_workbook_patch_of_a_missing_sheet(workbook):
+    with open(workbook, "rb") as f:
+        content = f.read()
+
+    with pytest.raises(KeyError):
+        with WorkbookPatch(workbook) as patch:
+            patch.set("Sheet2", "A1", "x")
+
+    with open(workbook, "rb") as f:
+        assert f.read() == content
+    assert not [name for name in os.listdir(os.path.dirname(workbook)) if name.endswith(".tmp")]
+
+
+def test_workbook_patch_is_not_saved_after_an_error(workbook):
+    with open(workbook, "rb") as f:
+        content = f.read()
+
+    with pytest.raises(RuntimeError):
+        with WorkbookPatch(workbook) as patch:
+            patch.set("Sheet1", "A2", "x")
+            raise RuntimeError
+
+    with open(workbook, "rb") as f:
+        assert f.read() == content
+
+
+def test_workbook_patch_refuses_nan_and_inf(workbook):
+    with WorkbookPatch(workbook) as patch:
+        for value in (float("nan"), float("inf")):
+            with pytest.raises(ValueError):
+                patch.set("Sheet1", "A2", value)
+    assert load_workbook(workbook).active["A2"].value == "mani"
+
+
+def test_workbook_patch_writes_dates_as_serials(workbook):
+    styled = load_workbook(workbook)
+    styled.active["B2"].number_format = "dd/mm/yyyy"
+    styled.save(workbook)
+
+    with WorkbookPatch(workbook) as patch:
+        patch.set("Sheet1", "B2", datetime.date(2024, 1, 2))
+        patch.set("Sheet1", "C2", datetime.datetime(2024, 1, 2, 6, 30))
+        patch.set("Sheet1", "C3", datetime.date(2024, 3, 4))
+
+    worksheet = load_workbook(workbook).active
+    # the style of the cell is kept, the cells without style get a date style
+    assert (worksheet["B2"].value, worksheet["B2"].number_format) == (datetime.datetime(2024, 1, 2), "dd/mm/yyyy")
+    assert worksheet["C2"].value == datetime.datetime(2024, 1, 2, 6, 30)
+    assert worksheet["C3"].value == datetime.datetime(2024, 3, 4)
+    assert worksheet["C3"].is_date
+
+
+def test_replacing_a_formula_drops_the_calculation_chain(workbook):
+    formulas = load_workbook(workbook)
+    formulas.active["C2"] = "=LEN(A2)"
+    formulas.save(workbook)
+    # openpyxl does not write a calculation chain, add the one excel would
+    with zipfile.ZipFile(workbook) as archive:
+        parts = {info.filename: archive.read(info) for info in archive.infolist()}
+    parts["xl/calcChain.xml"] = CALC_CHAIN
+    parts["[Content_Types].xml"] = parts["[Content_Types].xml"].replace(b"</Types>", CALC_CHAIN_TYPE + b"</Types>")
+    parts["xl/_rels/workbook.xml.rels"] = parts["xl/_rels/workbook.xml.rels"].replace(
+        b"</Relationships>", CALC_CHAIN_RELATIONSHIP + b"</Relationships>")
+    with zipfile.ZipFile(workbook, "w") as archive:
+        for name, data in parts.items():
+            archive.writestr(name, data)
+
+    with WorkbookPatch(workbook) as patch:
+        patch.set("Sheet1", "C2", 4)
+
+    with zipfile.ZipFile(workbook) as archive:
+        assert "xl/calcChain.xml" not in archive.namelist()
+        assert b"calcChain" not in archive.read("[Content_Types].xml")
+        assert b"calcChain" not in archive.read("xl/_rels/workbook.xml.rels")
+    assert load_workbook(workbook).active["C2"].value == 4
+
+
+CALC_CHAIN = (b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+              b'<calcChain xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><c r="C2" i="1"/></calcChain>')
+CALC_CHAIN_TYPE = (b'<Override PartName="/xl/calcChain.xml" '
+                   b'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.calcChain+xml"/>')
+CALC_CHAIN_RELATIONSHIP = (b'<Relationship Id="rId99" '
+                           b'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/calcChain" '
+                           b'Target="calcChain.xml"/>')
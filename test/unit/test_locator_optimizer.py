@@ -0,0 +1,140 @@
+'''
+unit tests of the locator rewrite cache, no browser: the driver is a fake
+whose execute_script plays the part of REWRITE_SCRIPT.
+'''
+import json
+
+from ..locator_optimizer import LocatorOptimizer, LocatorRewriteCache, page_key
+
+
+class FakeConfig:
+
+    def __init__(self, cache, learn=False):
+        self.options = {"--learn-locators": learn, "--locator-cache": cache}
+
+    def getoption(self, name):
+        return self.options[name]
+
+
+class FakeDriver:
+
+    def __init__(self, result):
+        self.result = result
+        self.scripts = []
+
+    def execute_script(self, script, *args):
+        self.scripts.append(args)
+        return self.result
+
+
+def original(driver, by, value):
+    return f"original {by}={value}"
+
+
+def test_page_key_drops_query_and_fragment():
+    assert page_key("https://shop.test/products?page=2#top") == "https://shop.test/products"
+    assert page_key("about:blank") == "about://blank"
+
+
+def test_rewrites_are_kept_per_page(tmp_path):
+    cache = LocatorRewriteCache(str(tmp_path / "rewrites.json"))
+    cache.learn("xpath", "//a", False, "https://a.test/", {"by": "id", "value": "a"})
+    cache.learn("xpath", "//a", False, "https://b.test/", {"by": "css selector", "value": "a.b"})
+    assert cache.get("xpath", "//a", False) == {
+        "https://a.test/": {"by": "id", "value": "a"},
+        "https://b.test/": {"by": "css selector", "value": "a.b"},
+    }
+    # find_elements is learnt separately
+    assert cache.get("xpath", "//a", True) == {}
+
+
+def test_conflicting_rewrites_on_one_page_disable_it(tmp_path):
+    cache = LocatorRewriteCache(str(tmp_path / "rewrites.json"))
+    cache.learn("xpath", "//a", False, "https://a.test/", {"by": "id", "value": "a"})
+    cache.learn("xpath", "//a", False, "https://a.test/", {"by": "id", "value": "other"})
+    assert cache.get("xpath", "//a", False) == {}
+    cache.learn("xpath", "//a", False, "https://a.test/", {"by": "id", "value": "a"})
+    assert cache.get("xpath", "//a", False) == {}
+
+
+def test_save_and_reload_ignores_the_old_format(tmp_path):
+    path = tmp_path / "rewrites.json"
+    path.write_text(json.dumps({"one|xpath|//old": {"by": "id", "value": "old", "page": "https://a.test/"}}))
+    cache = LocatorRewriteCache(str(path))
+    assert cache.get("xpath", "//old", False) == {}
+    cache.learn("xpath", "//a", False, "https://a.test/", {"by": "id", "value": "a"})
+    cache.save()
+    assert LocatorRewriteCache(str(path)).get("xpath", "//a", False) == {"https://a.test/": {"by": "id", "value": "a"}}
+
+
+def optimizer_with(tmp_path, rewrite):
+    optimizer = LocatorOptimizer(FakeConfig(str(tmp_path / "rewrites.json")))
+    optimizer.cache.learn("xpath", "//a", False, "https://a.test/", rewrite)
+    return optimizer
+
+
+def test_rewrite_used_when_the_browser_confirms_it(tmp_path):
+    optimizer = optimizer_with(tmp_path, {"by": "id", "value": "a"})
+    driver = FakeDriver({"page": "https://a.test/", "status": "rewrite", "elements": ["element"]})
+    assert optimizer.find(original, driver, "xpath", "//a", many=False) == "element"
+    rewrites, xpath, many = driver.scripts[0]
+    assert rewrites == {"https://a.test/": {"by": "id", "value": "a"}}
+    assert (xpath, many) == ("//a", False)
+    assert optimizer.rewritten == 1
+
+
+def test_other_page_uses_the_xpath_in_the_same_call(tmp_path):
+    optimizer = optimizer_with(tmp_path, {"by": "id", "value": "a"})
+    driver = FakeDriver({"page": "https://b.test/", "status": "xpath", "elements": ["by xpath"]})
+    assert optimizer.find(original, driver, "xpath", "//a", many=False) == "by xpath"
+    assert optimizer.rewritten == 0
+    assert optimizer.cache.get("xpath", "//a", False)
+
+
+def test_element_not_rendered_yet_keeps_the_rewrite(tmp_path):
+    optimizer = optimizer_with(tmp_path, {"by": "id", "value": "a"})
+    driver = FakeDriver({"page": "https://a.test/", "status": "missing"})
+    # the driver looks the xpath up itself, with its implicit wait
+    assert optimizer.find(original, driver, "xpath", "//a", many=False) == "original xpath=//a"
+    assert optimizer.cache.get("xpath", "//a", False) == {"https://a.test/": {"by": "id", "value": "a"}}
+
+
+def test_mismatching_rewrite_is_dropped(tmp_path):
+    optimizer = optimizer_with(tmp_path, {"by": "id", "value": "a"})
+    driver = FakeDriver({"page": "https://a.test/", "status": "mismatch"})
+    assert optimizer.find(original, driver, "xpath", "//a", many=False) == "original xpath=//a"
+    assert optimizer.cache.get("xpath", "//a", False) == {}
+
+
+def learn_result(page, micros=10.0, candidates=()):
+    return {"page": page, "micros": micros, "candidates": list(candidates)}
+
+
+def test_learning_uses_the_page_of_the_document(tmp_path):
+    optimizer = LocatorOptimizer(FakeConfig(str(tmp_path / "rewrites.json"), learn=True))
+    candidate = {"by": "id", "value": "a", "stability": 0, "unique": True, "micros": 1.0}
+    # the page of the frame document, not the top-level url
+    driver = FakeDriver(learn_result("https://ads.test/frame", candidates=[candidate]))
+    assert optimizer.find(original, driver, "xpath", "//a", many=False) == "original xpath=//a"
+    assert optimizer.cache.get("xpath", "//a", False) == {"https://ads.test/frame": {"by": "id", "value": "a"}}
+
+    # the learnt pages are passed to the script, which skips them
+    driver.result = {"page": "https://ads.test/frame", "seen": True}
+    optimizer.find(original, driver, "xpath", "//a", many=False)
+    assert driver.scripts[1][4] == ["https://ads.test/frame"]
+
+
+def test_nothing_is_learnt_before_the_element_is_rendered(tmp_path):
+    optimizer = LocatorOptimizer(FakeConfig(str(tmp_path / "rewrites.json"), learn=True))
+    driver = FakeDriver({"page": "https://a.test/", "candidates": None})
+    optimizer.find(original, driver, "xpath", "//a", many=False)
+    assert optimizer.cache.rewrites == {}
+    assert optimizer.seen == {("xpath", "//a", False): set()}
+
+
+def test_no_rewrite_without_cache_entry(tmp_path):
+    optimizer = LocatorOptimizer(FakeConfig(str(tmp_path / "rewrites.json")))
+    driver = FakeDriver(None)
+    assert optimizer.find(original, driver, "xpath", "//a", many=False) == "original xpath=//a"
+    assert optimizer.find(original, driver, "css selector", "a", many=False) == "original css selector=a"
+    assert driver.scripts == []
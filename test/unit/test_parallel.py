@@ -0,0 +1,161 @@
+'''
+unit tests of the shard / worker split, no pytest session: the scheduler
+gets a fake config and fake items.
+'''
+import json
+import os
+from types import SimpleNamespace
+
+from pytest_html_report.plugin import RUN_ENV, WORKER_ENV, checkpoint_worker
+
+from .. import parallel
+from ..parallel import DURATIONS_KEY, ShardScheduler, expected_durations, partition
+
+
+class FakeCache:
+
+    def __init__(self, values=None):
+        self.values = dict(values or {})
+
+    def get(self, key, default):
+        return self.values.get(key, default)
+
+    def set(self, key, value):
+        self.values[key] = value
+
+
+class FakeHook:
+
+    def __init__(self):
+        self.deselected = []
+
+    def pytest_deselected(self, items):
+        self.deselected.extend(items)
+
+
+class FakeConfig:
+
+    def __init__(self, cache=None, **options):
+        self.options = {"--num-shards": 1, "--shard-id": 0, "--workers": 1, "--worker": None,
+                        "--worker-results": None, "--durations-file": None}
+        self.options.update({f"--{name.replace('_', '-')}": value for name, value in options.items()})
+        self.cache = FakeCache(cache)
+        self.hook = FakeHook()
+
+    def getoption(self, name):
+        return self.options[name]
+
+
+class FakeItem:
+
+    def __init__(self, nodeid):
+        self.nodeid = nodeid
+
+
+def selected(config, nodeids):
+    items = [FakeItem(nodeid) for nodeid in nodeids]
+    ShardScheduler(config).pytest_collection_modifyitems(config, items)
+    return sorted(item.nodeid for item in items)
+
+
+NODEIDS = [f"test_a.py::test_{i}" for i in range(6)]
+
+
+def test_unknown_tests_get_the_median_duration():
+    costs = expected_durations(["a", "b", "c", "d"], {"a": 1.0, "b": 3.0, "c": 5.0})
+    assert costs["d"] == 3.0
+
+
+def test_partition_balances_the_durations():
+    durations = {"a": 5.0, "b": 4.0, "c": 3.0, "d": 3.0, "e": 2.0, "f": 1.0}
+    buckets = partition(list(durations), durations, 2)
+
+    assert sorted(sum(buckets, [])) == sorted(durations)
+    assert [sum(durations[nodeid] for nodeid in bucket) for bucket in buckets] == [9.0, 9.0]
+
+
+def test_partition_without_durations_deals_by_test_id():
+    buckets = partition(list(reversed(NODEIDS)), {}, 3)
+    assert buckets == [NODEIDS[0::3], NODEIDS[1::3], NODEIDS[2::3]]
+
+
+def test_shards_ignore_the_local_cache():
+    # two nodes with different caches still compute the same shards
+    shards = []
+    for slow in NODEIDS[:2]:
+        cache = {DURATIONS_KEY: {slow: 60.0}}
+        shards.append([selected(FakeConfig(cache, num_shards=2, shard_id=shard), NODEIDS) for shard in (0, 1)])
+
+    assert shards[0] == shards[1]
+    assert sorted(shards[0][0] + shards[0][1]) == NODEIDS
+
+
+def test_shards_use_the_durations_file(tmp_path):
+    durations_file = tmp_path / "durations.json"
+    durations_file.write_text(json.dumps({NODEIDS[0]: 60.0, **{nodeid: 1.0 for nodeid in NODEIDS[1:]}}))
+
+    shard = selected(FakeConfig(num_shards=2, shard_id=0, durations_file=str(durations_file)), NODEIDS)
+
+    # the slow test is alone in its shard
+    assert shard == [NODEIDS[0]]
+
+
+def test_durations_file_is_updated_after_the_run(tmp_path):
+    durations_file = tmp_path / "durations.json"
+    durations_file.write_text(json.dumps({NODEIDS[0]: 60.0, NODEIDS[1]: 2.0}))
+    config = FakeConfig(durations_file=str(durations_file))
+    scheduler = ShardScheduler(config)
+    scheduler.durations = {NODEIDS[1]: 3.0}
+
+    scheduler.pytest_sessionfinish(None)
+
+    assert json.loads(durations_file.read_text()) == {NODEIDS[0]: 60.0, NODEIDS[1]: 3.0}
+    assert config.cache.values[DURATIONS_KEY] == {NODEIDS[1]: 3.0}
+
+
+class FakePopen:
+    """A worker process that passes its tests at once"""
+
+    envs = []
+
+    def __init__(self, args, cwd, env, stdout, stderr):
+        FakePopen.envs.append(env)
+        results_file = next(arg.split("=", 1)[1] for arg in args if arg.startswith("--worker-results="))
+        with open(results_file, "w") as f:
+            json.dump({"durations": {}, "outcomes": {}}, f)
+
+    def wait(self):
+        return 0
+
+
+def test_workers_get_the_run_id_in_their_environment_only(monkeypatch):
+    monkeypatch.delenv(RUN_ENV, raising=False)
+    monkeypatch.setattr(parallel.subprocess, "Popen", FakePopen)
+    FakePopen.envs = []
+    config = FakeConfig(workers=2)
+    config.invocation_params = SimpleNamespace(args=(), dir=os.getcwd())
+    config.option = SimpleNamespace(collectonly=False)
+    config._checkpoint_run = "20260101_120000"
+    session = SimpleNamespace(config=config, testsfailed=0)
+
+    assert ShardScheduler(config).pytest_runtestloop(session)
+
+    assert [(env[RUN_ENV], env[WORKER_ENV]) for env in FakePopen.envs] == [("20260101_120000", "0"),
+                                                                           ("20260101_120000", "1")]
+    assert RUN_ENV not in os.environ
+    assert session.testsfailed == 0
+
+
+def test_checkpoint_worker(monkeypatch):
+    monkeypatch.delenv(RUN_ENV, raising=False)
+    monkeypatch.delenv(WORKER_ENV, raising=False)
+    assert checkpoint_worker(SimpleNamespace()) is None
+
+    # a pytest-xdist worker
+    xdist_config = SimpleNamespace(workerinput={"workerid": "gw1", RUN_ENV: "run1"})
+    assert checkpoint_worker(xdist_config) == ("run1", "gw1")
+
+    # a worker process of parallel.py
+    monkeypatch.setenv(RUN_ENV, "run2")
+    monkeypatch.setenv(WORKER_ENV, "0")
+    assert checkpoint_worker(SimpleNamespace()) == ("run2", "0")
@@ -0,0 +1,81 @@
+'''
+unit tests of the html report: the rows of the large reports are streamed
+from the checkpoint into paginated shards.
+'''
+import json
+import re
+
+import pytest
+
+from pytest_html_report.checkpoint import CheckpointStore
+from pytest_html_report.config import get_config
+from pytest_html_report.report_generator import ShardWriter, generate_html_from_checkpoint, generate_html_from_json
+
+from .test_checkpoint import HEADER, case
+
+
+@pytest.fixture
+def small_pages(monkeypatch):
+    # anything over 3 tests is streamed, 2 rows per shard
+    monkeypatch.setitem(get_config()["report"], "streaming_threshold", 3)
+    monkeypatch.setitem(get_config()["report"], "page_size", 2)
+
+
+def shards(shard_dir):
+    result = {}
+    for path in sorted(shard_dir.iterdir()):
+        payload = json.loads(path.read_text(encoding="utf-8")[len("reportShard("):-len(");\n")])
+        result[path.stem] = re.findall(r"<td>(test_\w+)</td>", payload["rows"])
+    return result
+
+
+def test_shard_writer_pages_the_rows_of_each_spec(tmp_path):
+    writer = ShardWriter(tmp_path, ["SPEC-1", "SPEC-2"], 2)
+    for name in ("test_a", "test_b", "test_c"):
+        writer.add(case(name))
+    writer.add(case("test_d", specs=("SPEC-1", "SPEC-2")))
+    writer.close()
+
+    assert shards(tmp_path) == {"0-0": ["test_a", "test_b"], "0-1": ["test_c", "test_d"], "1-0": ["test_d"]}
+
+
+def test_large_report_is_streamed_from_the_checkpoint(tmp_path, small_pages):
+    store = CheckpointStore(tmp_path / "Development_checkpoint_run1.jsonl", HEADER)
+    for name in ("test_a", "test_b", "test_c", "test_d"):
+        store.append(case(name, "Failed"))
+    segment = CheckpointStore(tmp_path / "Development_checkpoint_run1.gw0.jsonl", HEADER)
+    segment.append(case("test_e"))
+    # rerun in a worker: the latest result wins and moves to the end
+    segment.append(case("test_b"))
+    report = tmp_path / "report.html"
+
+    generate_html_from_checkpoint([store.path, segment.path], report)
+
+    assert shards(tmp_path / "report_shards") == {"0-0": ["test_a", "test_c"], "0-1": ["test_d", "test_e"], "0-2": ["test_b"]}
+    html = report.read_text(encoding="utf-8")
+    assert "data-pages='3'" in html
+    assert "Failed: 3/5" in html
+
+
+def test_small_report_is_rendered_in_one_page(tmp_path, small_pages):
+    store = CheckpointStore(tmp_path / "Development_checkpoint_run1.jsonl", HEADER)
+    store.append(case("test_a"))
+    report = tmp_path / "report.html"
+
+    generate_html_from_checkpoint([store.path], report)
+
+    assert "<td>test_a</td>" in report.read_text(encoding="utf-8")
+    assert not report.with_name("report_shards").exists()
+
+
+def test_combinations_attribute_is_escaped(tmp_path, small_pages):
+    data = dict(HEADER, testsuites=[{"cases": [case(f"test_{i}", categories=("it's",)) for i in range(4)]}])
+    data["specs"] = {"SPEC-1": {"cases": list(range(4)), "status": "Passing"}}
+    data["functional_spec_count"] = {"SPEC-1": {"pass": 4, "fail": 0, "skip": 0, "total": 4, "it's": 4}}
+    data["category_count"] = {"it's": 4}
+    report = tmp_path / "report.html"
+
+    generate_html_from_json(data, report)
+
+    html = report.read_text(encoding="utf-8")
+    assert 'data-combinations="[&quot;Passed|it&#x27;s&quot;]"' in html
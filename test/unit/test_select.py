@@ -0,0 +1,152 @@
+'''
+unit tests of Select, no browser: the fake select runs the snapshot and
+target scripts on a list of options, and clicking an option changes the
+selection the way the browser does.
+'''
+import warnings
+
+import pytest
+from selenium.common import NoSuchElementException
+from selenium.webdriver.support import select as select_module
+from selenium.webdriver.support.select import Select
+
+
+class FakeOption:
+
+    def __init__(self, select, index, value, text, disabled=False, visible=True):
+        self.select = select
+        self.index = index
+        self.value = value
+        self.text = text
+        self.selected = False
+        self.disabled = disabled
+        self.visible = visible
+
+    def click(self):
+        self.select.clicks.append(self.value)
+        if self.disabled:
+            return
+        if self.select.multiple:
+            self.selected = not self.selected
+        else:
+            for option in self.select.options:
+                option.selected = option is self
+
+    def state(self):
+        return {"element": self, "index": self.index, "value": self.value, "text": self.text,
+                "selected": self.selected, "disabled": self.disabled, "visible": self.visible}
+
+
+class FakeSelect:
+    tag_name = "select"
+
+    def __init__(self, multiple=False):
+        self.multiple = multiple
+        self.options = []
+        self.scripts = []
+        self.clicks = []
+        self.parent = self
+
+    def add(self, value, text, **kwargs):
+        self.options.append(FakeOption(self, len(self.options), value, text, **kwargs))
+        return self.options[-1]
+
+    def get_dom_attribute(self, name):
+        return "multiple" if name == "multiple" and self.multiple else None
+
+    def execute_script(self, script, element, *args):
+        self.scripts.append(script)
+        if script is select_module._SNAPSHOT_JS:
+            return [option.state() for option in self.options]
+        targets, count = args
+        if count != len(self.options):
+            return None
+        return [self.options[position].state() for position, value, text in targets]
+
+
+def fruit_select(multiple=False):
+    element = FakeSelect(multiple)
+    element.add("a", "Apple")
+    element.add("b", "Banana")
+    element.add("c", "Cherry")
+    return element
+
+
+def test_select_clicks_the_option():
+    element = fruit_select()
+    select = Select(element)
+
+    select.select_by_value("b")
+
+    assert element.clicks == ["b"]
+    assert [opt.selected for opt in select.option_data] == [False, True, False]
+    # one snapshot and one check of the target
+    assert element.scripts == [select_module._SNAPSHOT_JS, select_module._TARGETS_JS]
+
+
+def test_selected_option_is_not_clicked_again():
+    element = fruit_select()
+    element.options[0].selected = True
+
+    Select(element).select_by_visible_text("Apple")
+
+    assert element.clicks == []
+
+
+def test_disabled_state_is_read_before_the_click():
+    element = fruit_select()
+    select = Select(element)
+    select.option_data
+    # disabled after the snapshot was taken
+    element.options[2].disabled = True
+
+    with pytest.raises(NotImplementedError):
+        select.select_by_index(2)
+    assert element.clicks == []
+
+
+def test_invisible_option_is_not_selected_by_text():
+    element = fruit_select()
+    element.add("d", "Durian", visible=False)
+
+    with pytest.raises(NoSuchElementException):
+        Select(element).select_by_visible_text("Durian")
+    assert element.clicks == []
+
+
+def test_changed_options_are_read_again():
+    element = fruit_select()
+    select = Select(element)
+    select.option_data
+    element.add("d", "Durian")
+
+    select.select_by_value("d")
+
+    assert element.clicks == ["d"]
+    assert len(select.option_data) == 4
+
+
+def test_deselect_all_clicks_the_selected_options():
+    element = fruit_select(multiple=True)
+    select = Select(element)
+    select.select_by_value("a")
+    select.select_by_value("c")
+
+    select.deselect_all()
+
+    assert element.clicks == ["a", "c", "a", "c"]
+    assert not any(option.selected for option in element.options)
+
+
+def test_missing_option():
+    with pytest.raises(NoSuchElementException):
+        Select(fruit_select()).select_by_value("z")
+
+
+def test_removed_helpers_are_deprecated():
+    select = Select(fruit_select())
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        assert select._escape_string('say "hi"') == "'say \"hi\"'"
+        assert select._get_longest_token("red apple") == "apple"
+    assert [warning.category for warning in caught] == [DeprecationWarning, DeprecationWarning]
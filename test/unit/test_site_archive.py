@@ -0,0 +1,90 @@
+'''
+unit tests of the site archive storage and of the request body reading,
+no browser and no network.
+'''
+import hashlib
+import http.client
+import http.server
+import io
+import socket
+import threading
+
+import pytest
+import urllib3
+
+from ..site_archive import ArchiveRequestHandler, SiteArchive, read_chunked
+
+
+def test_store_and_lookup(tmp_path):
+    archive = SiteArchive(str(tmp_path))
+    archive.store("GET https://a.test/", 200, [["Content-Type", "text/html"]], b"<html></html>")
+    assert archive.lookup("GET https://a.test/") == (200, [["Content-Type", "text/html"]], b"<html></html>")
+    assert archive.lookup("GET https://a.test/other") is None
+    # the index is read again by a new archive
+    assert SiteArchive(str(tmp_path)).lookup("GET https://a.test/")[2] == b"<html></html>"
+
+
+def test_key_includes_the_request_body():
+    assert SiteArchive.key("GET", "https://a.test/") == "GET https://a.test/"
+    assert SiteArchive.key("POST", "https://a.test/", b"a") != SiteArchive.key("POST", "https://a.test/", b"b")
+
+
+def test_same_body_stored_by_many_threads(tmp_path):
+    archive = SiteArchive(str(tmp_path))
+    errors = []
+    start = threading.Barrier(16)
+
+    def store(n):
+        start.wait()
+        try:
+            archive.store(f"GET https://a.test/{n}", 204, [], b"")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=store, args=(n,)) for n in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert all(archive.lookup(f"GET https://a.test/{n}") == (204, [], b"") for n in range(16))
+    # one blob, no temporary file left next to it
+    assert [path.name for path in (tmp_path / "blobs").glob("*/*")] == [hashlib.sha256(b"").hexdigest()]
+
+
+def test_read_chunked():
+    rfile = io.BytesIO(b"5\r\nhello\r\n7;ext=1\r\n, world\r\n0\r\nTrailer: x\r\n\r\nnext request")
+    assert read_chunked(rfile) == b"hello, world"
+    assert rfile.read() == b"next request"
+
+
+def test_read_chunked_truncated():
+    with pytest.raises(ValueError):
+        read_chunked(io.BytesIO(b"5\r\nhel"))
+
+
+def test_unreachable_site_is_not_recorded(tmp_path):
+    archive = SiteArchive(str(tmp_path))
+    # a port nobody listens on: the connection is refused
+    with socket.socket() as unused:
+        unused.bind(("127.0.0.1", 0))
+        port = unused.getsockname()[1]
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), ArchiveRequestHandler)
+    server.mode = "record"
+    server.archive = archive
+    server.misses = []
+    server.http = urllib3.PoolManager()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        connection = http.client.HTTPConnection(*server.server_address[:2], timeout=10)
+        connection.request("GET", f"http://127.0.0.1:{port}/")
+        response = connection.getresponse()
+        response.read()
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert response.status == 502
+    assert archive.lookup(SiteArchive.key("GET", f"http://127.0.0.1:{port}/")) is None
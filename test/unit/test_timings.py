@@ -0,0 +1,77 @@
+'''
+unit tests of the timing database of the html report: the rolling baseline
+and the detection of the slower test phases.
+'''
+from pathlib import Path
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from pytest_html_report.timings import CommandCounter, connect, find_regressions, is_slowdown, timings_database
+
+SETTINGS = {"baseline_runs": 3, "min_runs": 3, "threshold": 3.0, "min_slowdown": 0.2, "min_seconds": 0.1}
+
+
+def record(database, run, duration, test="test_a", outcome="passed", recorded=None):
+    connection = connect(database)
+    with connection:
+        connection.execute("INSERT INTO timings VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                           (run, "Development", test, "call", outcome, duration, 10, recorded or float(run[3:])))
+    connection.close()
+
+
+def test_is_slowdown():
+    assert is_slowdown(2.0, [1.0, 1.1, 0.9], SETTINGS)
+    assert not is_slowdown(1.05, [1.0, 1.1, 0.9], SETTINGS)
+    # not enough runs yet
+    assert not is_slowdown(2.0, [1.0, 1.0], SETTINGS)
+
+
+def test_baseline_counts_runs_not_rows(tmp_path):
+    database = tmp_path / "timings.sqlite"
+    # one earlier run where the test was rerun three times
+    for attempt in range(3):
+        record(database, "run1", 1.0, recorded=1.0 + attempt / 10)
+    record(database, "run2", 2.5)
+
+    # a single run is not enough for a baseline
+    assert find_regressions(database, "run2", "Development", SETTINGS) == []
+
+
+def test_baseline_is_the_last_runs(tmp_path):
+    database = tmp_path / "timings.sqlite"
+    # old slow runs, then the fast ones: only the last three runs count
+    for run in ("run1", "run2", "run3"):
+        record(database, run, 3.0)
+    for run in ("run4", "run5", "run6"):
+        record(database, run, 1.0)
+    record(database, "run7", 2.5)
+
+    assert [r["baseline"] for r in find_regressions(database, "run7", "Development", SETTINGS)] == [1.0]
+
+
+def test_slower_phase_is_reported(tmp_path):
+    database = tmp_path / "timings.sqlite"
+    for run in ("run1", "run2", "run3"):
+        record(database, run, 1.0)
+    record(database, "run4", 0.1, outcome="failed")
+    record(database, "run5", 2.5)
+
+    regressions = find_regressions(database, "run5", "Development", SETTINGS)
+
+    assert [(r["test"], r["duration"], r["baseline"]) for r in regressions] == [("test_a", 2.5, 1.0)]
+
+
+def test_database_follows_the_report_dir():
+    config = {"report": {"report_dir": "out/reports"}, "timings": {"database": None}}
+    assert timings_database(config) == Path("out/reports/timings.sqlite")
+    config["timings"]["database"] = "/tmp/t.sqlite"
+    assert timings_database(config) == Path("/tmp/t.sqlite")
+
+
+def test_command_counter_restores_execute():
+    original = WebDriver.execute
+    counter = CommandCounter()
+    counter.install()
+    assert WebDriver.execute is not original
+    counter.uninstall()
+    assert WebDriver.execute is original
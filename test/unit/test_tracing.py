@@ -0,0 +1,108 @@
+'''
+unit tests of the command tracing spans and of their chrome trace / folded
+stacks exports. The http round trip of RemoteConnection is replaced by a
+canned response.
+'''
+import json
+import logging
+
+import pytest
+from selenium.webdriver.remote.client_config import ClientConfig
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+from selenium.webdriver.remote.tracing import Tracer, tracer
+from selenium.webdriver.remote.websocket_connection import WebSocketConnection
+
+
+@pytest.fixture
+def traced():
+    tracer.clear()
+    tracer.start()
+    yield tracer
+    tracer.stop()
+    tracer.clear()
+
+
+def test_spans_nest_and_know_their_self_time():
+    spans_tracer = Tracer()
+    with spans_tracer.span("click", "command") as command:
+        with spans_tracer.span("http") as http:
+            pass
+        spans_tracer.annotate("command", status=200)
+
+    spans = spans_tracer.clear()
+    assert [span.name for span in spans] == ["http", "click"]
+    assert http.stack == ("click",)
+    assert command.children == http.duration
+    assert command.self_time == pytest.approx(command.duration - http.duration)
+    assert command.args == {"status": 200}
+    assert spans_tracer.spans == []
+
+
+def test_exports():
+    spans_tracer = Tracer()
+    with spans_tracer.span("get", "command", url="https://shop.test"):
+        with spans_tracer.span("http"):
+            pass
+    spans = spans_tracer.spans
+
+    events = spans_tracer.chrome_trace(spans)["traceEvents"]
+    assert [(event["name"], event["ph"], event["cat"]) for event in events] == [
+        ("http", "X", "selenium"), ("get", "X", "command")]
+    assert events[1]["args"] == {"url": "https://shop.test"}
+
+    folded = spans_tracer.folded(spans).splitlines()
+    assert [line.rsplit(" ", 1)[0] for line in folded] == ["get", "get;http"]
+    assert all(int(line.rsplit(" ", 1)[1]) >= 0 for line in folded)
+
+
+def test_remote_connection_records_the_steps_of_a_command(traced, monkeypatch):
+    connection = RemoteConnection(client_config=ClientConfig("http://localhost:4444"))
+    data = json.dumps({"value": "Shop"})
+    monkeypatch.setattr(connection, "_send", lambda method, url, body=None: (200, "OK", {}, data))
+
+    with traced.span(Command.GET_TITLE, "command") as command:
+        response = connection.execute(Command.GET_TITLE, {"sessionId": "1"})
+
+    assert response["value"] == "Shop"
+    assert [span.name for span in traced.clear()] == ["encode", "http", "decode", Command.GET_TITLE]
+    assert command.args["response_bytes"] == len(data)
+    assert command.args["status"] == 200
+    assert "server_ms" in command.args
+
+
+def test_stopped_tracer_records_nothing(monkeypatch):
+    connection = RemoteConnection(client_config=ClientConfig("http://localhost:4444"))
+    monkeypatch.setattr(connection, "_send", lambda method, url, body=None: (200, "OK", {}, '{"value": 1}'))
+    tracer.clear()
+
+    connection.execute(Command.GET_TITLE, {"sessionId": "1"})
+
+    assert tracer.clear() == []
+
+
+class Message(dict):
+    """A decoded message counting how many times it is turned into a string."""
+
+    formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "message"
+
+
+def test_websocket_messages_are_formatted_only_when_logged(caplog, monkeypatch):
+    connection = WebSocketConnection.__new__(WebSocketConnection)
+    connection._messages = {}
+    connection.callbacks = {}
+    message = Message()
+    monkeypatch.setattr(json, "loads", lambda data: message)
+
+    with caplog.at_level(logging.INFO, logger="selenium.webdriver.remote.websocket_connection"):
+        connection._process_message("{}")
+    assert message.formatted == 0
+
+    with caplog.at_level(logging.DEBUG, logger="selenium.webdriver.remote.websocket_connection"):
+        connection._process_message("{}")
+    assert message.formatted
+    assert "<- message" in caplog.text
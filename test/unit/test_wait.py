@@ -0,0 +1,157 @@
+'''
+unit tests of WebDriverWait(in_browser=True) with a fake driver whose
+asynchronous script plays the part of the browser, and of the visibility
+check of the browser script itself, run with node on a fake DOM.
+'''
+import json
+import shutil
+import subprocess
+
+import pytest
+from selenium.common import NoSuchElementException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.locator_converter import LocatorConverter
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.browser_conditions import _CONDITION_JS
+from selenium.webdriver.support.wait import WebDriverWait
+
+
+class FakeTimeouts:
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    @property
+    def script(self):
+        self.driver.timeout_reads += 1
+        return 30
+
+
+class FakeDriver:
+    """The element is found once the browser script reported it."""
+
+    def __init__(self, browser_result=True):
+        self.locator_converter = LocatorConverter()
+        self.browser_result = browser_result
+        self.scripts = []
+        self.timeout_reads = 0
+        self.rendered = False
+
+    @property
+    def timeouts(self):
+        return FakeTimeouts(self)
+
+    def execute_script(self, script, conditions, root):
+        # the composite conditions, checked together
+        return [self.rendered] * len(conditions)
+
+    def execute_async_script(self, script, condition, root, timeout_ms):
+        self.scripts.append((condition, timeout_ms))
+        self.rendered = self.browser_result
+        return self.browser_result
+
+    def find_element(self, by, value):
+        if not self.rendered:
+            raise NoSuchElementException()
+        return f"element {by}={value}"
+
+
+def test_wait_returns_when_the_browser_reports_the_condition():
+    driver = FakeDriver()
+
+    element = WebDriverWait(driver, 10, in_browser=True).until(EC.presence_of_element_located((By.ID, "x")))
+
+    assert element == "element id=x"
+    condition, timeout_ms = driver.scripts[0]
+    assert condition == {"kind": "presence", "using": "css selector", "value": '[id="x"]'}
+    assert 0 < timeout_ms <= 10000
+
+
+def test_script_timeout_is_read_once():
+    driver = FakeDriver()
+    wait = WebDriverWait(driver, 10, in_browser=True)
+
+    for _ in range(3):
+        wait.until(EC.presence_of_element_located((By.ID, "x")))
+
+    assert driver.timeout_reads == 1
+
+
+def test_wait_is_bounded_by_the_script_timeout():
+    driver = FakeDriver()
+
+    WebDriverWait(driver, 60, in_browser=True).until(EC.presence_of_element_located((By.ID, "x")))
+
+    # 0.9 x the 30 seconds script timeout
+    assert driver.scripts[0][1] == 27000
+
+
+def test_other_conditions_are_polled():
+    driver = FakeDriver()
+    driver.rendered = True
+    wait = WebDriverWait(driver, 10, in_browser=True)
+
+    assert wait.until(lambda d: d.find_element(By.ID, "x"))
+    # the complement of the lenient browser check cannot be waited for
+    driver.rendered = False
+    assert wait.until(EC.none_of(EC.presence_of_element_located((By.ID, "y")),
+                                 EC.presence_of_element_located((By.ID, "z")))) is True
+    assert driver.scripts == []
+    assert driver.timeout_reads == 0
+
+
+def test_polling_without_in_browser():
+    driver = FakeDriver()
+    driver.rendered = True
+
+    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "x")))
+
+    assert driver.scripts == []
+
+
+# a tiny DOM: enough for the locate and visible functions of the browser script
+FAKE_DOM = """
+function element(tag, style, parent) {
+  return {
+    tagName: tag, parentElement: parent || null, isConnected: true,
+    style: Object.assign({display: 'block', visibility: 'visible', opacity: '1'}, style || {}),
+    getRootNode: function () { return document; },
+    getClientRects: function () { return []; },
+    matches: function () { return false; }
+  };
+}
+var elements = {};
+var document = {
+  defaultView: {getComputedStyle: function (node) { return node.style; }},
+  querySelector: function (selector) { return elements[selector] || null; }
+};
+var root = null;
+"""
+
+
+def visible(setup, selector):
+    condition = {"kind": "visibility", "using": "css selector", "value": selector}
+    script = FAKE_DOM + setup + _CONDITION_JS + f"console.log(JSON.stringify(holds({json.dumps(condition)})));"
+    output = subprocess.run([shutil.which("node"), "-e", script], capture_output=True, text=True, check=True)
+    return json.loads(output.stdout)
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+def test_browser_visibility_is_lenient():
+    setup = """
+    var body = element('BODY');
+    var select = element('SELECT', {}, body);
+    elements['option'] = element('OPTION', {}, select);
+    elements['contents'] = element('DIV', {display: 'contents'}, body);
+    elements['hidden'] = element('DIV', {visibility: 'hidden'}, body);
+    elements['transparent'] = element('DIV', {opacity: '0'}, body);
+    var folded = element('DIV', {display: 'none'}, body);
+    elements['folded'] = element('SPAN', {}, folded);
+    """
+    # no client rects, isDisplayed accepts them
+    assert visible(setup, "option") is True
+    assert visible(setup, "contents") is True
+    # certainly not displayed
+    assert visible(setup, "hidden") is False
+    assert visible(setup, "transparent") is False
+    assert visible(setup, "folded") is False
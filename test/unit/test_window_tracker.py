@@ -0,0 +1,71 @@
+'''
+unit tests of the window tracker: the browsingContext events are sent by
+hand, from other threads like the websocket connection does.
+'''
+import threading
+from types import SimpleNamespace
+
+import pytest
+from selenium.common import TimeoutException
+from selenium.webdriver.remote.window_tracker import WindowTracker
+
+
+class FakeBrowsingContext:
+
+    def __init__(self):
+        self.handlers = {}
+
+    def add_event_handler(self, event, callback):
+        self.handlers[event] = callback
+        return len(self.handlers)
+
+    def remove_event_handler(self, event, callback_id):
+        del self.handlers[event]
+
+    def send(self, event, context, parent=None):
+        self.handlers[event](SimpleNamespace(context=context, parent=parent))
+
+
+class FakeDriver:
+
+    def __init__(self, handles):
+        self.browsing_context = FakeBrowsingContext()
+        self.window_handles = handles
+
+
+def test_handles_follow_the_events():
+    driver = FakeDriver(["main"])
+    with WindowTracker(driver) as tracker:
+        driver.browsing_context.send("context_created", "tab")
+        # frames are not windows
+        driver.browsing_context.send("context_created", "frame", parent="tab")
+        assert tracker.handles == ["main", "tab"]
+
+        driver.browsing_context.send("context_destroyed", "main")
+        assert tracker.handles == ["tab"]
+    assert driver.browsing_context.handlers == {}
+
+
+def test_destroyed_event_overtaking_its_created_one():
+    driver = FakeDriver([])
+    tracker = WindowTracker(driver).start()
+    driver.browsing_context.send("context_destroyed", "popup")
+    driver.browsing_context.send("context_created", "popup")
+
+    assert tracker.handles == []
+
+
+def test_expect_new_window_waits_for_the_event():
+    driver = FakeDriver(["main"])
+    tracker = WindowTracker(driver).start()
+
+    with tracker.expect_new_window(timeout=5) as new:
+        threading.Timer(0.1, driver.browsing_context.send, args=("context_created", "tab")).start()
+    assert new.handle == "tab"
+
+
+def test_wait_for_new_window_times_out():
+    tracker = WindowTracker(FakeDriver(["main"])).start()
+
+    with pytest.raises(TimeoutException):
+        tracker.wait_for_new_window(["main"], timeout=0.1)
@@ -0,0 +1,124 @@
+'''
+unit tests of the XPath 1.0 evaluator of the DOM snapshot, on a small
+product list page like the flipkart one of Xpath.py.
+'''
+import pytest
+from bs4 import BeautifulSoup
+from selenium.common import InvalidSelectorException
+from selenium.webdriver.remote.xpath import XPathDocument, compile_xpath
+
+PAGE = """
+<html><head><title>Products</title></head>
+<body>
+  <input name="q" type="text">
+  <div id="list">
+    <a class="item" href="/p/1"><div class="name">Apple iPhone 17 (Black, 256 GB)</div>
+      <div class="price"><div>82,900</div><div>89,900</div></div></a>
+    <a class="item" href="/p/2"><div class="name">Apple iPhone 17 Pro (Silver, 256 GB)</div>
+      <div class="price"><div>1,34,900</div></div></a>
+    <a class="item sold-out" href="/p/3"><div class="name">  Apple   iPhone 16  </div>
+      <div class="price"><div>69,900</div></div></a>
+    <!-- more products -->
+  </div>
+  <p>Say "hi" it's <b>bold</b> text</p>
+</body></html>
+"""
+
+
+@pytest.fixture
+def document():
+    return XPathDocument(BeautifulSoup(PAGE, "html.parser", multi_valued_attributes=None))
+
+
+def texts(tags):
+    return [" ".join(tag.get_text().split()) for tag in tags]
+
+
+def test_attribute_predicate(document):
+    assert [tag.name for tag in document.select("//input[@name='q']")] == ["input"]
+
+
+def test_text_and_following_sibling(document):
+    # the price of a product by its name, as in test_product_list
+    prices = document.select(
+        "//div[text()='Apple iPhone 17 Pro (Silver, 256 GB)']/parent::a/div[@class='price']/div[1]")
+    assert texts(prices) == ["1,34,900"]
+    assert texts(document.select("//div[@class='name'][contains(text(),'17 (')]/following-sibling::div/div[1]")) \
+        == ["82,900"]
+
+
+def test_positions(document):
+    assert texts(document.select("(//div[@class='price']/div)[1]")) == ["82,900"]
+    assert texts(document.select("(//div[@class='price']/div)[last()]")) == ["69,900"]
+    # [1] applies to each parent, unlike (...)[1]
+    assert texts(document.select("//div[@class='price']/div[1]")) == ["82,900", "1,34,900", "69,900"]
+    assert texts(document.select("//div[@class='price']/div[position() > 1]")) == ["89,900"]
+
+
+def test_reverse_axes_count_from_the_context_node(document):
+    assert [tag["href"] for tag in document.select("//a[3]/preceding-sibling::a[1]")] == ["/p/2"]
+    assert [tag.name for tag in document.select("//b/ancestor::*[2]")] == ["body"]
+
+
+def test_results_are_in_document_order_without_duplicates(document):
+    names = document.select("//a//div[@class='name'] | //div[@class='name'] | //input")
+    assert [tag.name for tag in names] == ["input", "div", "div", "div"]
+
+
+def test_string_functions(document):
+    assert document.evaluate("normalize-space(//a[3]/div[1])") == "Apple iPhone 16"
+    assert document.evaluate("substring-before(//title, 'ucts')") == "Prod"
+    assert document.evaluate("substring-after(//a[1]/@href, '/p/')") == "1"
+    assert document.evaluate("substring('12345', 1.5, 2.6)") == "234"
+    assert document.evaluate("translate('bar', 'abc', 'ABC')") == "BAr"
+    assert document.evaluate("concat('a', 1, true())") == "a1true"
+    assert document.evaluate("string-length(//title)") == 8.0
+    assert document.select("//a[starts-with(@href, '/p/') and contains(@class, 'sold-out')]")[0]["href"] == "/p/3"
+
+
+def test_number_functions(document):
+    assert document.evaluate("count(//a)") == 3.0
+    assert document.evaluate("count(//comment())") == 1.0
+    assert document.evaluate("floor(2.5) + ceiling(2.5) + round(2.5)") == 8.0
+    assert document.evaluate("7 mod 3 * 2 div 4") == 0.5
+    assert document.evaluate("1 div 0") == float("inf")
+    assert document.evaluate("-1 div 0") == float("-inf")
+    assert document.evaluate("number('x') != number('x')") is True
+
+
+def test_comparisons_of_node_sets(document):
+    # true when any node matches
+    assert document.evaluate("//div[@class='price']/div = '69,900'") is True
+    assert document.evaluate("//div[@class='price']/div != '69,900'") is True
+    assert document.evaluate("count(//a) > 2 and not(//table)") is True
+
+
+def test_names_are_matched_in_lower_case():
+    document = XPathDocument(BeautifulSoup("<DIV ID='x'><Span>a</Span></DIV>", "html.parser"))
+    assert [tag.name for tag in document.select("//DIV[@ID='x']/span")] == ["span"]
+    assert document.evaluate("name(//div/*)") == "span"
+
+
+def test_literals_with_both_quotes(document):
+    assert texts(document.select("""//p[contains(., concat('Say "hi" it', "'", 's'))]""")) \
+        == ['Say "hi" it\'s bold text']
+
+
+def test_context_node(document):
+    item = document.select("//a[2]")[0]
+    assert texts(document.select("./div[@class='name']", item)) == ["Apple iPhone 17 Pro (Silver, 256 GB)"]
+    # absolute paths start from the document, not from the context node
+    assert len(document.select("//a", item)) == 3
+
+
+def test_selecting_something_else_than_elements_fails(document):
+    with pytest.raises(InvalidSelectorException):
+        document.select("//a/@href")
+    with pytest.raises(InvalidSelectorException):
+        document.select("count(//a)")
+
+
+@pytest.mark.parametrize("expression", ["//div[", "//a[@href=]", "foo(1)", "//a/namespace::x", "id('list')", "1 +"])
+def test_invalid_or_unsupported_expressions(expression):
+    with pytest.raises(InvalidSelectorException):
+        compile_xpath(expression)